@@ -1,19 +1,38 @@
 from argparse import ArgumentParser, RawTextHelpFormatter
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 import uvicorn
 from routers import image_search
 import logging
+from core import setup_tracing, shutdown_tracing, common_parameters, TracingMiddleware
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 
 
+# Setup Tracing (trace context propagated from the gildong API)
+setup_tracing(
+    "gildong-ib", 
+    common_parameters.get("trace_export_path", "logs/traces.jsonl"), 
+    common_parameters.get("trace_sample_ratio", 1.0)
+)
+
 # Define FastAPI app
 app = FastAPI()
+app.add_middleware(TracingMiddleware)
 
 # Include Routers
 app.include_router(image_search.router)
 
+@app.get("/metrics")
+def metrics():
+    # Inference queue depth, batch sizes and latencies
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.on_event("shutdown")
+def flush_spans():
+    shutdown_tracing()
+
 
 # Command line arguments parser
 def get_args():
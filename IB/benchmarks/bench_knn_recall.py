@@ -0,0 +1,131 @@
+"""
+Recall vs. latency of the HNSW kNN image search against the exact script_score scan.
+
+Query vectors are ImageBind vectors of random documents of the index, jittered
+with Gaussian noise (--noise) so a query is not trivially its own document. For
+each `num_candidates` value the benchmark reports recall@k against the exact
+neighbours and the client-side and Elasticsearch (`took`) latencies.
+With --local-index the in-process index (services/vector_index.py) is
+measured as well; its `took` column is the in-process search alone.
+
+Run from the `IB` directory, against an index migrated with
+reindex_imagebind_vectors.py:
+
+    python -m benchmarks.bench_knn_recall --index gildong_1_knn --queries 200 --candidates 20 50 100 200 500
+    python -m benchmarks.bench_knn_recall --local-index index/imagebind --candidates 100
+"""
+import json
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+from core import common_parameters
+from services.data_manager import ElasticsearchDataManager
+from services.utils import VECTOR_FIELD, script_query, knn_query
+from services.vector_index import LocalVectorIndex
+
+
+def sample_queries(db: ElasticsearchDataManager, index: str, n: int, noise: float, seed: int) -> np.ndarray:
+    body = {
+        "_source": [VECTOR_FIELD],
+        "size": n,
+        "query": {
+            "function_score": {
+                "query": {"exists": {"field": VECTOR_FIELD}},
+                "random_score": {"seed": seed, "field": "_seq_no"}
+            }
+        }
+    }
+    hits = db.client.search(index=index, body=body)["hits"]["hits"]
+    vectors = np.array([hit["_source"][VECTOR_FIELD] for hit in hits], dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    vectors += rng.normal(scale=noise, size=vectors.shape).astype(np.float32) * np.linalg.norm(vectors, axis=1, keepdims=True) / np.sqrt(vectors.shape[1])
+    return vectors
+
+
+def timed_search(db: ElasticsearchDataManager, index: str, body: dict) -> tuple:
+    start = time.perf_counter()
+    response = db.client.search(index=index, body=body)
+    elapsed = (time.perf_counter() - start) * 1000
+    return [hit["_id"] for hit in response["hits"]["hits"]], elapsed, response["took"]
+
+
+def summarize(name: str, latencies: list, took: list, recalls: list = None) -> dict:
+    return {
+        "mode": name,
+        "recall": round(float(np.mean(recalls)), 4) if recalls is not None else 1.0,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+        "took_p50_ms": round(float(np.percentile(took, 50)), 1)
+    }
+
+
+def main():
+    parser = ArgumentParser(description="Recall/latency of kNN vs. exact ImageBind search")
+    parser.add_argument("--es-host", default=common_parameters['elasticsearch_host'], help="Elasticsearch host")
+    parser.add_argument("--index", default="gildong_1", help="Index with an HNSW-indexed vector field")
+    parser.add_argument("--queries", type=int, default=100, help="Number of query vectors")
+    parser.add_argument("--k", type=int, default=10, help="Hits per query (recall@k)")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[20, 50, 100, 200, 500], help="num_candidates values")
+    parser.add_argument("--noise", type=float, default=0.3, help="Relative Gaussian noise added to the sampled vectors")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--local-index", metavar="path", help="Also measure the local index stored in this directory")
+    parser.add_argument("--ivf-probe", type=int, default=16, help="Clusters scanned by an IVF local index")
+    parser.add_argument("--json", metavar="path", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    db = ElasticsearchDataManager(args.es_host)
+    queries = sample_queries(db, args.index, args.queries, args.noise, args.seed).tolist()
+
+    # Warm up caches and the HNSW graph before timing
+    for vector in queries[:5]:
+        timed_search(db, args.index, script_query(vector, size=args.k))
+        timed_search(db, args.index, knn_query(vector, args.k, max(args.candidates)))
+
+    exact, latencies, took = [], [], []
+    for vector in queries:
+        ids, elapsed, es_took = timed_search(db, args.index, script_query(vector, size=args.k))
+        exact.append(set(ids))
+        latencies.append(elapsed)
+        took.append(es_took)
+    report = [summarize("script_score", latencies, took)]
+
+    for num_candidates in args.candidates:
+        recalls, latencies, took = [], [], []
+        for vector, truth in zip(queries, exact):
+            ids, elapsed, es_took = timed_search(db, args.index, knn_query(vector, args.k, num_candidates))
+            recalls.append(len(truth.intersection(ids)) / max(1, len(truth)))
+            latencies.append(elapsed)
+            took.append(es_took)
+        report.append(summarize(f"knn num_candidates={num_candidates}", latencies, took, recalls))
+
+    if args.local_index:
+        local_index = LocalVectorIndex(args.local_index, VECTOR_FIELD, dims=len(queries[0]), ivf_probe=args.ivf_probe)
+        if not local_index.load():
+            raise SystemExit(f"No local index in {args.local_index}")
+
+        recalls, latencies, took = [], [], []
+        for vector, truth in zip(queries, exact):
+            start = time.perf_counter()
+            matches = local_index.search(np.array(vector, dtype=np.float32), args.k)
+            search_ms = (time.perf_counter() - start) * 1000
+            db.fetch_documents(args.index, [doc_id for doc_id, _ in matches])  # sources, as /search_image does
+            recalls.append(len(truth.intersection(doc_id for doc_id, _ in matches)) / max(1, len(truth)))
+            latencies.append((time.perf_counter() - start) * 1000)
+            took.append(search_ms)
+        report.append(summarize(f"local ({len(local_index)} docs)", latencies, took, recalls))
+
+    print(f"{len(queries)} queries, recall@{args.k} against script_score on {args.index}\n")
+    print(f"{'mode':<28}{'recall':>8}{'p50 ms':>9}{'p95 ms':>9}{'took ms':>9}")
+    for row in report:
+        print(f"{row['mode']:<28}{row['recall']:>8}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['took_p50_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Startup cost of the ImageBind model: construction and checkpoint loading time and resident memory.
+
+Each configuration is loaded in a fresh interpreter, which reports the time to
+build the model and load its weights and the peak RSS afterwards.
+
+Run from the `IB` directory:
+
+    python -m benchmarks.bench_model_load --modalities all vision --repeat 2
+
+The first vision-only run also writes the vision checkpoint split from the
+full one; the later runs show the steady state.
+"""
+import sys
+import json
+import subprocess
+from argparse import ArgumentParser
+
+
+CHILD = """
+import json, resource, time
+import torch
+from models.imagebind_model import ALL_MODALITIES, imagebind_huge
+modalities = {modalities!r}
+start = time.perf_counter()
+model = imagebind_huge(pretrained=True, modalities=ALL_MODALITIES if modalities == ["all"] else modalities, mmap={mmap})
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": round(seconds, 2),
+    "parameters_m": round(sum(p.numel() for p in model.parameters()) / 1e6, 1),
+    "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+}}))
+"""
+
+
+def load_once(modalities: list, mmap: bool) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(modalities=modalities, mmap=mmap)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = ArgumentParser(description="Construction/loading time and RSS of ImageBind-huge")
+    parser.add_argument("--modalities", nargs="+", default=["all", "vision"], help="Configurations: 'all' or comma separated modalities")
+    parser.add_argument("--no-mmap", action="store_true", help="Read the checkpoint into memory instead of mapping it")
+    parser.add_argument("--repeat", type=int, default=2, help="Fresh interpreters per configuration; the last is reported")
+    parser.add_argument("--json", metavar="path", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    report = []
+    for config in args.modalities:
+        runs = [load_once(config.split(","), not args.no_mmap) for _ in range(args.repeat)]
+        report.append({"modalities": config, **runs[-1]})
+
+    print(f"{'modalities':<24}{'load s':>8}{'params M':>10}{'max RSS MB':>12}")
+    for row in report:
+        print(f"{row['modalities']:<24}{row['seconds']:>8}{row['parameters_m']:>10}{row['max_rss_mb']:>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
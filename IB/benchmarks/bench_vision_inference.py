@@ -0,0 +1,159 @@
+"""
+Accuracy check and latency of the CPU inference modes of the ImageBind vision path.
+
+Embeds a set of images with the plain fp32 model (`torch.no_grad`, the path the
+service used before services/vision_encoder.py) and with each requested mode,
+then reports per mode:
+
+- cosine agreement with the fp32 embeddings (mean and minimum);
+- neighbour agreement: overlap of every image's top-k neighbours within the set;
+- latency (p50/p95) per batch size and throughput in images per second.
+
+The run fails when a mode's minimum cosine is below --min-cosine.
+
+Run from the `IB` directory (int8 and onnx work on their own copy of the model):
+
+    python -m benchmarks.bench_vision_inference --images uploads/images --modes fp32 int8 bf16 --batch-sizes 1 8
+"""
+import os
+import sys
+import copy
+import json
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+import torch
+
+import core  # before services: core.auth_utils imports services
+import data
+from models import imagebind_model
+from models.imagebind_model import ModalityType
+from services.vision_encoder import INFERENCE_MODES, VisionEncoder
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+
+def load_images(directory: str, limit: int) -> torch.Tensor:
+    if not directory:
+        print("No --images given: random tensors, the agreement figures are only indicative.")
+        return torch.randn(limit, 3, 224, 224)
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )[:limit]
+    if not paths:
+        raise SystemExit(f"No images in {directory}")
+    return data.load_and_transform_vision_data(paths, "cpu")
+
+
+def reference_embeddings(model: torch.nn.Module, images: torch.Tensor, batch_size: int = 8) -> np.ndarray:
+    outputs = []
+    with torch.no_grad():
+        for start in range(0, len(images), batch_size):
+            outputs.append(model({ModalityType.VISION: images[start:start + batch_size]})[ModalityType.VISION])
+    return torch.cat(outputs).numpy()
+
+
+def neighbour_overlap(reference: np.ndarray, embeddings: np.ndarray, k: int) -> float:
+    """Mean overlap of each image's k nearest other images, in the reference and the evaluated embeddings."""
+    k = min(k, len(reference) - 1)
+    if k <= 0:
+        return 1.0
+
+    def neighbours(vectors):
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = vectors @ vectors.T
+        np.fill_diagonal(scores, -np.inf)
+        return np.argsort(-scores, axis=1)[:, :k]
+
+    expected, actual = neighbours(reference), neighbours(embeddings)
+    return float(np.mean([len(set(e) & set(a)) / k for e, a in zip(expected, actual)]))
+
+
+def measure(encoder: VisionEncoder, images: torch.Tensor, batch_sizes: list, repeat: int) -> list:
+    rows = []
+    for batch_size in batch_sizes:
+        batch = images[:batch_size]
+        if len(batch) < batch_size:
+            batch = batch.repeat((batch_size + len(batch) - 1) // len(batch), 1, 1, 1)[:batch_size]
+        for _ in range(2):
+            encoder.encode(batch)
+
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            encoder.encode(batch)
+            latencies.append(time.perf_counter() - start)
+        p50 = float(np.percentile(latencies, 50))
+        rows.append({
+            "batch_size": batch_size,
+            "p50_ms": round(p50 * 1000, 1),
+            "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1),
+            "images_per_s": round(batch_size / p50, 2)
+        })
+    return rows
+
+
+def main():
+    parser = ArgumentParser(description="Accuracy and latency of the ImageBind vision inference modes")
+    parser.add_argument("--images", help="Directory of sample images")
+    parser.add_argument("--limit", type=int, default=32, help="Images used for the accuracy check")
+    parser.add_argument("--modes", nargs="+", default=["fp32", "int8", "bf16"], choices=INFERENCE_MODES)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per batch size")
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads (default: one per core)")
+    parser.add_argument("--k", type=int, default=5, help="Neighbours compared by the agreement check")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="Minimum cosine with fp32 for a mode to pass")
+    parser.add_argument("--onnx-path", default=".checkpoints/imagebind_huge_vision.onnx")
+    parser.add_argument("--json", metavar="path", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.limit)
+    reference_model = imagebind_model.imagebind_huge(pretrained=True, modalities=(ModalityType.VISION,))
+    reference_model.eval()
+    reference = reference_embeddings(reference_model, images)
+
+    report, failed = [], []
+    for mode in args.modes:
+        # int8 and onnx replace or export modules of the model they are given
+        model = reference_model if mode in ("fp32", "bf16") else copy.deepcopy(reference_model)
+        encoder = VisionEncoder(model, "cpu", mode=mode, num_threads=args.threads, onnx_path=args.onnx_path)
+
+        embeddings = np.concatenate([encoder.encode(images[start:start + 8]) for start in range(0, len(images), 8)])
+        cosine = np.sum(embeddings * reference, axis=1) / (
+            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+        result = {
+            "mode": mode,
+            "cosine_mean": round(float(cosine.mean()), 5),
+            "cosine_min": round(float(cosine.min()), 5),
+            "neighbour_overlap": round(neighbour_overlap(reference, embeddings, args.k), 4),
+            "latency": measure(encoder, images, args.batch_sizes, args.repeat)
+        }
+        report.append(result)
+        if result["cosine_min"] < args.min_cosine:
+            failed.append(mode)
+        del encoder, model
+
+    print(f"{len(images)} images, {torch.get_num_threads()} threads, agreement with fp32 (torch.no_grad)\n")
+    print(f"{'mode':<8}{'cos mean':>10}{'cos min':>10}{f'top{args.k} overlap':>14}{'batch':>7}{'p50 ms':>10}{'p95 ms':>10}{'img/s':>8}")
+    for result in report:
+        for i, row in enumerate(result["latency"]):
+            head = (
+                f"{result['mode']:<8}{result['cosine_mean']:>10}{result['cosine_min']:>10}{result['neighbour_overlap']:>14}"
+                if i == 0 else " " * 42
+            )
+            print(f"{head}{row['batch_size']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['images_per_s']:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if failed:
+        sys.exit(f"Below --min-cosine {args.min_cosine}: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -6,4 +6,5 @@
 
 from core.logging_config import setup_logging, LoggingMiddleware
 from core.common_config import common_parameters
+from core.tracing import setup_tracing, shutdown_tracing, start_span, TracingMiddleware
 from core.auth_utils import get_user_id, get_payload
\ No newline at end of file
@@ -18,6 +18,8 @@ common_parameters = {
     "memory_tokinizer_model": "cl100k_base", 
     "summary_max_tokens": 256, 
     "history_max_tokens": 1000,
+    "trace_export_path": "logs/traces.jsonl",
+    "trace_sample_ratio": 1.0,
     "kakao_app_key" : os.getenv('KAKAO_APP_KEY'),
     "kakao_admin_key" : os.getenv('KAKAO_ADMIN_KEY'),
     "KAKAO_USER_INFO_URL" : "https://kapi.kakao.com/v2/user/me",
@@ -7,6 +7,7 @@
 
 
 import os
+import inspect
 from functools import partial
 from types import SimpleNamespace
 
@@ -32,6 +33,7 @@ ModalityType = SimpleNamespace(
     DEPTH="depth",
     IMU="imu",
 )
+ALL_MODALITIES = tuple(vars(ModalityType).values())
 
 
 class ImageBindModel(nn.Module):
@@ -69,9 +71,16 @@ class ImageBindModel(nn.Module):
         imu_num_blocks=6,
         imu_num_heads=8,
         imu_drop_path=0.7,
+        modalities=ALL_MODALITIES,
     ):
         super().__init__()
 
+        # Only the preprocessors, trunks, heads and postprocessors of these modalities are built
+        unknown = set(modalities) - set(ALL_MODALITIES)
+        if unknown:
+            raise ValueError(f"Unknown modalities: {sorted(unknown)}")
+        self.modalities = tuple(modalities)
+
         self.modality_preprocessors = self._create_modality_preprocessors(
             video_frames,
             vision_embed_dim,
@@ -145,6 +154,42 @@ class ImageBindModel(nn.Module):
         thermal_kernel_size=16,
         imu_embed_dim=512,
     ):
+        modality_preprocessors = {}
+
+        if ModalityType.VISION in self.modalities:
+            modality_preprocessors[ModalityType.VISION] = self._create_vision_preprocessor(
+                video_frames, vision_embed_dim, kernel_size
+            )
+
+        if ModalityType.TEXT in self.modalities:
+            modality_preprocessors[ModalityType.TEXT] = TextPreprocessor(
+                context_length=77,
+                vocab_size=49408,
+                embed_dim=text_embed_dim,
+                causal_masking=True,
+            )
+
+        if ModalityType.AUDIO in self.modalities:
+            modality_preprocessors[ModalityType.AUDIO] = self._create_audio_preprocessor(
+                audio_embed_dim, audio_kernel_size, audio_stride, audio_num_mel_bins, audio_target_len
+            )
+
+        if ModalityType.DEPTH in self.modalities:
+            modality_preprocessors[ModalityType.DEPTH] = self._create_depth_preprocessor(
+                depth_embed_dim, depth_kernel_size
+            )
+
+        if ModalityType.THERMAL in self.modalities:
+            modality_preprocessors[ModalityType.THERMAL] = self._create_thermal_preprocessor(
+                thermal_embed_dim, thermal_kernel_size
+            )
+
+        if ModalityType.IMU in self.modalities:
+            modality_preprocessors[ModalityType.IMU] = self._create_imu_preprocessor(imu_embed_dim)
+
+        return nn.ModuleDict(modality_preprocessors)
+
+    def _create_vision_preprocessor(self, video_frames, vision_embed_dim, kernel_size):
         rgbt_stem = PatchEmbedGeneric(
             proj_stem=[
                 PadIm2Video(pad_type="repeat", ntimes=2),
@@ -164,14 +209,11 @@ class ImageBindModel(nn.Module):
             rgbt_stem=rgbt_stem,
             depth_stem=None,
         )
+        return rgbt_preprocessor
 
-        text_preprocessor = TextPreprocessor(
-            context_length=77,
-            vocab_size=49408,
-            embed_dim=text_embed_dim,
-            causal_masking=True,
-        )
-
+    def _create_audio_preprocessor(
+        self, audio_embed_dim, audio_kernel_size, audio_stride, audio_num_mel_bins, audio_target_len
+    ):
         audio_stem = PatchEmbedGeneric(
             proj_stem=[
                 nn.Conv2d(
@@ -190,7 +232,9 @@ class ImageBindModel(nn.Module):
             pos_embed_fn=partial(SpatioTemporalPosEmbeddingHelper, learnable=True),
             audio_stem=audio_stem,
         )
+        return audio_preprocessor
 
+    def _create_depth_preprocessor(self, depth_embed_dim, depth_kernel_size):
         depth_stem = PatchEmbedGeneric(
             [
                 nn.Conv2d(
@@ -211,7 +255,9 @@ class ImageBindModel(nn.Module):
             rgbt_stem=None,
             depth_stem=depth_stem,
         )
+        return depth_preprocessor
 
+    def _create_thermal_preprocessor(self, thermal_embed_dim, thermal_kernel_size):
         thermal_stem = PatchEmbedGeneric(
             [
                 nn.Conv2d(
@@ -230,7 +276,9 @@ class ImageBindModel(nn.Module):
             pos_embed_fn=partial(SpatioTemporalPosEmbeddingHelper, learnable=True),
             thermal_stem=thermal_stem,
         )
+        return thermal_preprocessor
 
+    def _create_imu_preprocessor(self, imu_embed_dim):
         imu_stem = PatchEmbedGeneric(
             [
                 nn.Linear(
@@ -250,17 +298,7 @@ class ImageBindModel(nn.Module):
             pos_embed_fn=partial(SpatioTemporalPosEmbeddingHelper, learnable=True),
             imu_stem=imu_stem,
         )
-
-        modality_preprocessors = {
-            ModalityType.VISION: rgbt_preprocessor,
-            ModalityType.TEXT: text_preprocessor,
-            ModalityType.AUDIO: audio_preprocessor,
-            ModalityType.DEPTH: depth_preprocessor,
-            ModalityType.THERMAL: thermal_preprocessor,
-            ModalityType.IMU: imu_preprocessor,
-        }
-
-        return nn.ModuleDict(modality_preprocessors)
+        return imu_preprocessor
 
     def _create_modality_trunks(
         self,
@@ -312,54 +350,60 @@ class ImageBindModel(nn.Module):
             )
 
         modality_trunks = {}
-        modality_trunks[ModalityType.VISION] = instantiate_trunk(
-            vision_embed_dim,
-            vision_num_blocks,
-            vision_num_heads,
-            pre_transformer_ln=True,
-            add_bias_kv=False,
-            drop_path=0.0,
-        )
-        modality_trunks[ModalityType.TEXT] = instantiate_trunk(
-            text_embed_dim,
-            text_num_blocks,
-            text_num_heads,
-            pre_transformer_ln=False,
-            add_bias_kv=False,
-            drop_path=0.0,
-        )
-        modality_trunks[ModalityType.AUDIO] = instantiate_trunk(
-            audio_embed_dim,
-            audio_num_blocks,
-            audio_num_heads,
-            pre_transformer_ln=False,
-            add_bias_kv=True,
-            drop_path=audio_drop_path,
-        )
-        modality_trunks[ModalityType.DEPTH] = instantiate_trunk(
-            depth_embed_dim,
-            depth_num_blocks,
-            depth_num_heads,
-            pre_transformer_ln=False,
-            add_bias_kv=True,
-            drop_path=depth_drop_path,
-        )
-        modality_trunks[ModalityType.THERMAL] = instantiate_trunk(
-            thermal_embed_dim,
-            thermal_num_blocks,
-            thermal_num_heads,
-            pre_transformer_ln=False,
-            add_bias_kv=True,
-            drop_path=thermal_drop_path,
-        )
-        modality_trunks[ModalityType.IMU] = instantiate_trunk(
-            imu_embed_dim,
-            imu_num_blocks,
-            imu_num_heads,
-            pre_transformer_ln=False,
-            add_bias_kv=True,
-            drop_path=imu_drop_path,
-        )
+        if ModalityType.VISION in self.modalities:
+            modality_trunks[ModalityType.VISION] = instantiate_trunk(
+                vision_embed_dim,
+                vision_num_blocks,
+                vision_num_heads,
+                pre_transformer_ln=True,
+                add_bias_kv=False,
+                drop_path=0.0,
+            )
+        if ModalityType.TEXT in self.modalities:
+            modality_trunks[ModalityType.TEXT] = instantiate_trunk(
+                text_embed_dim,
+                text_num_blocks,
+                text_num_heads,
+                pre_transformer_ln=False,
+                add_bias_kv=False,
+                drop_path=0.0,
+            )
+        if ModalityType.AUDIO in self.modalities:
+            modality_trunks[ModalityType.AUDIO] = instantiate_trunk(
+                audio_embed_dim,
+                audio_num_blocks,
+                audio_num_heads,
+                pre_transformer_ln=False,
+                add_bias_kv=True,
+                drop_path=audio_drop_path,
+            )
+        if ModalityType.DEPTH in self.modalities:
+            modality_trunks[ModalityType.DEPTH] = instantiate_trunk(
+                depth_embed_dim,
+                depth_num_blocks,
+                depth_num_heads,
+                pre_transformer_ln=False,
+                add_bias_kv=True,
+                drop_path=depth_drop_path,
+            )
+        if ModalityType.THERMAL in self.modalities:
+            modality_trunks[ModalityType.THERMAL] = instantiate_trunk(
+                thermal_embed_dim,
+                thermal_num_blocks,
+                thermal_num_heads,
+                pre_transformer_ln=False,
+                add_bias_kv=True,
+                drop_path=thermal_drop_path,
+            )
+        if ModalityType.IMU in self.modalities:
+            modality_trunks[ModalityType.IMU] = instantiate_trunk(
+                imu_embed_dim,
+                imu_num_blocks,
+                imu_num_heads,
+                pre_transformer_ln=False,
+                add_bias_kv=True,
+                drop_path=imu_drop_path,
+            )
 
         return nn.ModuleDict(modality_trunks)
 
@@ -413,7 +457,9 @@ class ImageBindModel(nn.Module):
             nn.Linear(imu_embed_dim, out_embed_dim, bias=False),
         )
 
-        return nn.ModuleDict(modality_heads)
+        return nn.ModuleDict(
+            {key: module for key, module in modality_heads.items() if key in self.modalities}
+        )
 
     def _create_modality_postprocessors(self, out_embed_dim):
         modality_postprocessors = {}
@@ -439,11 +485,15 @@ class ImageBindModel(nn.Module):
             LearnableLogitScaling(logit_scale_init=5.0, learnable=False),
         )
 
-        return nn.ModuleDict(modality_postprocessors)
+        return nn.ModuleDict(
+            {key: module for key, module in modality_postprocessors.items() if key in self.modalities}
+        )
 
     def forward(self, inputs):
         outputs = {}
         for modality_key, modality_value in inputs.items():
+            if modality_key not in self.modalities:
+                raise ValueError(f"The model was built without the {modality_key} modality")
             reduce_list = (
                 modality_value.ndim >= 5
             )  # Audio and Video inputs consist of multiple clips
@@ -476,8 +526,74 @@ class ImageBindModel(nn.Module):
         return outputs
 
 
-def imagebind_huge(pretrained=False):
-    model = ImageBindModel(
+CHECKPOINT_PATH = ".checkpoints/imagebind_huge.pth"
+
+
+def _accepts(func, argument):
+    try:
+        return argument in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _modality_checkpoint_path(modalities):
+    """Checkpoint holding only the weights of `modalities`, split from the full one on first use."""
+    if set(modalities) == set(ALL_MODALITIES):
+        return CHECKPOINT_PATH
+    root, ext = os.path.splitext(CHECKPOINT_PATH)
+    return f"{root}-{'-'.join(sorted(modalities))}{ext}"
+
+
+def load_checkpoint(modalities=ALL_MODALITIES, mmap=True):
+    """
+    State dict of the ImageBind-huge modules of `modalities`.
+
+    The first call for a subset of the modalities filters the full checkpoint
+    and saves the subset next to it; later calls read only that smaller file.
+    With `mmap` (torch >= 2.1) tensors are memory-mapped from the file instead
+    of read into memory, so only the pages actually used become resident.
+    """
+    kwargs = {"map_location": "cpu"}
+    if mmap and _accepts(torch.load, "mmap"):
+        kwargs["mmap"] = True
+
+    path = _modality_checkpoint_path(modalities)
+    if os.path.exists(path):
+        return torch.load(path, **kwargs)
+
+    if not os.path.exists(CHECKPOINT_PATH):
+        print(
+            "Downloading imagebind weights to .checkpoints/imagebind_huge.pth ..."
+        )
+        os.makedirs(".checkpoints", exist_ok=True)
+        torch.hub.download_url_to_file(
+            "https://dl.fbaipublicfiles.com/imagebind/imagebind_huge.pth",
+            CHECKPOINT_PATH,
+            progress=True,
+        )
+
+    # Keys are "<modules>.<modality>.<...>", e.g. modality_trunks.vision.blocks.0.attn.in_proj_weight
+    state_dict = {
+        key: value
+        for key, value in torch.load(CHECKPOINT_PATH, **kwargs).items()
+        if key.split(".")[1] in modalities
+    }
+    if path != CHECKPOINT_PATH:
+        torch.save(state_dict, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    return state_dict
+
+
+def imagebind_huge(pretrained=False, modalities=ALL_MODALITIES, mmap=True):
+    """
+    ImageBind-huge with the modules of `modalities` only.
+
+    For pretrained models on torch >= 2.1 the modules are created on the meta
+    device and the memory-mapped checkpoint tensors are assigned to them, which
+    skips the random initialization and the copy of every weight.
+    """
+    build = partial(
+        ImageBindModel,
         vision_embed_dim=1280,
         vision_num_blocks=32,
         vision_num_heads=16,
@@ -487,20 +603,29 @@ def imagebind_huge(pretrained=False):
         out_embed_dim=1024,
         audio_drop_path=0.1,
         imu_drop_path=0.7,
+        modalities=modalities,
     )
 
-    if pretrained:
-        if not os.path.exists(".checkpoints/imagebind_huge.pth"):
-            print(
-                "Downloading imagebind weights to .checkpoints/imagebind_huge.pth ..."
-            )
-            os.makedirs(".checkpoints", exist_ok=True)
-            torch.hub.download_url_to_file(
-                "https://dl.fbaipublicfiles.com/imagebind/imagebind_huge.pth",
-                ".checkpoints/imagebind_huge.pth",
-                progress=True,
-            )
+    lazy = (
+        pretrained
+        and mmap
+        and _accepts(torch.load, "mmap")
+        and _accepts(nn.Module.load_state_dict, "assign")
+    )
+    if lazy:
+        try:
+            with torch.device("meta"):
+                model = build()
+        except (NotImplementedError, RuntimeError):  # an initializer without meta support
+            lazy = False
+    if not lazy:
+        model = build()
 
-        model.load_state_dict(torch.load(".checkpoints/imagebind_huge.pth"))
+    if pretrained:
+        state_dict = load_checkpoint(model.modalities, mmap)
+        if lazy:
+            model.load_state_dict(state_dict, assign=True)
+        else:
+            model.load_state_dict(state_dict)
 
-    return model
+    return model
\ No newline at end of file
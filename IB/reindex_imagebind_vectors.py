@@ -0,0 +1,44 @@
+from argparse import ArgumentParser, RawTextHelpFormatter
+
+from core import common_parameters
+from services.data_manager import ElasticsearchDataManager
+from services.utils import VECTOR_FIELD
+
+
+# Command line arguments parser
+def get_args():
+    parser = ArgumentParser(description='Reindex destinations with an HNSW-indexed ImageBind vector for kNN search', formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-eh', '--es_host', metavar='es_host', default=common_parameters['elasticsearch_host'], help="Elasticsearch Host")
+    parser.add_argument('-s', '--source', metavar='source', default="gildong_1", help="Index holding the existing vectors")
+    parser.add_argument('-t', '--target', metavar='target', default="gildong_1_knn", help="Index to create")
+    parser.add_argument('-a', '--alias', metavar='alias', default=None, help="Alias moved to the target index once the copy is verified;\nset `index_name` in routers/router_config.py to it")
+    parser.add_argument('-d', '--dims', metavar='dims', type=int, default=1024, help="Vector dimensions (ImageBind-huge: 1024)")
+    parser.add_argument('--similarity', default="cosine", choices=["cosine", "dot_product", "l2_norm"], help="kNN similarity; dot_product requires unit length vectors")
+    parser.add_argument('-m', '--hnsw_m', metavar='m', type=int, default=16, help="HNSW neighbours per node")
+    parser.add_argument('-ef', '--ef_construction', metavar='ef', type=int, default=100, help="HNSW candidates while building the graph")
+    parser.add_argument('-b', '--batch_size', metavar='batch_size', type=int, default=500, help="Documents per reindex batch")
+    return parser.parse_args()
+
+# Main Execution
+if __name__ == "__main__":
+    args = get_args()
+
+    db = ElasticsearchDataManager(args.es_host)
+    db.create_vector_index(
+        source_index=args.source,
+        target_index=args.target,
+        vector_field=VECTOR_FIELD,
+        dims=args.dims,
+        similarity=args.similarity,
+        index_options={"type": "hnsw", "m": args.hnsw_m, "ef_construction": args.ef_construction}
+    )
+    written = db.reindex(args.source, args.target, batch_size=args.batch_size)
+
+    source_count = db.client.count(index=args.source)["count"]
+    print(f"Copied {written} of {source_count} documents from {args.source} to {args.target}.")
+
+    if args.alias:
+        if written != source_count:
+            raise SystemExit(f"Document counts differ, alias {args.alias} left unchanged.")
+        db.point_alias(args.alias, args.target)
+        print(f"Alias {args.alias} now points to {args.target}.")
\ No newline at end of file
@@ -4,6 +4,11 @@ from fastapi.staticfiles import StaticFiles
 from typing import List
 import os
 import json
+import time
+import asyncio
+import threading
+import contextvars
+from queue import Full
 from datetime import datetime
 from pydantic import BaseModel
 import numpy as np
@@ -14,7 +19,10 @@ import torch
 from models import imagebind_model
 from models.imagebind_model import ModalityType
 from routers.router_config import parameters
-from services import ElasticsearchDataManager
+from core import start_span
+from services import ElasticsearchDataManager, LocalVectorIndex, InferenceBatcher
+from services.vision_encoder import VisionEncoder
+from services.utils import VECTOR_FIELD, SOURCE_FIELDS, EmbeddingCache, script_query, knn_query
 
 router = APIRouter()
 
@@ -31,56 +39,171 @@ class FileUploadResponse(BaseModel):
 device = "cuda:0" if torch.cuda.is_available() else "cpu"
 
 # Instantiate model
-model = imagebind_model.imagebind_huge(pretrained=True)
+# Only the vision modules are built and loaded: the service never embeds other modalities
+model = imagebind_model.imagebind_huge(pretrained=True, modalities=(ModalityType.VISION,))
 #model.eval()
 model.to(device)
+encoder = VisionEncoder(
+    model, 
+    device, 
+    mode=parameters['inference_mode'], 
+    num_threads=parameters['inference_threads'], 
+    interop_threads=parameters['inference_interop_threads'], 
+    onnx_path=parameters['inference_onnx_path']
+)
 
 router = APIRouter()
 
 logger = structlog.get_logger()
 db = ElasticsearchDataManager(parameters['elasticsearch_host'])
 
-def embeddings(url):
-    inputs = {
-    ModalityType.VISION: data.load_and_transform_vision_data([url], device)
-    }
-    with torch.no_grad():
-        embeddings = model(inputs)
-    return embeddings
+local_index = LocalVectorIndex(
+    parameters['local_index_dir'], 
+    VECTOR_FIELD, 
+    dims=parameters['embedding_dims'], 
+    ivf_lists=parameters['local_index_ivf_lists'], 
+    ivf_probe=parameters['local_index_ivf_probe']
+)
+if parameters['local_index_enabled']:
+    local_index.load()
+
+embedding_cache = EmbeddingCache(
+    parameters['embedding_cache_dir'], 
+    dims=parameters['embedding_dims'], 
+    namespace=f"{parameters['embedding_cache_namespace']}-{encoder.mode}", 
+    maxsize=parameters['embedding_cache_size']
+)
+
+async def run_blocking(func, *args):
+    """Run file, disk-cache, Elasticsearch or BLAS work in the thread pool, in the current trace context."""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(None, context.run, func, *args)
+
+def embed_batch(images: List[torch.Tensor]) -> List[np.ndarray]:
+    """One forward pass over preprocessed images (batch function of the inference queue)."""
+    return list(encoder.encode(torch.stack(images)))
+
+batcher = InferenceBatcher(
+    embed_batch, 
+    max_batch_size=parameters['batch_max_size'], 
+    max_wait_ms=parameters['batch_max_wait_ms'], 
+    max_queue_size=parameters['batch_queue_size'], 
+    name="imagebind_vision"
+)
+pending_embeddings = {}  # content hash -> task computing its embedding
+
+async def compute_embedding(key: str, file_path: str) -> np.ndarray:
+    # Decoding and resizing run in the thread pool, concurrently for every request of a batch
+    image = await run_blocking(lambda: data.load_and_transform_vision_data([file_path], device)[0])
+    with start_span("imagebind.embed", file_name=os.path.basename(file_path)):
+        embedding = await asyncio.wrap_future(batcher.submit(image))
+    await run_blocking(embedding_cache.set, key, embedding)
+    return embedding
+
+def cached_embedding(file_path: str) -> tuple:
+    """Hash of the uploaded bytes and its cached embedding, or None."""
+    with open(file_path, "rb") as f:
+        key = EmbeddingCache.key_of(f.read())
+    return key, embedding_cache.get(key)
+
+async def image_embedding(file_path: str) -> np.ndarray:
+    """
+    Vision embedding of an uploaded image, cached by the hash of its bytes.
+
+    The same picture uploaded again (under another timestamped file name), a
+    retried request or a re-run chatbot turn costs one hash instead of a forward
+    pass; concurrent requests for the same picture share one computation. Misses
+    go through the micro-batching inference queue.
+
+    Args:
+    - file_path (str): Uploaded image.
+
+    Returns:
+    - np.ndarray: Embedding of the image.
+
+    """
+    key, embedding = await run_blocking(cached_embedding, file_path)
+    if embedding is not None:
+        return embedding
+
+    task = pending_embeddings.get(key)
+    if task is None:
+        task = asyncio.ensure_future(compute_embedding(key, file_path))
+        pending_embeddings[key] = task
+        task.add_done_callback(lambda _: pending_embeddings.pop(key, None))
+    return await asyncio.shield(task)
 
 def round5(body):
     body = np.round(body.tolist(), 5)
     body = body.tolist()
     return body
 
-def script_query(embed, source):
-    script_query_text = {
-        "_source" : [
-            "title", 
-            "contenttypeid", 
-            "overview_summ", 
-            "physical_en", 
-            "visual_en", 
-            "hearing_en", 
-            "location"
-        ],
-        "size" : 10,
-  "query": {
-    "script_score": {
-      "query": {
-        "exists": {"field": "imagebind_vector"}
-      },
-      "script": {
-        "source": source,
-        "params": {
-          "query_vector": embed
-        }
-      }
-    }
-  }
-}
-
-    return script_query_text
+def refresh_local_index():
+    """Keep the local index in sync with Elasticsearch; builds it first if no files were found."""
+    while True:
+        try:
+            local_index.refresh(db, parameters['index_name'])
+        except Exception as e:
+            logger.error("Local vector index refresh failed.", error=str(e))
+        time.sleep(parameters['local_index_refresh_seconds'])
+
+@router.on_event("startup")
+def start_local_index_refresh():
+    if parameters['local_index_enabled']:
+        threading.Thread(target=refresh_local_index, name="local-index-refresh", daemon=True).start()
+
+def local_search(embedding: np.ndarray, size: int):
+    """
+    Nearest destinations from the in-process index, with their sources fetched by id.
+
+    Scores use the scale of the exact script (cosine similarity + 1.0).
+
+    """
+    with start_span("imagebind.local_index", documents=len(local_index)):
+        matches = local_index.search(embedding, size)
+    docs = {doc["_id"]: doc for doc in db.fetch_documents(parameters['index_name'], [doc_id for doc_id, _ in matches], SOURCE_FIELDS)}
+    hits = [
+        {"_index": docs[doc_id]["_index"], "_id": doc_id, "_score": score + 1.0, "_source": docs[doc_id]["_source"]}
+        for doc_id, score in matches if doc_id in docs
+    ]
+    return {"hits": {"hits": hits}}
+
+def vector_search(embedding: np.ndarray):
+    """
+    Nearest destinations of an image embedding.
+
+    Uses the in-process index once it is loaded, then the HNSW kNN search unless
+    `image_search_mode` is "script"; falls back to the exact script_score scan
+    when the kNN query fails (e.g. the index has not been migrated with
+    reindex_imagebind_vectors.py yet).
+
+    Args:
+    - embedding (np.ndarray): ImageBind vision embedding.
+
+    Returns:
+    - dict: Elasticsearch search response (or one with the same `hits` layout).
+
+    """
+    size = parameters['image_search_size']
+    if parameters['local_index_enabled'] and local_index.ready:
+        try:
+            return local_search(embedding, size)
+        except Exception as e:
+            logger.warning("Local vector index search failed, falling back to Elasticsearch.", error=str(e))
+
+    query_vector = embedding.tolist()
+    if parameters['image_search_mode'] == "knn":
+        try:
+            with start_span("imagebind.knn", num_candidates=parameters['knn_num_candidates']):
+                return db.fetch_region(
+                    index_n=parameters['index_name'], 
+                    body=knn_query(query_vector, size, parameters['knn_num_candidates'])
+                )
+        except ValueError as e:
+            logger.warning("kNN search failed, falling back to exact search.", error=str(e))
+
+    with start_span("imagebind.script_score"):
+        return db.fetch_region(index_n=parameters['index_name'], body=script_query(query_vector, size=size))
 
 
 def search(es,script_query,index,size):
@@ -115,12 +238,13 @@ def search(es,script_query,index,size):
 async def search_image(file_name: dict):
     file_name = file_name.get("file_name")  # 요청 데이터에서 "file_name" 키의 값을 가져옴
     file_path = os.path.join(UPLOAD_DIR, file_name)
-    array_img = embeddings(file_path)
-    query_vector = array_img[ModalityType.VISION].tolist()[0]  # PyTorch Tensor를 Python 리스트로 변환
-    script_query_img = script_query(query_vector, "cosineSimilarity(params.query_vector, 'imagebind_vector') + 1.0")
-    res = db.fetch_region(index_n=parameters['index_name'], body=script_query_img)
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
+    try:
+        embedding = await image_embedding(file_path)
+    except Full:
+        raise HTTPException(status_code=503, detail="Too many images queued for embedding")
+    res = await run_blocking(vector_search, embedding)
     json_string = json.dumps(res['hits']['hits'])
     return Response(json_string, media_type='application/json')
 
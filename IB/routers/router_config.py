@@ -3,5 +3,28 @@ from core import common_parameters
 
 parameters = {
     **common_parameters,
-    "index_name": "gildong_1"
+    "index_name": "gildong_1",
+    "embedding_dims": 1024,  # ImageBind-huge
+    # CPU inference: "fp32", "int8" (dynamic quantization), "bf16" (autocast) or "onnx" (ONNX Runtime)
+    "inference_mode": "fp32",
+    "inference_threads": None,  # None: one per core; set cores / processes when several run on a host
+    "inference_interop_threads": 1,
+    "inference_onnx_path": ".checkpoints/imagebind_huge_vision.onnx",
+    "image_search_mode": "knn",  # "knn" (HNSW, approximate) or "script" (exact script_score)
+    "image_search_size": 10,
+    "knn_num_candidates": 100,
+    # In-process float16 copy of the vectors, searched before Elasticsearch
+    "local_index_enabled": True,
+    "local_index_dir": "index/imagebind",
+    "local_index_ivf_lists": 0,  # 0: exact scan; e.g. 1024 for catalogs of millions of images
+    "local_index_ivf_probe": 16,
+    "local_index_refresh_seconds": 300,
+    # Embeddings of uploaded images by content hash: in-memory LRU, then float16 files
+    "embedding_cache_size": 4096,
+    "embedding_cache_dir": "cache/embeddings",  # None: memory only
+    "embedding_cache_namespace": "imagebind_huge",  # the inference mode is appended
+    # Micro-batching of concurrent forward passes: larger/longer raises throughput and the latency of a lone request
+    "batch_max_size": 8,
+    "batch_max_wait_ms": 10,
+    "batch_queue_size": 256
 }
\ No newline at end of file
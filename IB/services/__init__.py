@@ -1,3 +1,5 @@
 from services.data_manager import ElasticsearchDataManager
 from services.kakao_manager import KakaoManager
-from services.token_manager import TokenManager
\ No newline at end of file
+from services.token_manager import TokenManager
+from services.vector_index import LocalVectorIndex
+from services.inference_batcher import InferenceBatcher
\ No newline at end of file
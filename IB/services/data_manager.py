@@ -1,11 +1,14 @@
+import time
 from typing import List
 
 import structlog
 import pytz
 from datetime import datetime
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
 from elasticsearch.exceptions import NotFoundError, RequestError
 
+from core.tracing import trace_elasticsearch
+
 
 logger = structlog.get_logger()
 
@@ -13,7 +16,7 @@ logger = structlog.get_logger()
 class ElasticsearchDataManager:
 
     def __init__(self, host):
-        self.client = Elasticsearch(host, timeout=5, max_retries=2, retry_on_timeout=True)
+        self.client = trace_elasticsearch(Elasticsearch(host, timeout=5, max_retries=2, retry_on_timeout=True))
         
         self.korea_time = pytz.timezone('Asia/Seoul')
 
@@ -264,4 +267,136 @@ class ElasticsearchDataManager:
 
         except Exception as e:
             raise ValueError(f"Error occurred while retrieving document from Elasticsearch: {str(e)}")
-    
\ No newline at end of file
+
+    def scan_documents(self, index_n: str, body: dict, batch_size: int = 1000):
+        """
+        Iterate over every hit of a query with a scroll.
+
+        Args:
+        - index_n (str): Index to read.
+        - body (dict): Search body (`query`, `_source`, `seq_no_primary_term`, ...).
+        - batch_size (int): Hits per scroll page.
+
+        Returns:
+        - generator: Raw hits.
+
+        """
+        try:
+            yield from helpers.scan(self.client, index=index_n, query=body, size=batch_size)
+
+        except Exception as e:
+            raise ValueError(f"Error occurred while scanning {index_n} in Elasticsearch: {str(e)}")
+
+    def fetch_documents(self, index_n: str, doc_ids: List[str], source_fields: List[str] = []):
+        """
+        Fetch documents by id with one `_mget` request.
+
+        Args:
+        - index_n (str): Index to read.
+        - doc_ids (list): Document ids.
+        - source_fields (list): Source fields returned.
+
+        Returns:
+        - list: Hits of the documents found, in the order of `doc_ids`.
+
+        """
+        if not doc_ids:
+            return []
+        try:
+            response = self.client.mget(index=index_n, body={"ids": doc_ids}, _source=source_fields or True)
+            return [doc for doc in response["docs"] if doc.get("found")]
+
+        except Exception as e:
+            raise ValueError(f"Error occurred while retrieving documents from {index_n} in Elasticsearch: {str(e)}")
+
+    def create_vector_index(
+        self, 
+        source_index: str, 
+        target_index: str, 
+        vector_field: str, 
+        dims: int, 
+        similarity: str = "cosine", 
+        index_options: dict = None
+    ):
+        """
+        Create an index with the mapping of `source_index` and an HNSW-indexed `dense_vector` field.
+
+        Args:
+        - source_index (str): Index (or alias) whose mapping and analysis settings are copied.
+        - target_index (str): Index to create.
+        - vector_field (str): Field mapped as an indexed `dense_vector`, e.g. imagebind_vector.
+        - dims (int): Vector dimensions.
+        - similarity (str): kNN similarity (cosine, dot_product or l2_norm).
+        - index_options (dict): HNSW parameters, e.g. {"type": "hnsw", "m": 16, "ef_construction": 100}.
+
+        """
+        try:
+            mappings = next(iter(self.client.indices.get_mapping(index=source_index).values()))["mappings"]
+            settings = next(iter(self.client.indices.get_settings(index=source_index).values()))["settings"]["index"]
+
+            vector_mapping = {"type": "dense_vector", "dims": dims, "index": True, "similarity": similarity}
+            if index_options:
+                vector_mapping["index_options"] = index_options
+            mappings.setdefault("properties", {})[vector_field] = vector_mapping
+
+            index_settings = {key: settings[key] for key in ("number_of_shards", "number_of_replicas", "analysis") if key in settings}
+            self.client.indices.create(index=target_index, body={"settings": index_settings, "mappings": mappings})
+            logger.info("Vector index created successfully.", source=source_index, index=target_index, field=vector_field)
+
+        except Exception as e:
+            raise ValueError(f"Error occurred while creating vector index {target_index} in Elasticsearch: {str(e)}")
+
+    def reindex(self, source_index: str, target_index: str, batch_size: int = 500, poll_seconds: float = 5.):
+        """
+        Copy every document of an index with a server-side `_reindex` task and wait for it.
+
+        Args:
+        - source_index (str): Index (or alias) to copy from.
+        - target_index (str): Index to copy into.
+        - batch_size (int): Documents per scroll batch of the task.
+        - poll_seconds (float): Interval between task status requests.
+
+        Returns:
+        - int: Number of documents written.
+        
+        """
+        try:
+            task_id = self.client.reindex(
+                body={"source": {"index": source_index, "size": batch_size}, "dest": {"index": target_index}},
+                wait_for_completion=False,
+                refresh=True
+            )["task"]
+
+            while True:
+                task = self.client.tasks.get(task_id=task_id)
+                if task["completed"]:
+                    break
+                logger.info("Reindexing.", task=task_id, status=task["task"]["status"])
+                time.sleep(poll_seconds)
+
+            response = task.get("response", {})
+            if task.get("error") or response.get("failures"):
+                raise ValueError(task.get("error") or response["failures"][:3])
+
+            written = response.get("created", 0) + response.get("updated", 0)
+            logger.info("Reindexed successfully.", source=source_index, index=target_index, written=written)
+            return written
+
+        except Exception as e:
+            raise ValueError(f"Error occurred while reindexing {source_index} into {target_index} in Elasticsearch: {str(e)}")
+
+    def point_alias(self, alias: str, index_n: str):
+        """Atomically move `alias` to `index_n`, removing it from the indices it pointed to."""
+        try:
+            try:
+                current = list(self.client.indices.get_alias(name=alias).keys())
+            except NotFoundError:
+                current = []
+
+            actions = [{"remove": {"index": index, "alias": alias}} for index in current if index != index_n]
+            actions.append({"add": {"index": index_n, "alias": alias}})
+            self.client.indices.update_aliases(body={"actions": actions})
+            logger.info("Alias updated successfully.", alias=alias, index=index_n, previous=current)
+
+        except Exception as e:
+            raise ValueError(f"Error occurred while pointing alias {alias} to {index_n} in Elasticsearch: {str(e)}")
\ No newline at end of file
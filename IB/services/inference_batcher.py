@@ -0,0 +1,151 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+
+logger = structlog.get_logger()
+
+
+QUEUE_DEPTH = Gauge(
+    "inference_batch_queue_depth",
+    "Requests waiting for the next inference batch.",
+    ["model"]
+)
+BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Requests run together in one forward pass.",
+    ["model"],
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+)
+QUEUE_SECONDS = Histogram(
+    "inference_batch_queue_seconds",
+    "Time a request waited in the queue before its batch started.",
+    ["model"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5.)
+)
+INFERENCE_SECONDS = Histogram(
+    "inference_batch_seconds",
+    "Duration of one batched forward pass.",
+    ["model"],
+    buckets=(.05, .1, .25, .5, 1., 2., 4., 8., 16., 32.)
+)
+REJECTED = Counter(
+    "inference_batch_rejected_total",
+    "Requests refused because the queue was full.",
+    ["model"]
+)
+
+
+class InferenceBatcher:
+    """
+    Dynamic micro-batching of model inference.
+
+    Callers `submit` single inputs from any thread; one worker thread collects
+    them until `max_batch_size` inputs are queued or `max_wait_ms` passed since
+    the first one, runs `batch_fn` once on the whole batch and resolves each
+    caller's future with its own output. A larger batch raises throughput, a
+    longer wait raises the latency of a lone request.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.,
+        max_queue_size: int = 256,
+        name: str = "model"
+    ) -> None:
+        """
+        Initialize the batcher and start its worker thread.
+
+        Args:
+        - batch_fn (callable): Maps a list of inputs to the list of their outputs, in order.
+        - max_batch_size (int): Most inputs run in one call of `batch_fn`.
+        - max_wait_ms (float): Longest time the first input of a batch waits for others.
+        - max_queue_size (int): Queued inputs beyond which `submit` refuses new ones.
+        - name (str): Model label of the metrics.
+
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name=f"{name}-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue one input.
+
+        Args:
+        - item (any): Input of `batch_fn`.
+
+        Returns:
+        - Future: Resolved with the output of the input, or the error of its batch.
+
+        Raises:
+        - queue.Full: The queue holds `max_queue_size` inputs.
+
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            REJECTED.labels(self.name).inc()
+            raise
+        QUEUE_DEPTH.labels(self.name).set(self._queue.qsize())
+        return future
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        QUEUE_DEPTH.labels(self.name).set(self._queue.qsize())
+        return batch
+
+    def _process(self, batch: list) -> None:
+        start = time.perf_counter()
+        # Drop the requests whose caller gave up meanwhile
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        for _, _, queued_at in batch:
+            QUEUE_SECONDS.labels(self.name).observe(start - queued_at)
+        BATCH_SIZE.labels(self.name).observe(len(batch))
+
+        try:
+            outputs = list(self.batch_fn([item for item, _, _ in batch]))
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"batch_fn returned {len(outputs)} outputs for {len(batch)} inputs")
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+        except Exception as e:
+            logger.exception("Batched inference failed.", model=self.name, batch_size=len(batch))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        INFERENCE_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            stop = any(entry is None for entry in batch)
+            self._process([entry for entry in batch if entry is not None])
+            if stop:
+                return
+
+    def close(self) -> None:
+        """Stop the worker thread once the inputs queued so far are processed."""
+        self._queue.put(None)
+        self._thread.join()
\ No newline at end of file
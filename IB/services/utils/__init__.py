@@ -0,0 +1,2 @@
+from services.utils.image_query import VECTOR_FIELD, SOURCE_FIELDS, script_query, knn_query
+from services.utils.embedding_cache import EmbeddingCache
\ No newline at end of file
@@ -0,0 +1,97 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of image embeddings keyed by a hash of the image bytes.
+
+    The first tier is an in-memory LRU; the second stores each vector as a raw
+    float16 file under `path/namespace/`, so embeddings survive restarts and are
+    shared by every process using the same directory. The namespace identifies
+    the model (and inference mode) that produced the vectors.
+    """
+
+    def __init__(self, path: Optional[str], dims: int, namespace: str, maxsize: int = 4096) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+        - path (str): Root directory of the on-disk tier; None keeps the cache in memory only.
+        - dims (int): Embedding dimensions.
+        - namespace (str): Model identifier, e.g. imagebind_huge-fp32.
+        - maxsize (int): Entries kept in memory before the least recently used one is evicted.
+
+        """
+        self.dims = dims
+        self.maxsize = maxsize
+        self.directory = os.path.join(path, namespace) if path else None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_of(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".f16")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._data[key] = vector
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up an embedding, first in memory, then on disk.
+
+        Args:
+        - key (str): Content hash from `key_of`.
+
+        Returns:
+        - np.ndarray: float32 embedding, or None.
+
+        """
+        with self._lock:
+            vector = self._data.get(key)
+            if vector is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return vector.astype(np.float32)
+
+        if self.directory:
+            try:
+                vector = np.fromfile(self._file(key), dtype=np.float16)
+            except (FileNotFoundError, ValueError):
+                vector = None
+            if vector is not None and vector.shape[0] == self.dims:
+                self._remember(key, vector)
+                self.disk_hits += 1
+                return vector.astype(np.float32)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, embedding: np.ndarray) -> None:
+        vector = np.asarray(embedding, dtype=np.float16).reshape(-1)
+        self._remember(key, vector)
+
+        if self.directory:
+            path = self._file(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+            vector.tofile(tmp)
+            os.replace(tmp, path)
+
+    def __len__(self) -> int:
+        return len(self._data)
\ No newline at end of file
@@ -0,0 +1,72 @@
+from typing import List
+
+
+VECTOR_FIELD = "imagebind_vector"
+SOURCE_FIELDS = [
+    "title", 
+    "contenttypeid", 
+    "overview_summ", 
+    "physical_en", 
+    "visual_en", 
+    "hearing_en", 
+    "location",
+    "prompt_snippet",
+    "prompt_tokens",
+    "prompt_fields"
+]
+
+# Exact score: brute force over every document with a vector
+EXACT_SCORE_SCRIPT = f"cosineSimilarity(params.query_vector, '{VECTOR_FIELD}') + 1.0"
+
+
+def script_query(embed: List[float], source: str = EXACT_SCORE_SCRIPT, size: int = 10) -> dict:
+    """
+    Exact nearest neighbours with a `script_score` query (linear scan of the index).
+
+    Args:
+    - embed (list): Query vector.
+    - source (str): Painless score script reading `params.query_vector`.
+    - size (int): Number of hits.
+
+    Returns:
+    - dict: Search request body.
+
+    """
+    return {
+        "_source": SOURCE_FIELDS,
+        "size": size,
+        "query": {
+            "script_score": {
+                "query": {"exists": {"field": VECTOR_FIELD}},
+                "script": {
+                    "source": source,
+                    "params": {"query_vector": embed}
+                }
+            }
+        }
+    }
+
+
+def knn_query(embed: List[float], k: int = 10, num_candidates: int = 100) -> dict:
+    """
+    Approximate nearest neighbours over the HNSW graph of an indexed `dense_vector` field.
+
+    Args:
+    - embed (list): Query vector.
+    - k (int): Number of hits.
+    - num_candidates (int): Candidates examined per shard; higher is slower and closer to exact.
+
+    Returns:
+    - dict: Search request body.
+
+    """
+    return {
+        "_source": SOURCE_FIELDS,
+        "size": k,
+        "knn": {
+            "field": VECTOR_FIELD,
+            "query_vector": embed,
+            "k": k,
+            "num_candidates": max(k, num_candidates)
+        }
+    }
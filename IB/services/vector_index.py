@@ -0,0 +1,336 @@
+import os
+import json
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from services.data_manager import ElasticsearchDataManager
+
+
+logger = structlog.get_logger()
+
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.f16"
+CENTROIDS_FILE = "centroids.npy"
+
+
+class _Snapshot:
+    """Immutable view of the index; searches keep using theirs while a refresh swaps in the next one."""
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        ids: List[Optional[str]],
+        versions: dict,
+        centroids: Optional[np.ndarray] = None,
+        list_offsets: Optional[np.ndarray] = None
+    ) -> None:
+        self.matrix = matrix
+        self.ids = ids
+        self.versions = versions  # doc id -> "primary_term:seq_no" of the indexed vector
+        self.alive = np.array([doc_id is not None for doc_id in ids], dtype=bool)
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+
+    @property
+    def clustered_rows(self) -> int:
+        return int(self.list_offsets[-1]) if self.list_offsets is not None else 0
+
+
+class LocalVectorIndex:
+    """
+    In-process nearest neighbour index of the ImageBind vectors of an Elasticsearch index.
+
+    Vectors are L2-normalized and stored as a memory-mapped float16 matrix, so the
+    OS page cache holds one copy shared by every process on the host, and a query
+    is scored with matrix-vector products (upcast to float32 by blocks of rows).
+
+    With `ivf_lists` > 0 the rows are grouped by k-means cluster at build time and
+    only the `ivf_probe` clusters closest to the query are scored (approximate).
+    Rows appended by `refresh` after the build form an unclustered tail that is
+    always scanned; the next rebuild clusters them.
+
+    `refresh` applies the changes of the Elasticsearch index: new or updated
+    documents (detected with `_seq_no`/`_primary_term`) are appended and removed
+    ones are masked. A rebuild happens once masked rows exceed `compact_ratio`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        vector_field: str,
+        dims: int = 1024,
+        ivf_lists: int = 0,
+        ivf_probe: int = 8,
+        block_rows: int = 16384,
+        compact_ratio: float = 0.2
+    ) -> None:
+        self.path = path
+        self.vector_field = vector_field
+        self.dims = dims
+        self.ivf_lists = ivf_lists
+        self.ivf_probe = ivf_probe
+        self.block_rows = block_rows
+        self.compact_ratio = compact_ratio
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()  # one build or refresh at a time
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return int(snapshot.alive.sum()) if snapshot is not None else 0
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def load(self) -> bool:
+        """
+        Map the index files written by a previous build or refresh.
+
+        Returns:
+        - bool: Whether an index of the configured dimensions was found.
+
+        """
+        try:
+            with open(self._file(MANIFEST_FILE), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return False
+
+        if manifest["dims"] != self.dims:
+            logger.warning("Local vector index has other dimensions, ignored.", path=self.path, dims=manifest["dims"])
+            return False
+
+        centroids = list_offsets = None
+        if manifest.get("list_offsets") is not None:
+            centroids = np.load(self._file(CENTROIDS_FILE))
+            list_offsets = np.array(manifest["list_offsets"], dtype=np.int64)
+
+        self._snapshot = _Snapshot(
+            self._map(len(manifest["ids"])),
+            manifest["ids"],
+            manifest["versions"],
+            centroids,
+            list_offsets
+        )
+        logger.info("Local vector index loaded.", path=self.path, rows=len(manifest["ids"]), documents=len(self))
+        return True
+
+    def _map(self, rows: int) -> np.ndarray:
+        if rows == 0:
+            return np.zeros((0, self.dims), dtype=np.float16)
+        return np.memmap(self._file(VECTORS_FILE), dtype=np.float16, mode="r", shape=(rows, self.dims))
+
+    def _write_manifest(self, snapshot_ids: list, versions: dict, list_offsets: Optional[np.ndarray]) -> None:
+        manifest = {
+            "dims": self.dims,
+            "ids": snapshot_ids,
+            "versions": versions,
+            "list_offsets": list_offsets.tolist() if list_offsets is not None else None
+        }
+        tmp = self._file(MANIFEST_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._file(MANIFEST_FILE))
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _read_vectors(self, db: ElasticsearchDataManager, index_n: str, batch_size: int):
+        body = {
+            "_source": [self.vector_field],
+            "seq_no_primary_term": True,
+            "query": {"exists": {"field": self.vector_field}}
+        }
+        ids, versions, vectors = [], {}, []
+        for hit in db.scan_documents(index_n, body, batch_size):
+            vector = hit["_source"].get(self.vector_field)
+            if not vector or len(vector) != self.dims:
+                continue
+            ids.append(hit["_id"])
+            versions[hit["_id"]] = f"{hit.get('_primary_term')}:{hit.get('_seq_no')}"
+            vectors.append(vector)
+        return ids, versions, np.array(vectors, dtype=np.float32).reshape(-1, self.dims)
+
+    def _train_ivf(self, vectors: np.ndarray, iterations: int = 10, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Spherical k-means on a sample of the rows; returns the centroids and the list of every row."""
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), self.ivf_lists * 256), replace=False)]
+        centroids = sample[rng.choice(len(sample), self.ivf_lists, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(self.ivf_lists):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = self._normalize(centroids)
+
+        lists = np.concatenate([
+            np.argmax(vectors[start:start + self.block_rows] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), self.block_rows)
+        ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+        return centroids.astype(np.float32), lists
+
+    def rebuild(self, db: ElasticsearchDataManager, index_n: str, batch_size: int = 1000) -> int:
+        """
+        Export every vector of the Elasticsearch index and replace the local files.
+
+        Args:
+        - db (ElasticsearchDataManager): Source of the vectors.
+        - index_n (str): Index (or alias) holding the vectors.
+        - batch_size (int): Documents per scroll page.
+
+        Returns:
+        - int: Number of indexed documents.
+
+        """
+        with self._lock:
+            return self._rebuild(db, index_n, batch_size)
+
+    def _rebuild(self, db: ElasticsearchDataManager, index_n: str, batch_size: int) -> int:
+        ids, versions, vectors = self._read_vectors(db, index_n, batch_size)
+        vectors = self._normalize(vectors)
+
+        centroids = list_offsets = None
+        # IVF only pays off with enough rows per list to train the centroids
+        if self.ivf_lists and len(vectors) >= self.ivf_lists * 39:
+            centroids, lists = self._train_ivf(vectors)
+            order = np.argsort(lists, kind="stable")
+            vectors = vectors[order]
+            ids = [ids[i] for i in order]
+            list_offsets = np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=self.ivf_lists))])
+
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._file(VECTORS_FILE + ".tmp")
+        vectors.astype(np.float16).tofile(tmp)
+        os.replace(tmp, self._file(VECTORS_FILE))
+        if centroids is not None:
+            np.save(self._file(CENTROIDS_FILE), centroids)
+        self._write_manifest(ids, versions, list_offsets)
+
+        self._snapshot = _Snapshot(self._map(len(ids)), ids, versions, centroids, list_offsets)
+        logger.info("Local vector index built.", path=self.path, index=index_n, documents=len(ids), ivf_lists=0 if centroids is None else self.ivf_lists)
+        return len(ids)
+
+    def refresh(self, db: ElasticsearchDataManager, index_n: str, batch_size: int = 1000) -> int:
+        """
+        Apply the documents added, updated or deleted in Elasticsearch since the last build or refresh.
+
+        Only ids and versions are scanned; vectors are fetched for the changed documents only.
+
+        Args:
+        - db (ElasticsearchDataManager): Source of the vectors.
+        - index_n (str): Index (or alias) holding the vectors.
+        - batch_size (int): Documents per scroll page and `_mget` request.
+
+        Returns:
+        - int: Number of changed documents.
+
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return self._rebuild(db, index_n, batch_size)
+
+            body = {
+                "_source": False,
+                "seq_no_primary_term": True,
+                "query": {"exists": {"field": self.vector_field}}
+            }
+            current = {
+                hit["_id"]: f"{hit.get('_primary_term')}:{hit.get('_seq_no')}"
+                for hit in db.scan_documents(index_n, body, batch_size)
+            }
+            changed = [doc_id for doc_id, version in current.items() if snapshot.versions.get(doc_id) != version]
+            removed = set(snapshot.versions) - set(current)
+            if not changed and not removed:
+                return 0
+
+            stale = len(removed) + sum(1 for doc_id in changed if doc_id in snapshot.versions)
+            if (len(snapshot.ids) - int(snapshot.alive.sum()) + stale) > self.compact_ratio * max(1, len(current)):
+                self._rebuild(db, index_n, batch_size)
+                return len(changed) + len(removed)
+
+            ids, versions, vectors = list(snapshot.ids), dict(snapshot.versions), []
+            gone = removed.union(changed)
+            for row, doc_id in enumerate(ids):
+                if doc_id in gone:
+                    ids[row] = None
+            for doc_id in removed:
+                versions.pop(doc_id, None)
+
+            for start in range(0, len(changed), batch_size):
+                for doc in db.fetch_documents(index_n, changed[start:start + batch_size], [self.vector_field]):
+                    vector = doc["_source"].get(self.vector_field)
+                    if not vector or len(vector) != self.dims:
+                        versions.pop(doc["_id"], None)
+                        continue
+                    ids.append(doc["_id"])
+                    versions[doc["_id"]] = current[doc["_id"]]
+                    vectors.append(vector)
+
+            if vectors:
+                with open(self._file(VECTORS_FILE), "ab") as f:
+                    self._normalize(np.array(vectors, dtype=np.float32)).astype(np.float16).tofile(f)
+            self._write_manifest(ids, versions, snapshot.list_offsets)
+
+            self._snapshot = _Snapshot(self._map(len(ids)), ids, versions, snapshot.centroids, snapshot.list_offsets)
+            logger.info("Local vector index refreshed.", path=self.path, index=index_n, changed=len(changed), removed=len(removed))
+            return len(changed) + len(removed)
+
+    def _row_ranges(self, snapshot: _Snapshot, query: np.ndarray) -> List[Tuple[int, int]]:
+        if snapshot.centroids is None:
+            return [(0, len(snapshot.ids))]
+
+        probe = min(self.ivf_probe, len(snapshot.centroids))
+        lists = np.argpartition(-(snapshot.centroids @ query), probe - 1)[:probe]
+        ranges = [(int(snapshot.list_offsets[c]), int(snapshot.list_offsets[c + 1])) for c in sorted(lists)]
+        ranges.append((snapshot.clustered_rows, len(snapshot.ids)))  # rows appended since the build
+        return [(start, stop) for start, stop in ranges if stop > start]
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Nearest documents of a query vector by cosine similarity.
+
+        Args:
+        - query (np.ndarray): Query vector of `dims` values.
+        - k (int): Number of documents.
+
+        Returns:
+        - list: (document id, cosine similarity) pairs, best first.
+
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("Local vector index is not loaded")
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dims:
+            raise ValueError(f"Query has {query.shape[0]} dimensions, the index {self.dims}")
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        rows, scores = [], []
+        for start, stop in self._row_ranges(snapshot, query):
+            for block in range(start, stop, self.block_rows):
+                end = min(block + self.block_rows, stop)
+                block_scores = np.asarray(snapshot.matrix[block:end], dtype=np.float32) @ query
+                block_scores[~snapshot.alive[block:end]] = -np.inf
+                rows.append(np.arange(block, end))
+                scores.append(block_scores)
+        if not scores:
+            return []
+
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(snapshot.ids[rows[i]], float(scores[i])) for i in top]
\ No newline at end of file
@@ -0,0 +1,160 @@
+import os
+from typing import Optional
+
+import numpy as np
+import structlog
+import torch
+import torch.nn as nn
+
+from models.imagebind_model import ModalityType
+
+
+logger = structlog.get_logger()
+
+
+INFERENCE_MODES = ("fp32", "int8", "bf16", "onnx")
+
+
+class VisionTower(nn.Module):
+    """Vision path of ImageBind (preprocessor, trunk, head, postprocessor) as a tensor-to-tensor module."""
+
+    def __init__(self, model: nn.Module) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, images: torch.Tensor) -> torch.Tensor:
+        return self.model({ModalityType.VISION: images})[ModalityType.VISION]
+
+
+def bf16_supported() -> bool:
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+class VisionEncoder:
+    """
+    Image embeddings of an ImageBind model in one of the CPU inference modes.
+
+    - fp32: the model as loaded, run under `torch.inference_mode`.
+    - int8: dynamic int8 quantization of the `nn.Linear` layers of the vision
+      trunk (the MLP of every block) and head. The attention projections of
+      `nn.MultiheadAttention` are not dynamically quantizable and stay fp32.
+    - bf16: bfloat16 autocast, for CPUs with AVX512-BF16 or AMX.
+    - onnx: the vision path exported to ONNX and run with ONNX Runtime.
+
+    The int8 and onnx modes replace or export the vision modules of the given
+    model; they only apply on CPU, other devices run fp32.
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        device: str = "cpu",
+        mode: str = "fp32",
+        num_threads: Optional[int] = None,
+        interop_threads: Optional[int] = None,
+        onnx_path: str = ".checkpoints/imagebind_huge_vision.onnx"
+    ) -> None:
+        """
+        Prepare the model for inference.
+
+        Args:
+        - model (nn.Module): ImageBind model with its vision modality.
+        - device (str): Device the model is on.
+        - mode (str): One of fp32, int8, bf16 and onnx.
+        - num_threads (int): Intra-op threads; None keeps the torch default (one per core).
+        - interop_threads (int): Inter-op threads; None keeps the torch default.
+        - onnx_path (str): Exported model, written on first use of the onnx mode.
+
+        """
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode {mode}, expected one of {', '.join(INFERENCE_MODES)}")
+        if mode != "fp32" and not str(device).startswith("cpu"):
+            logger.warning("CPU inference mode ignored on this device.", mode=mode, device=str(device))
+            mode = "fp32"
+        if mode == "bf16" and not bf16_supported():
+            logger.warning("This CPU has no native bfloat16 support; bf16 inference will be slow.")
+
+        self.device = device
+        self.mode = mode
+        self.session = None
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        if interop_threads:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError:  # only allowed before the first parallel operation
+                logger.warning("Inter-op threads already set.", interop_threads=torch.get_num_interop_threads())
+
+        model.eval()
+        if mode == "int8":
+            model.modality_trunks[ModalityType.VISION] = torch.quantization.quantize_dynamic(
+                model.modality_trunks[ModalityType.VISION], {nn.Linear}, dtype=torch.qint8
+            )
+            model.modality_heads[ModalityType.VISION] = torch.quantization.quantize_dynamic(
+                model.modality_heads[ModalityType.VISION], {nn.Linear}, dtype=torch.qint8
+            )
+        self.tower = VisionTower(model)
+
+        if mode == "onnx":
+            self.session = self._onnx_session(onnx_path, num_threads, interop_threads)
+
+        logger.info("Vision encoder ready.", mode=mode, device=str(device), threads=torch.get_num_threads())
+
+    def _onnx_session(self, onnx_path: str, num_threads: Optional[int], interop_threads: Optional[int]):
+        # Optional dependency, only needed by this mode
+        import onnxruntime
+
+        if not os.path.exists(onnx_path):
+            export_onnx(self.tower, onnx_path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        if interop_threads:
+            options.inter_op_num_threads = interop_threads
+        return onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+    def encode(self, images: torch.Tensor) -> np.ndarray:
+        """
+        Embed a batch of preprocessed images.
+
+        Args:
+        - images (torch.Tensor): Batch from `data.load_and_transform_vision_data`.
+
+        Returns:
+        - np.ndarray: float32 embeddings, one row per image.
+
+        """
+        if self.session is not None:
+            return self.session.run(None, {"images": images.cpu().numpy()})[0].astype(np.float32)
+
+        with torch.inference_mode():
+            if self.mode == "bf16":
+                with torch.autocast("cpu", dtype=torch.bfloat16):
+                    outputs = self.tower(images)
+            else:
+                outputs = self.tower(images)
+        return outputs.float().cpu().numpy()
+
+
+def export_onnx(tower: nn.Module, onnx_path: str, opset: int = 14) -> None:
+    """Export the vision path with a dynamic batch dimension."""
+    os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+    tmp = onnx_path + ".tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            tower,
+            torch.randn(1, 3, 224, 224),
+            tmp,
+            input_names=["images"],
+            output_names=["embeddings"],
+            dynamic_axes={"images": {0: "batch"}, "embeddings": {0: "batch"}},
+            opset_version=opset
+        )
+    os.replace(tmp, onnx_path)
+    logger.info("Vision path exported to ONNX.", path=onnx_path)
\ No newline at end of file
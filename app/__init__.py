@@ -6,7 +6,9 @@ from services.tools import (
     WeatherForecast,
     BlogSearcher,
     locSearch,
-    find_full_address
+    find_full_address,
+    afind_full_address,
+    KakaoLocalClient
 )
 
 from services import (
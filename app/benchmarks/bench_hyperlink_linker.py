@@ -0,0 +1,117 @@
+"""
+Micro-benchmark: HyperlinkLinker vs. the previous quote state machine in the agents.
+
+Run from the `app` directory:
+
+    python -m benchmarks.bench_hyperlink_linker --repeat 20
+"""
+import random
+import timeit
+from argparse import ArgumentParser
+
+from services.utils.hyperlink_linker import HyperlinkLinker
+
+
+TITLES = [
+    "서울 남산타워", "경복궁", "창덕궁", "북촌 한옥마을", "국립중앙박물관", "롯데월드", "광장시장",
+    "해운대 해수욕장", "감천문화마을", "태종대", "불국사", "석굴암", "전주 한옥마을", "순천만 국가정원"
+]
+
+
+def legacy_link(tokens, hyperlinks, resolver):
+    """The per-token split/collect loop the agents used before HyperlinkLinker."""
+    output = []
+    temp_key = []
+    collecting_key = False
+    for item in tokens:
+        if "'" in item:
+            item_parts = item.split("'")
+            for part in item_parts[:-1]:
+                temp_key.append(part)
+            item = item_parts[-1]
+
+            if collecting_key:
+                collecting_key = False
+                full_key = ''.join(temp_key).lower().strip()
+                try:
+                    full_data = hyperlinks[full_key]
+                except KeyError:
+                    full_data = resolver(full_key) or full_key
+                output.append(full_data)
+                output.append(item)
+                temp_key = []
+            else:
+                collecting_key = True
+                output.append(item)
+        elif collecting_key:
+            temp_key.append(item)
+        else:
+            output.append(item)
+    return output
+
+
+def linker_link(tokens, hyperlinks, resolver):
+    linker = HyperlinkLinker(hyperlinks, resolver=resolver)
+    output = []
+    for item in tokens:
+        chunk = linker.feed(item)
+        if chunk:
+            output.append(chunk)
+    output.append(linker.flush())
+    return output
+
+
+def make_stream(n_rows, seed=0):
+    """A generated answer with an itinerary table, split into GPT-sized tokens with standalone quotes."""
+    rng = random.Random(seed)
+    lines = ["여행 일정을 준비했어요! 편하게 둘러보실 수 있도록 구성했습니다.\n\n**서울 하루 여행**\n",
+             "| 날짜 | 시간 | 여행지 | 설명 |\n", "|------|------|------|------|\n"]
+    for i in range(n_rows):
+        title = rng.choice(TITLES + ["알 수 없는 장소"])
+        lines.append(f"| 1일차 | {9 + i % 10:02d}:00-{10 + i % 10:02d}:00 | '{title}' | 휠체어 접근이 가능하고 경사로가 있습니다. |\n")
+    text = "".join(lines)
+
+    tokens = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 3)
+        quote = text.find("'", position, position + size)
+        if quote == position:
+            size = 1
+        elif quote > 0:
+            size = quote - position
+        tokens.append(text[position:position + size])
+        position += size
+    return tokens
+
+
+def main():
+    parser = ArgumentParser(description="HyperlinkLinker micro-benchmark")
+    parser.add_argument("--rows", type=int, default=40, help="Itinerary rows in the generated answer")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions")
+    args = parser.parse_args()
+
+    hyperlinks = {title: f"[{title}](https://gildong.site/travel/detail/{i})" for i, title in enumerate(TITLES)}
+    resolver = lambda key: None
+    tokens = make_stream(args.rows)
+
+    assert "".join(legacy_link(tokens, hyperlinks, resolver)) == "".join(linker_link(tokens, hyperlinks, resolver))
+
+    print(f"{len(tokens)} tokens, {len(hyperlinks)} candidate titles")
+    for name, func in [("legacy loop", legacy_link), ("HyperlinkLinker", linker_link)]:
+        timer = timeit.Timer(lambda: func(tokens, hyperlinks, resolver))
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+        print(f"{name:>16}: {best * 1e6:9.1f} us/answer  {best * 1e9 / len(tokens):7.1f} ns/token")
+
+    # A stray apostrophe makes the legacy loop swallow the rest of the answer
+    stray = make_stream(args.rows)
+    stray.insert(len(stray) // 4, "it's ")
+    count_links = lambda output: "".join(output).count("](https://")
+    print(f"unbalanced quote, links produced of {count_links(linker_link(tokens, hyperlinks, resolver))}: "
+          f"legacy {count_links(legacy_link(stray, hyperlinks, resolver))}, "
+          f"HyperlinkLinker {count_links(linker_link(stray, hyperlinks, resolver))}")
+
+
+if __name__ == "__main__":
+    main()
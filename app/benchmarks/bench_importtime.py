@@ -0,0 +1,96 @@
+"""
+Cold-start profile: `python -X importtime` report and resident memory after import.
+
+Imports a module (by default `main`, the whole API) in a fresh interpreter and
+reports the wall time, the peak RSS and the packages with the largest
+cumulative import time, grouped by top-level package.
+
+Run from the `app` directory:
+
+    python -m benchmarks.bench_importtime --module main --top 15
+    python -m benchmarks.bench_importtime --module routers.STT.STT
+
+Compare a run with `STT` disabled (`stt_enabled` in core/common_config.py)
+to see what the optional routers cost.
+"""
+import re
+import sys
+import json
+import time
+import subprocess
+from argparse import ArgumentParser
+from collections import defaultdict
+
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_import(module: str) -> dict:
+    """Import `module` in a child interpreter with `-X importtime`."""
+    code = f"import {module}, resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({"name": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us), "depth": len(indent) // 2})
+
+    return {
+        "module": module,
+        "wall_s": round(elapsed, 3),
+        "max_rss_mb": round(int(result.stdout.split()[-1]) / 1024, 1),  # ru_maxrss is in KiB on Linux
+        "modules_imported": len(imports),
+        "imports": imports
+    }
+
+
+def by_package(imports: list) -> list:
+    """Self time summed per top-level package."""
+    totals = defaultdict(int)
+    counts = defaultdict(int)
+    for item in imports:
+        package = item["name"].split(".")[0]
+        totals[package] += item["self_us"]
+        counts[package] += 1
+    return sorted(
+        ({"package": package, "self_ms": round(us / 1000, 1), "modules": counts[package]} for package, us in totals.items()),
+        key=lambda item: -item["self_ms"]
+    )
+
+
+def main():
+    parser = ArgumentParser(description="Import-time and RSS profile of the API")
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules listed")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters; the fastest is reported")
+    parser.add_argument("--json", metavar="path", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda run: run["wall_s"])
+    packages = by_package(best["imports"])
+
+    print(f"import {args.module}: {best['wall_s'] * 1000:.0f} ms wall, {best['max_rss_mb']} MB max RSS, {best['modules_imported']} modules")
+    print(f"\n{'package':<28}{'self ms':>10}{'modules':>9}")
+    for item in packages[:args.top]:
+        print(f"{item['package']:<28}{item['self_ms']:>10}{item['modules']:>9}")
+
+    print(f"\n{'module (cumulative)':<48}{'ms':>10}")
+    for item in sorted(best["imports"], key=lambda item: -item["cumulative_us"])[:args.top]:
+        print(f"{'  ' * item['depth'] + item['name']:<48}{item['cumulative_us'] / 1000:>10.1f}")
+
+    if args.json:
+        report = {key: value for key, value in best.items() if key != "imports"}
+        report["packages"] = packages
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Micro-benchmark: per-chunk overhead of the logging middleware on a streaming response.
+
+Compares the previous BaseHTTPMiddleware-based LoggingMiddleware with the pure
+ASGI one on a StreamingResponse, driven in-process without a server.
+
+Run from the `app` directory:
+
+    python -m benchmarks.bench_logging_middleware --chunks 2000 --repeat 5
+"""
+import time
+import uuid
+import asyncio
+import logging
+from argparse import ArgumentParser
+
+import structlog
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+
+from core.logging_config import LoggingMiddleware, request_id_var
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The LoggingMiddleware before the pure ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())  # generate request_id
+
+        # Storing request_id in contextvars
+        request_id_var.set(request_id)
+
+        response = await call_next(request)
+        return response
+
+
+def make_app(n_chunks, chunk):
+    async def stream():
+        for _ in range(n_chunks):
+            yield chunk
+
+    async def app(scope, receive, send):
+        await StreamingResponse(stream(), media_type="text/event-stream")(scope, receive, send)
+
+    return app
+
+
+async def request(app):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/chatbot/member", "raw_path": b"/chatbot/member", "query_string": b"",
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 5040)
+    }
+    disconnected = asyncio.Event()
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    chunks = 0
+
+    async def send(message):
+        nonlocal chunks
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks += 1
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return chunks
+
+
+def measure(app, n_chunks, repeat):
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(request(app)) == n_chunks
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            loop.run_until_complete(request(app))
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        loop.close()
+
+
+def main():
+    parser = ArgumentParser(description="Logging middleware streaming overhead benchmark")
+    parser.add_argument("--chunks", type=int, default=2000, help="Body chunks per streamed response")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args()
+
+    # Keep the request log line out of the measurement output
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    chunk = "data: {\"message\":\"안녕하세요, 길동이입니다.\"}\n\n".encode("utf-8")
+    inner = make_app(args.chunks, chunk)
+
+    bare = measure(inner, args.chunks, args.repeat)
+    print(f"{args.chunks} chunks per response")
+    print(f"{'no middleware':>24}: {bare * 1e3:8.2f} ms/response")
+    for name, middleware in [("BaseHTTPMiddleware", LegacyLoggingMiddleware), ("pure ASGI", LoggingMiddleware)]:
+        elapsed = measure(middleware(inner), args.chunks, args.repeat)
+        overhead = (elapsed - bare) / args.chunks
+        print(f"{name:>24}: {elapsed * 1e3:8.2f} ms/response  {overhead * 1e6:7.2f} us/chunk overhead")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Offline load test of the API.
+
+Serves the real `main:app` with uvicorn on a background thread, with every
+backend replaced by an in-process stand-in (see `fakes` and `stubs`), and
+drives scripted multi-turn sessions against `/chatbot/main`,
+`/chatbot/member`, `/convo` and `/itinerary` from concurrent virtual users.
+Reports throughput, time to first streamed message and p50/p99 latencies per
+endpoint.
+
+Run from the `app` directory:
+
+    python -m benchmarks.loadtest --users 20 --sessions 100 --token-rate 40
+
+The LLM timings (`--planner-ms`, `--first-token-ms`, `--token-rate`) dominate
+chat latency; set them from production traces when comparing changes.
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import threading
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import aiohttp
+import jwt
+
+from benchmarks.loadtest import fixtures
+from benchmarks.loadtest.fakes import DEFAULT_PROFILE, InMemoryStore, install
+from benchmarks.loadtest.scenarios import SESSIONS, build_plans
+from benchmarks.loadtest.stubs import StubServer, build_app
+
+
+DESTINATION_INDEX = "gildong_1"
+
+
+class Recorder:
+    """Latency samples per endpoint."""
+
+    def __init__(self) -> None:
+        self.samples = {}
+        self.sessions = 0
+
+    def add(self, label: str, latency: float, ok: bool, ttft: Optional[float] = None) -> None:
+        self.samples.setdefault(label, []).append((latency, ok, ttft))
+
+    @staticmethod
+    def percentile(values: List[float], q: float) -> Optional[float]:
+        if not values:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1, max(0, int(round(q / 100. * len(values) + 0.5)) - 1))]
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label, samples in sorted(self.samples.items()):
+            latencies = [latency for latency, ok, _ in samples if ok]
+            ttfts = [ttft for _, ok, ttft in samples if ok and ttft is not None]
+            endpoints[label] = {
+                "requests": len(samples),
+                "errors": sum(1 for _, ok, _ in samples if not ok),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": self._ms(self.percentile(latencies, 50)),
+                "p99_ms": self._ms(self.percentile(latencies, 99)),
+                "ttft_p50_ms": self._ms(self.percentile(ttfts, 50)),
+                "ttft_p99_ms": self._ms(self.percentile(ttfts, 99))
+            }
+        requests = sum(len(samples) for samples in self.samples.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "sessions": self.sessions,
+            "requests": requests,
+            "rps": round(requests / elapsed, 2),
+            "endpoints": endpoints
+        }
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return None if seconds is None else round(seconds * 1000, 1)
+
+
+async def chat(http, url: str, payload: dict, headers: dict, recorder: Recorder, label: str) -> Dict[str, str]:
+    """POST one chat turn and read its event stream; returns the payloads of named events."""
+    events = {}
+    ttft = None
+    ok = False
+    start = time.perf_counter()
+    try:
+        async with http.post(url, json=payload, headers=headers) as response:
+            event = None
+            async for line in response.content:
+                line = line.decode("utf-8").rstrip("\n")
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    data = json.loads(line[len("data: "):])
+                    if event is None and ttft is None and data.get("message"):
+                        ttft = time.perf_counter() - start
+                    if event:
+                        events[event] = data
+                elif not line:
+                    event = None
+            ok = response.status == 200 and "completed" in events
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        pass
+    recorder.add(label, time.perf_counter() - start, ok, ttft)
+    return events
+
+
+async def get(http, url: str, params: dict, headers: dict, recorder: Recorder, label: str) -> None:
+    ok = False
+    start = time.perf_counter()
+    try:
+        async with http.get(url, params=params, headers=headers) as response:
+            await response.read()
+            ok = response.status == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+    recorder.add(label, time.perf_counter() - start, ok)
+
+
+async def run_session(http, base_url: str, kind: str, region: str, headers: dict, recorder: Recorder, think: float) -> None:
+    session_id = str(uuid.uuid4())
+    itinerary_id = None
+    for turn in SESSIONS[kind](region):
+        payload = {"session_id": session_id, "question": turn["question"], "image_name": turn.get("image_name")}
+        events = await chat(http, f"{base_url}/chatbot/{kind}", payload, headers, recorder, f"POST /chatbot/{kind}")
+        itinerary_id = (events.get("itinerary") or {}).get("itinerary_id", itinerary_id)
+        if think:
+            await asyncio.sleep(think)
+
+    if kind == "member":
+        await get(http, f"{base_url}/convo", {"session_id": session_id}, headers, recorder, "GET /convo")
+        if itinerary_id:
+            await get(http, f"{base_url}/itinerary/registration", {"itinerary_id": itinerary_id}, headers, recorder, "GET /itinerary/registration")
+        await get(http, f"{base_url}/itinerary", {}, headers, recorder, "GET /itinerary")
+    recorder.sessions += 1
+
+
+async def drive(base_url: str, args, tokens: List[str]) -> dict:
+    rng = random.Random(args.seed)
+    regions = list(fixtures.REGIONS)
+    queue = asyncio.Queue()
+    for i in range(args.sessions):
+        kind = "member" if rng.random() < args.member_ratio else "main"
+        headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"} if kind == "member" else {}
+        queue.put_nowait((kind, rng.choice(regions), headers))
+
+    recorder = Recorder()
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=120)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), timeout=timeout) as http:
+        async def user():
+            while not queue.empty():
+                kind, region, headers = queue.get_nowait()
+                await run_session(http, base_url, kind, region, headers, recorder, args.think_ms / 1000.)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(args.users)))
+        elapsed = time.perf_counter() - start
+
+    return recorder.summary(elapsed)
+
+
+def build_store(args) -> InMemoryStore:
+    store = InMemoryStore()
+    destinations = fixtures.build_destinations(args.destinations_per_region, args.seed)
+    users = fixtures.build_users(args.member_users)
+    store.bulk_load(DESTINATION_INDEX, destinations)
+    store.bulk_load("weather_regioncode", fixtures.build_weather_regions())
+    store.bulk_load("gildong_user", users)
+    store.bulk_load("gildong_confirmed_itinerary", fixtures.build_confirmed_itineraries(users, destinations, seed=args.seed))
+    store.bulk_load("gildong_convo", [])
+    return store
+
+
+def serve(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, name="loadtest-api", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, server.servers[0].sockets[0].getsockname()[1]
+
+
+def wait_ready(base_url: str, timeout: float = 120.) -> dict:
+    """Poll `/ready` until the startup components are warm, as a readiness probe would."""
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urlopen(f"{base_url}/ready", timeout=5) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except HTTPError as e:
+            status = json.loads(e.read().decode("utf-8"))
+            if time.monotonic() > deadline or any(c["state"] == "failed" for c in status["components"].values()):
+                raise RuntimeError(f"API did not become ready: {status}")
+        time.sleep(0.1)
+
+
+def report(summary: dict) -> None:
+    print(f"{summary['sessions']} sessions, {summary['requests']} requests in {summary['elapsed_s']} s ({summary['rps']} req/s)")
+    print(f"{'endpoint':<30}{'n':>6}{'err':>5}{'rps':>8}{'p50 ms':>10}{'p99 ms':>10}{'ttft p50':>10}{'ttft p99':>10}")
+    for label, stats in summary["endpoints"].items():
+        cells = [stats[key] for key in ("p50_ms", "p99_ms", "ttft_p50_ms", "ttft_p99_ms")]
+        print(f"{label:<30}{stats['requests']:>6}{stats['errors']:>5}{stats['rps']:>8}" + "".join(f"{'-' if cell is None else cell:>10}" for cell in cells))
+
+
+def get_args():
+    parser = ArgumentParser(description="Offline load test of the Gildong API with local stand-ins")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=50, help="Sessions to run in total")
+    parser.add_argument("--member-ratio", type=float, default=0.5, help="Share of signed-in /chatbot/member sessions")
+    parser.add_argument("--think-ms", type=float, default=0., help="Pause between turns of a session")
+    parser.add_argument("--token-rate", type=float, default=DEFAULT_PROFILE["token_rate"], help="Generator tokens per second")
+    parser.add_argument("--first-token-ms", type=float, default=DEFAULT_PROFILE["first_token_ms"], help="Generator time to first token")
+    parser.add_argument("--planner-ms", type=float, default=DEFAULT_PROFILE["planner_latency_ms"], help="Strategy planner latency")
+    parser.add_argument("--summarizer-ms", type=float, default=DEFAULT_PROFILE["summarizer_latency_ms"], help="Summarizer latency")
+    parser.add_argument("--es-ms", type=float, default=DEFAULT_PROFILE["es_latency_ms"], help="Elasticsearch round trip")
+    parser.add_argument("--search-ms", type=float, default=DEFAULT_PROFILE["search_latency_ms"], help="Semantic search latency")
+    parser.add_argument("--destinations-per-region", type=int, default=24, help="Synthetic destinations per region")
+    parser.add_argument("--member-users", type=int, default=20, help="Registered users signing in")
+    parser.add_argument("--port", type=int, default=0, help="API port (0 picks a free port)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the corpus and the session mix")
+    parser.add_argument("--json", metavar="path", help="Also write the summary as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+
+    store = build_store(args)
+    stubs = StubServer(build_app(store, DESTINATION_INDEX, DEFAULT_PROFILE["stub_latency_ms"])).start()
+    common_parameters = install(store, build_plans(), stubs.urls, {
+        "token_rate": args.token_rate,
+        "first_token_ms": args.first_token_ms,
+        "planner_latency_ms": args.planner_ms,
+        "summarizer_latency_ms": args.summarizer_ms,
+        "es_latency_ms": args.es_ms,
+        "search_latency_ms": args.search_ms
+    })
+
+    os.makedirs("uploads", exist_ok=True)  # mounted by the image_upload router
+    from main import app
+
+    server, thread, port = serve(app, args.port)
+    expires = datetime.utcnow() + timedelta(hours=1)
+    tokens = [
+        jwt.encode({"user_id": user["_source"]["userID"], "token_type": "access", "exp": expires}, common_parameters["secret_key"], algorithm=common_parameters["algorithm"])
+        for user in fixtures.build_users(args.member_users)
+    ]
+
+    try:
+        wait_ready(f"http://127.0.0.1:{port}")
+        summary = asyncio.run(drive(f"http://127.0.0.1:{port}", args, tokens))
+    finally:
+        server.should_exit = True
+        thread.join()
+        stubs.stop()
+
+    report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
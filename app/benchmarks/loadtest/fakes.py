@@ -0,0 +1,585 @@
+"""
+In-process stand-ins for the backends of the API.
+
+- `InMemoryStore` holds the Elasticsearch indices. `InMemoryElasticsearch` and
+  `AsyncInMemoryElasticsearch` replace the sync and async clients; requests go
+  through `client.transport.perform_request`, so `trace_elasticsearch` and the
+  real `ElasticsearchDataManager` code paths are exercised unchanged.
+- `toolva_factory` replaces `Toolva`: the planner answers scripted plans, the
+  generator streams a synthetic answer at a fixed token rate, and the semantic
+  search scores the in-memory destinations by character bigram overlap.
+- `FakeChatSummarizer` and `FakeTokenLimiter` replace the OpenAI backed utils.
+- `StubGoogleSearch` and `StubKakaoLocal` replace the client libraries whose
+  endpoints cannot be configured, and call the stub HTTP server instead.
+
+`install` patches all of them into the imported modules; it must run before
+anything under `core`, `services` or `routers` is imported.
+"""
+import copy
+import json
+import time
+import uuid
+import asyncio
+import threading
+import importlib
+import importlib.util
+import os
+import re
+import sys
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Latencies (ms) and rates of the stand-ins
+DEFAULT_PROFILE = {
+    "es_latency_ms": 3.,
+    "search_latency_ms": 25.,
+    "planner_latency_ms": 600.,
+    "summarizer_latency_ms": 400.,
+    "first_token_ms": 450.,
+    "token_rate": 40.,
+    "stub_latency_ms": {
+        "kakao_local": 30.,
+        "kma": 80.,
+        "google_cse": 150.,
+        "imagebind": 120.
+    }
+}
+
+
+def _field(source: dict, path: str):
+    if path.endswith(".keyword"):
+        path = path[:-len(".keyword")]
+    value = source
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _equals(value, expected) -> bool:
+    if isinstance(expected, dict):
+        expected = expected.get("value", expected.get("query"))
+    if isinstance(value, list):
+        return expected in value
+    return value == expected
+
+
+class InMemoryStore:
+    """
+    Elasticsearch indices kept in dicts.
+
+    Supports the query DSL subset the API uses: `match_all`, `term`, `terms`,
+    `match` (as equality), `exists` and `bool` with `must`/`filter`/`should`/
+    `must_not`, plus `sort`, `from`/`size`, `_source` filtering and scrolling.
+    """
+
+    def __init__(self) -> None:
+        self.indices = {}
+        self._scrolls = {}
+        self._lock = threading.Lock()
+
+    def bulk_load(self, index: str, documents: List[dict]) -> None:
+        with self._lock:
+            docs = self.indices.setdefault(index, {})
+            for document in documents:
+                docs[document["_id"]] = copy.deepcopy(document["_source"])
+
+    def documents(self, index: str) -> Dict[str, dict]:
+        return self.indices.get(index, {})
+
+    def matches(self, doc_id: str, source: dict, query: Optional[dict]) -> bool:
+        if not query or "match_all" in query:
+            return True
+        if "term" in query or "match" in query:
+            field, expected = next(iter((query.get("term") or query.get("match")).items()))
+            return _equals(doc_id if field == "_id" else _field(source, field), expected)
+        if "terms" in query:
+            field, expected = next(iter(query["terms"].items()))
+            value = doc_id if field == "_id" else _field(source, field)
+            return any(_equals(value, item) for item in expected)
+        if "exists" in query:
+            return _field(source, query["exists"]["field"]) is not None
+        if "bool" in query:
+            clauses = query["bool"]
+            for key in ("must", "filter"):
+                if not all(self.matches(doc_id, source, q) for q in self._as_list(clauses.get(key))):
+                    return False
+            if any(self.matches(doc_id, source, q) for q in self._as_list(clauses.get("must_not"))):
+                return False
+            should = self._as_list(clauses.get("should"))
+            return not should or any(self.matches(doc_id, source, q) for q in should)
+        raise ValueError(f"Unsupported query: {query}")
+
+    @staticmethod
+    def _as_list(clauses) -> list:
+        if clauses is None:
+            return []
+        return clauses if isinstance(clauses, list) else [clauses]
+
+    @staticmethod
+    def project(source: dict, source_fields) -> dict:
+        if not source_fields:
+            return copy.deepcopy(source)
+        return {field: copy.deepcopy(source[field]) for field in source_fields if field in source}
+
+    def _hit(self, index: str, doc_id: str, source: dict, source_fields, score=1.) -> dict:
+        return {"_index": index, "_id": doc_id, "_score": score, "_source": self.project(source, source_fields)}
+
+    @staticmethod
+    def _response(hits: list, total: int, scroll_id: Optional[str] = None) -> dict:
+        response = {
+            "took": 1,
+            "timed_out": False,
+            "hits": {"total": {"value": total, "relation": "eq"}, "max_score": None, "hits": hits}
+        }
+        if scroll_id:
+            response["_scroll_id"] = scroll_id
+        return response
+
+    def search(self, index: str, body: Optional[dict] = None, scroll: Optional[str] = None) -> dict:
+        body = body or {}
+        with self._lock:
+            found = [
+                (doc_id, source) for doc_id, source in self.documents(index).items()
+                if self.matches(doc_id, source, body.get("query"))
+            ]
+            for sort in reversed(body.get("sort", [])):
+                field, order = next(iter(sort.items()))
+                reverse = (order.get("order") if isinstance(order, dict) else order) == "desc"
+                found.sort(key=lambda item: (_field(item[1], field) is None, _field(item[1], field)), reverse=reverse)
+
+            hits = [self._hit(index, doc_id, source, body.get("_source")) for doc_id, source in found]
+            start = body.get("from", 0)
+            size = body.get("size", 10)
+
+            if scroll:
+                scroll_id = uuid.uuid4().hex
+                self._scrolls[scroll_id] = (hits[start + size:], size)
+                return self._response(hits[start:start + size], len(hits), scroll_id)
+            return self._response(hits[start:start + size], len(hits))
+
+    def scroll(self, scroll_id: str) -> dict:
+        with self._lock:
+            remaining, size = self._scrolls.pop(scroll_id, ([], 0))
+            if remaining:
+                self._scrolls[scroll_id] = (remaining[size:], size)
+            return self._response(remaining[:size], len(remaining), scroll_id)
+
+    def index(self, index: str, body: dict, doc_id: Optional[str] = None) -> dict:
+        with self._lock:
+            docs = self.indices.setdefault(index, {})
+            doc_id = doc_id or uuid.uuid4().hex
+            result = "updated" if doc_id in docs else "created"
+            docs[doc_id] = copy.deepcopy(body)
+            return {"_index": index, "_id": doc_id, "result": result}
+
+    def update(self, index: str, doc_id: str, body: dict) -> dict:
+        with self._lock:
+            source = self.documents(index).get(doc_id)
+            if source is None:
+                raise _not_found(index, doc_id)
+            source.update(copy.deepcopy(body.get("doc", {})))
+            return {"_index": index, "_id": doc_id, "result": "updated"}
+
+    def delete(self, index: str, doc_id: str) -> dict:
+        with self._lock:
+            if self.documents(index).pop(doc_id, None) is None:
+                raise _not_found(index, doc_id)
+            return {"_index": index, "_id": doc_id, "result": "deleted"}
+
+    def perform(self, method: str, url: str, params: Optional[dict] = None, body=None) -> dict:
+        """Serve one REST call of the Elasticsearch client."""
+        params = params or {}
+        parts = [part for part in url.split("/") if part]
+        if not parts:  # ping / info
+            return {"cluster_name": "loadtest", "version": {"number": "7.17.0"}}
+        if parts[-1] == "scroll":
+            return self.scroll((body or {}).get("scroll_id") or params.get("scroll_id"))
+        if parts[-1] == "_search":
+            return self.search(parts[0], body, params.get("scroll"))
+        if parts[1] == "_update":
+            return self.update(parts[0], parts[2], body)
+        if method == "DELETE":
+            return self.delete(parts[0], parts[2])
+        if parts[1] in ("_doc", "_create"):
+            return self.index(parts[0], body, parts[2] if len(parts) > 2 else None)
+        raise ValueError(f"Unsupported Elasticsearch request: {method} {url}")
+
+
+def _not_found(index: str, doc_id: str):
+    from elasticsearch.exceptions import NotFoundError
+
+    return NotFoundError(404, "document_missing_exception", {"_index": index, "_id": doc_id, "result": "not_found"})
+
+
+# Shared by every client created after `install`
+_store = None
+_profile = DEFAULT_PROFILE
+
+
+class InMemoryTransport:
+
+    def __init__(self, store: InMemoryStore, latency: float) -> None:
+        self.store = store
+        self.latency = latency
+
+    def perform_request(self, method, url, headers=None, params=None, body=None):
+        # The real sync client blocks the calling thread (the event loop) for the round trip
+        if self.latency:
+            time.sleep(self.latency)
+        return self.store.perform(method, url, params, body)
+
+
+class AsyncInMemoryTransport(InMemoryTransport):
+
+    async def perform_request(self, method, url, headers=None, params=None, body=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.store.perform(method, url, params, body)
+
+
+class InMemoryElasticsearch:
+    """Drop-in for the `elasticsearch.Elasticsearch` methods the API calls."""
+
+    transport_class = InMemoryTransport
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.transport = self.transport_class(_store, _profile["es_latency_ms"] / 1000.)
+
+    def search(self, index=None, body=None, scroll=None, **kwargs):
+        return self.transport.perform_request("POST", f"/{index}/_search", params={"scroll": scroll} if scroll else None, body=body)
+
+    def scroll(self, scroll_id=None, scroll=None, body=None, **kwargs):
+        return self.transport.perform_request("POST", "/_search/scroll", body={"scroll_id": scroll_id, "scroll": scroll})
+
+    def index(self, index, body=None, id=None, refresh=None, document=None, **kwargs):
+        return self.transport.perform_request("PUT" if id else "POST", f"/{index}/_doc" + (f"/{id}" if id else ""), body=body or document)
+
+    def update(self, index, id, body=None, **kwargs):
+        return self.transport.perform_request("POST", f"/{index}/_update/{id}", body=body)
+
+    def delete(self, index, id, refresh=None, **kwargs):
+        return self.transport.perform_request("DELETE", f"/{index}/_doc/{id}")
+
+    def ping(self, **kwargs):
+        self.transport.perform_request("HEAD", "/")
+        return True
+
+    def close(self):
+        pass
+
+
+class AsyncInMemoryElasticsearch(InMemoryElasticsearch):
+    """Drop-in for `elasticsearch.AsyncElasticsearch`; every method is a coroutine."""
+
+    transport_class = AsyncInMemoryTransport
+
+    async def search(self, index=None, body=None, scroll=None, **kwargs):
+        return await super().search(index, body, scroll)
+
+    async def scroll(self, scroll_id=None, scroll=None, body=None, **kwargs):
+        return await super().scroll(scroll_id, scroll)
+
+    async def index(self, index, body=None, id=None, refresh=None, document=None, **kwargs):
+        return await super().index(index, body, id, refresh, document)
+
+    async def update(self, index, id, body=None, **kwargs):
+        return await super().update(index, id, body)
+
+    async def delete(self, index, id, refresh=None, **kwargs):
+        return await super().delete(index, id, refresh)
+
+    async def ping(self, **kwargs):
+        await self.transport.perform_request("HEAD", "/")
+        return True
+
+    async def close(self):
+        pass
+
+
+def _bigrams(text: str) -> set:
+    text = re.sub(r"\s+", "", text or "")
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class FakeSemanticSearch:
+    """
+    Stand-in for the `semantic_search` tool.
+
+    Candidates are ranked by the character bigram overlap of the query with
+    their title and overview, after the `filter`/`must_not` clauses.
+    """
+
+    def __init__(self, store: InMemoryStore, index_n: Optional[str] = None, async_mode: bool = False) -> None:
+        self.store = store
+        self.index_n = index_n
+        self.async_mode = async_mode
+        self.latency = _profile["search_latency_ms"] / 1000.
+        self._grams = {}
+
+    def _search(self, query, index_n, top_k, source_fields, filter, must_not) -> List[dict]:
+        index_n = index_n or self.index_n
+        query_grams = _bigrams(query)
+        conditions = {"bool": {"filter": filter or [], "must_not": must_not or []}}
+
+        scored = []
+        for doc_id, source in list(self.store.documents(index_n).items()):
+            if not self.store.matches(doc_id, source, conditions):
+                continue
+            key = (index_n, doc_id)
+            if key not in self._grams:
+                self._grams[key] = _bigrams(" ".join(str(source.get(field, "")) for field in ("title", "text", "overview_summ")))
+            scored.append((len(query_grams & self._grams[key]), doc_id, source))
+
+        scored.sort(key=lambda item: -item[0])
+        return [self.store._hit(index_n, doc_id, source, source_fields, float(score)) for score, doc_id, source in scored[:top_k]]
+
+    def __call__(self, query, vector_field=None, index_n=None, top_k=10, source_fields=None, filter=None, must_not=None, **kwargs):
+        if self.async_mode:
+            return self._asearch(query, index_n, top_k, source_fields, filter, must_not)
+        time.sleep(self.latency)
+        return self._search(query, index_n, top_k, source_fields, filter, must_not)
+
+    async def _asearch(self, *args):
+        await asyncio.sleep(self.latency)
+        return self._search(*args)
+
+
+CANDIDATE_RE = re.compile(r"^- (.+?): ", re.MULTILINE)
+
+
+class FakeTextGenerator:
+    """
+    Stand-in for the `text_generation` tool.
+
+    Without `stream` it acts as the strategy planner and answers the plan
+    registered for the question (`{"message": ...}` otherwise). With `stream`
+    it generates an answer quoting the candidates of the prompt, with an
+    itinerary table when the question asks for 일정, and streams it in
+    2-3 character tokens after `first_token_ms` at `token_rate` tokens/s.
+    """
+
+    def __init__(self, plans: Dict[str, dict], stream: bool = False, async_mode: bool = False, **kwargs) -> None:
+        self.plans = plans
+        self.stream = stream
+        self.async_mode = async_mode
+
+    def plan(self, question: str) -> str:
+        return json.dumps(self.plans.get(question) or {"message": "무엇이든 물어보세요! 여행 계획을 도와드릴게요."}, ensure_ascii=False)
+
+    @staticmethod
+    def answer(question: str, input_data: str = "", travel_info: Optional[dict] = None, **kwargs) -> str:
+        titles = list(dict.fromkeys(CANDIDATE_RE.findall(input_data or "")))
+        if not titles:
+            return "말씀하신 내용을 바탕으로 여행 준비를 도와드릴게요. 가고 싶은 지역이나 날짜를 알려주시면 더 자세히 안내해 드릴게요."
+
+        lines = [f"요청하신 내용에 맞춰 {', '.join(repr(title) for title in titles[:3])} 등을 중심으로 골라 보았어요.\n"]
+        if "일정" in question:
+            start_date = ((travel_info or {}).get("travel_dates") or {}).get("start_date")
+            lines.append(f"\n**{titles[0].split()[0]} 맞춤 여행**\n")
+            lines.append("| 날짜 | 시간 | 여행지 | 설명 |\n|------|------|------|------|\n")
+            for i in range(min(len(titles), 6)):
+                day = i // 3
+                if start_date:
+                    date = time.strftime("%m/%d", time.localtime(time.mktime(time.strptime(start_date, "%Y-%m-%d")) + day * 86400))
+                else:
+                    date = f"{day + 1}일차"
+                hour = 10 + (i % 3) * 3
+                lines.append(f"| {date} | {hour:02d}:00-{hour + 2:02d}:00 | '{titles[i]}' | 여유롭게 둘러보며 주변 풍경을 즐겨 보세요. |\n")
+            lines.append("\n")
+        for title in titles[3:6]:
+            lines.append(f"- '{title}'도 함께 들러 보시면 좋아요.\n")
+        lines.append("즐거운 여행 되세요!")
+        return "".join(lines)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        tokens = []
+        i = 0
+        while i < len(text):
+            step = 2 + (i // 2) % 2
+            tokens.append(text[i:i + step])
+            i += step
+        return tokens
+
+    def _tokens(self, variables: dict) -> List[str]:
+        return self.tokenize(self.answer(**variables))
+
+    def _stream(self, variables: dict):
+        time.sleep(_profile["first_token_ms"] / 1000.)
+        interval = 1. / _profile["token_rate"]
+        for token in self._tokens(variables):
+            yield token
+            time.sleep(interval)
+
+    async def _astream(self, variables: dict):
+        await asyncio.sleep(_profile["first_token_ms"] / 1000.)
+        interval = 1. / _profile["token_rate"]
+        for token in self._tokens(variables):
+            yield token
+            await asyncio.sleep(interval)
+
+    async def _aplan(self, question: str) -> str:
+        await asyncio.sleep(_profile["planner_latency_ms"] / 1000.)
+        return self.plan(question)
+
+    def __call__(self, **variables):
+        if self.stream:
+            return self._astream(variables) if self.async_mode else self._stream(variables)
+        if self.async_mode:
+            return self._aplan(variables.get("question"))
+        time.sleep(_profile["planner_latency_ms"] / 1000.)
+        return self.plan(variables.get("question"))
+
+
+class FakeTokenizer:
+    """Token counts from tiktoken when it is installed, else about two characters per token."""
+
+    def __init__(self, model: Optional[str] = None) -> None:
+        try:
+            import tiktoken
+
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            self._encoding = None
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return (len(text) + 1) // 2
+
+
+class FakeTokenLimiter:
+    """Stand-in for `toolva.utils.TokenLimiter`."""
+
+    def __init__(self, tokenizer=None, max_tokens: int = 1000, **kwargs) -> None:
+        self.tokenizer = tokenizer if isinstance(tokenizer, FakeTokenizer) else FakeTokenizer()
+        self.max_tokens = max_tokens
+
+    def token_counter(self, text: str) -> int:
+        return self.tokenizer.count(text)
+
+    def cutoff(self, input_data: list, direction: str = "left") -> list:
+        # Drops the oldest items until the rest fits
+        output_data = list(input_data)
+        while len(output_data) > 1 and self.token_counter(str(output_data)) >= self.max_tokens:
+            output_data.pop(0)
+        return output_data
+
+
+class FakeChatSummarizer:
+    """Stand-in for `toolva.utils.ChatSummarizer`."""
+
+    def __init__(self, max_tokens: int = 256, async_mode: bool = True, **kwargs) -> None:
+        self.max_tokens = max_tokens
+
+    @staticmethod
+    def _summary(input: str, output: str) -> str:
+        return f"사용자가 '{(input or '')[:30]}'에 대해 물었고 길동이가 {len(output or '')}자 분량으로 답변함"
+
+    def summarize(self, input: str = "", output: str = "", **kwargs) -> str:
+        time.sleep(_profile["summarizer_latency_ms"] / 1000.)
+        return self._summary(input, output)
+
+    async def asummarize(self, input: str = "", output: str = "", **kwargs) -> str:
+        await asyncio.sleep(_profile["summarizer_latency_ms"] / 1000.)
+        return self._summary(input, output)
+
+
+def toolva_factory(plans: Dict[str, dict], tool: str, src: Optional[str] = None, model=None, **kwargs):
+    """Stand-in for the `Toolva(tool=..., ...)` constructor."""
+    if tool == "text_generation":
+        return FakeTextGenerator(plans, **kwargs)
+    if tool == "tokenization":
+        return FakeTokenizer(model)
+    if tool == "semantic_search":
+        return FakeSemanticSearch(_store, (model or {}).get("index_n"), kwargs.get("async_mode", False))
+    raise ValueError(f"Unsupported Toolva tool: {tool}")
+
+
+def _get_json(url: str, params: dict) -> dict:
+    with urlopen(f"{url}?{urlencode(params)}", timeout=5) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class StubGoogleSearch:
+    """Replaces langchain's `GoogleSearchAPIWrapper`; queries the stub Custom Search endpoint."""
+
+    def __init__(self, url: str, google_api_key: Optional[str] = None, google_cse_id: Optional[str] = None, **kwargs) -> None:
+        self.url = url
+
+    def results(self, query: str, num_results: int) -> List[dict]:
+        items = _get_json(self.url, {"q": query, "num": num_results}).get("items", [])
+        return [{"title": item["title"], "link": item["link"], "snippet": item["snippet"]} for item in items]
+
+
+class StubKakaoLocal:
+    """Replaces `PyKakao.Local`; queries the stub Kakao Local endpoint."""
+
+    def __init__(self, base_url: str, service_key: Optional[str] = None) -> None:
+        self.base_url = base_url
+
+    def search_address(self, query: str, dataframe: bool = False, **kwargs) -> dict:
+        return _get_json(self.base_url + "address.json", {"query": query, "size": 1})
+
+
+def _load_router_config(name: str):
+    # Load `routers.<name>.router_config` by itself; importing the `routers`
+    # package would build every router (and its agent) with the real config.
+    module_name = f"routers.{name}.router_config"
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(APP_DIR, "routers", name, "router_config.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+def install(store: InMemoryStore, plans: Dict[str, dict], urls: Dict[str, str], profile: Optional[dict] = None, secret_key: str = "loadtest-secret") -> dict:
+    """
+    Patch the stand-ins into the API modules.
+
+    Args:
+    - store (InMemoryStore): Data served by every Elasticsearch client and semantic search.
+    - plans (dict): Strategy planner output by question.
+    - urls (dict): Stub endpoints; keys "kakao_local", "kma", "google_cse", "imagebind".
+    - profile (dict): Latencies and token rate overriding `DEFAULT_PROFILE`.
+    - secret_key (str): JWT secret used when the environment does not set one.
+
+    Returns:
+    - dict: `common_parameters` of the patched API.
+
+    """
+    global _store, _profile
+    _store = store
+    _profile = {**DEFAULT_PROFILE, **(profile or {})}
+
+    elasticsearch = importlib.import_module("elasticsearch")
+    elasticsearch.Elasticsearch = InMemoryElasticsearch
+    elasticsearch.AsyncElasticsearch = AsyncInMemoryElasticsearch
+
+    toolva = importlib.import_module("toolva")
+    toolva_utils = importlib.import_module("toolva.utils")
+    toolva.Toolva = partial(toolva_factory, plans)
+    toolva_utils.TokenLimiter = FakeTokenLimiter
+    toolva_utils.ChatSummarizer = FakeChatSummarizer
+
+    importlib.import_module("PyKakao").Local = partial(StubKakaoLocal, urls["kakao_local"])
+    importlib.import_module("langchain.utilities").GoogleSearchAPIWrapper = partial(StubGoogleSearch, urls["google_cse"])
+
+    from core.common_config import common_parameters
+
+    common_parameters["secret_key"] = common_parameters.get("secret_key") or secret_key
+    common_parameters["kakao_local_url"] = urls["kakao_local"]
+    common_parameters["weather_url"] = urls["kma"]
+
+    for name in ("main_chatbot", "member_chatbot"):
+        _load_router_config(name).parameters["image_retriever"]["url"] = urls["imagebind"]
+
+    return common_parameters
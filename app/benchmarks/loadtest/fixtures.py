@@ -0,0 +1,142 @@
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+
+REGIONS = {
+    "서울": ("11B10101", 37.5665, 126.9780),
+    "부산": ("11H20201", 35.1796, 129.0756),
+    "제주": ("11G00201", 33.4996, 126.5312),
+    "강릉": ("11D20501", 37.7519, 128.8761),
+    "경주": ("11H10701", 35.8562, 129.2247),
+    "전주": ("11F10201", 35.8242, 127.1480),
+    "여수": ("11F20401", 34.7604, 127.6622)
+}
+
+PLACES = [
+    ("해변 산책로", "바다를 따라 걷는 평탄한 산책로로 일몰 풍경이 아름답다"),
+    ("전통시장", "지역 먹거리와 특산물을 맛볼 수 있는 오래된 전통시장이다"),
+    ("시립미술관", "근현대 미술 작품과 지역 작가 기획전을 관람할 수 있다"),
+    ("수목원", "사계절 꽃과 숲길을 즐길 수 있는 도심 속 휴식 공간이다"),
+    ("한옥마을", "전통 한옥과 골목길이 보존된 마을로 체험 프로그램이 많다"),
+    ("전망대", "도시 전경과 야경을 한눈에 내려다볼 수 있는 전망 명소다"),
+    ("역사박물관", "지역의 역사와 생활 문화를 전시하는 박물관이다"),
+    ("케이블카", "바다와 산을 가로지르며 탁 트인 경치를 감상할 수 있다"),
+    ("호수공원", "호수를 둘러싼 무장애 데크길과 분수 공연이 있는 공원이다"),
+    ("카페거리", "개성 있는 카페와 공방이 모여 있는 골목이다"),
+    ("국립공원 탐방로", "완만한 경사의 탐방로로 가족 단위 트레킹에 좋다"),
+    ("아쿠아리움", "다양한 해양 생물을 가까이서 관찰할 수 있는 실내 관광지다")
+]
+
+ACCESSIBILITY = {
+    "physical_en": ["휠체어 대여 가능, 장애인 화장실 있음", "경사로 설치, 장애인 주차구역 있음", ""],
+    "visual_en": ["점자 안내판과 음성 안내 제공", "보조견 동반 가능", ""],
+    "hearing_en": ["수어 해설 영상 제공", "자막 안내 제공", ""]
+}
+
+CONTENT_TYPES = ["12", "14", "28", "38", "39"]
+
+
+def build_destinations(per_region: int = 24, seed: int = 0) -> List[Dict]:
+    """
+    Synthesize travel destination documents shaped like the `gildong_1` index.
+
+    Args:
+    - per_region (int): Destinations generated for each region.
+    - seed (int): Random seed, so every run sees the same corpus.
+
+    Returns:
+    - list: Documents with `_id` and `_source`.
+
+    """
+    rng = random.Random(seed)
+    documents = []
+    for region, (_, lat, lon) in REGIONS.items():
+        for i in range(per_region):
+            place, overview = PLACES[i % len(PLACES)]
+            title = f"{region} {place}" if i < len(PLACES) else f"{region} {place} {i // len(PLACES) + 1}"
+            source = {
+                "title": title,
+                "contenttypeid": rng.choice(CONTENT_TYPES),
+                "overview_summ": f"{region}에 있는 {overview}. " * rng.randint(2, 5),
+                "location": {"lat": lat + rng.uniform(-0.05, 0.05), "lon": lon + rng.uniform(-0.05, 0.05)},
+                "url": f"https://tong.visitkorea.or.kr/cms/resource/{rng.randint(10, 99)}/{rng.randint(1000000, 9999999)}_image2_1.jpg",
+                "sbert_vector": [round(rng.uniform(-1, 1), 4) for _ in range(8)],
+                "region": region
+            }
+            for field, choices in ACCESSIBILITY.items():
+                value = rng.choice(choices)
+                if value:
+                    source[field] = value
+            documents.append({"_id": str(126000 + len(documents)), "_source": source})
+    return documents
+
+
+def build_weather_regions() -> List[Dict]:
+    """Region code documents of the `weather_regioncode` index."""
+    return [
+        {"_id": reg_id, "_source": {"text": region, "REG_ID": reg_id, "vector": [0.]}}
+        for region, (reg_id, _, _) in REGIONS.items()
+    ]
+
+
+def build_users(count: int) -> List[Dict]:
+    """Registered users of the `gildong_user` index."""
+    disability_types = ["physical", "visual", "hearing", None]
+    return [
+        {
+            "_id": f"user-{i}",
+            "_source": {
+                "userID": f"loadtest-user-{i}",
+                "user_name": f"부하테스트{i}",
+                "disability_type": disability_types[i % len(disability_types)],
+                "age_group": "30대",
+                "gender": "female" if i % 2 else "male"
+            }
+        }
+        for i in range(count)
+    ]
+
+
+def build_confirmed_itineraries(users: List[Dict], destinations: List[Dict], per_user: int = 3, seed: int = 0) -> List[Dict]:
+    """Itineraries already registered by each user, for `GET /itinerary`."""
+    rng = random.Random(seed)
+    start = datetime.now() + timedelta(days=7)
+    documents = []
+    for user in users:
+        user_id = user["_source"]["userID"]
+        for i in range(per_user):
+            picks = rng.sample(destinations, 6)
+            schedule = [
+                {
+                    "title": hit["_source"]["title"],
+                    "url": f"https://gildong.site/travel/detail/{hit['_id']}",
+                    "date": (start + timedelta(days=j // 3)).strftime("%Y-%m-%d"),
+                    "date_type": "date",
+                    "start_time": f"{10 + (j % 3) * 3}:00:00",
+                    "end_time": f"{12 + (j % 3) * 3}:00:00",
+                    "location": hit["_source"]["location"],
+                    "description": hit["_source"]["overview_summ"][:40],
+                    "image_url": hit["_source"]["url"],
+                    "physical": "physical_en" in hit["_source"],
+                    "visual": "visual_en" in hit["_source"],
+                    "hearing": "hearing_en" in hit["_source"]
+                }
+                for j, hit in enumerate(picks)
+            ]
+            session_id = f"{user_id}-confirmed-{i}"
+            documents.append({
+                "_id": session_id,
+                "_source": {
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "timestamp": (start - timedelta(days=30 - i)).strftime("%Y-%m-%dT%H:%M:%S"),
+                    "itinerary": {
+                        "uuid": f"{session_id}-itinerary",
+                        "title": f"{picks[0]['_source']['region']} 맞춤 여행",
+                        "schedule": schedule,
+                        "itinerary_section": ""
+                    }
+                }
+            })
+    return documents
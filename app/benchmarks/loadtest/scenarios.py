@@ -0,0 +1,98 @@
+"""
+Scripted multi-turn sessions and the strategy planner output for each question.
+
+A turn is `{"question": ..., "image_name": ..., "plan": ...}`; `plan` is what
+the fake planner answers for that question (image turns skip the planner).
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from benchmarks.loadtest.fixtures import REGIONS
+
+
+def _travel_dates(days: int = 2) -> Dict[str, str]:
+    start = datetime.now() + timedelta(days=2)  # 단기예보 범위
+    return {
+        "start_date": start.strftime("%Y-%m-%d"),
+        "end_date": (start + timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    }
+
+
+def main_session(region: str) -> List[dict]:
+    """Anonymous `/chatbot/main` conversation: collect, recommend, plan, image search, small talk."""
+    dates = _travel_dates()
+    return [
+        {
+            "question": f"{region}으로 1박 2일 여행 가고 싶어",
+            "plan": {
+                "travel_info_collector": {
+                    "travel_region": region,
+                    "travel_dates": dates,
+                    "message": f"{region} 여행 좋아요! 어떤 분위기의 여행을 원하시나요?"
+                }
+            }
+        },
+        {
+            "question": f"{region} 바다가 보이는 관광지 추천해줘",
+            "plan": {"travel_destination_retriever": {"query": f"{region} 바다 전망 관광지", "top_k": 12}}
+        },
+        {
+            "question": f"추천해준 {region} 관광지로 일정 짜줘",
+            "plan": {"travel_itinerary_generator": {"input_data": "previous_ai_answer"}}
+        },
+        {
+            "question": "",
+            "image_name": f"{region}-sample.jpg"
+        },
+        {
+            "question": f"{region} 여행 준비물 알려줘",
+            "plan": {"message": "편한 신발과 보조배터리는 꼭 챙기세요!"}
+        }
+    ]
+
+
+def member_session(region: str) -> List[dict]:
+    """Signed-in `/chatbot/member` conversation: plan, edit, weather, reviews."""
+    dates = _travel_dates()
+    weather_start = dates["start_date"].replace("-", "")
+    return [
+        {
+            "question": f"{region}에서 {dates['start_date']}부터 1박 2일 일정 만들어줘",
+            "plan": {
+                "travel_info_collector": {"travel_region": region, "travel_dates": dates},
+                "travel_destination_retriever": [
+                    {"query": f"{region} 문화 관광지", "top_k": 6},
+                    {"query": f"{region} 자연 휴양지", "top_k": 6}
+                ]
+            }
+        },
+        {
+            "question": f"{region} 둘째 날 일정을 좀 더 여유롭게 바꿔줘",
+            "plan": {"travel_itinerary_generator": {"input_data": "previous_ai_answer"}}
+        },
+        {
+            "question": f"{region} 그 날 날씨 어때?",
+            "plan": {"weather_forecaster": {"weather_dates": {"start_date": weather_start}, "location": region}}
+        },
+        {
+            "question": f"{region} 전통시장 후기 찾아줘",
+            "plan": {"blog_searcher": {"query": f"{region} 전통시장 후기"}}
+        }
+    ]
+
+
+SESSIONS = {
+    "main": main_session,
+    "member": member_session
+}
+
+
+def build_plans() -> Dict[str, dict]:
+    """Planner output by question, for every scripted session of every region."""
+    return {
+        turn["question"]: turn["plan"]
+        for session in SESSIONS.values()
+        for region in REGIONS
+        for turn in session(region)
+        if "plan" in turn
+    }
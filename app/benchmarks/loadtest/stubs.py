@@ -0,0 +1,192 @@
+"""
+Stub HTTP server for the external APIs the API calls.
+
+One aiohttp server on a background thread serves, under its own prefix:
+
+- `/kakao/local/` — Kakao Local address and keyword search
+- `/kma/` — KMA short- and mid-term forecast text endpoints
+- `/google/customsearch/v1` — Google Custom Search
+- `/imagebind/search_image` — the IB image search service
+
+Every route sleeps for its configured latency before answering, so the API
+sees realistic upstream round trips without leaving the machine.
+"""
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict
+
+from aiohttp import web
+
+from benchmarks.loadtest.fakes import InMemoryStore
+
+
+WEATHER = ["맑음", "구름많음", "흐림", "비", "흐리고 비"]
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def kma_forecast(reg_id: str, start: str, end: str) -> str:
+    """KMA `typ01` text response with one forecast row per half day between `start` and `end`."""
+    start_date = datetime.strptime(start[:8], "%Y%m%d")
+    end_date = datetime.strptime(end[:8], "%Y%m%d")
+    issued = datetime.now().strftime("%Y%m%d0500")
+
+    lines = ["#START7777", "# REG_ID TM_FC TM_EF MOD STN C SKY PRE WF TA ST RN_ST MIN MAX"]
+    day = start_date
+    while day <= end_date:
+        for hour in ("0000", "1200"):
+            seed = _digest(reg_id + day.strftime("%Y%m%d") + hour)
+            lines.append(" ".join([
+                reg_id, issued, day.strftime("%Y%m%d") + hour, "A02", "159", "2",
+                f"DB0{seed % 4 + 1}", "0", f'"{WEATHER[seed % len(WEATHER)]}"',
+                str(10 + seed % 15), str(seed % 10 * 10), str(seed % 7 * 10), str(5 + seed % 8), str(15 + seed % 10)
+            ]))
+        day += timedelta(days=1)
+    lines.append("#7777END")
+    return "\n".join(lines) + "\n"
+
+
+def build_app(store: InMemoryStore, destination_index: str, latency_ms: Dict[str, float]) -> web.Application:
+    """
+    Build the stub application.
+
+    Args:
+    - store (InMemoryStore): Destinations answered by the IB stub.
+    - destination_index (str): Index holding the destinations.
+    - latency_ms (dict): Latency per stub: "kakao_local", "kma", "google_cse", "imagebind".
+
+    Returns:
+    - web.Application: The stub application.
+
+    """
+    async def delay(name):
+        await asyncio.sleep(latency_ms.get(name, 0.) / 1000.)
+
+    async def kakao_address(request):
+        await delay("kakao_local")
+        query = request.query.get("query", "")
+        return web.json_response({
+            "documents": [{
+                "address_name": query,
+                "address": {"address_name": f"{query} 중구"},
+                "x": "129.0324",
+                "y": "35.1028"
+            }],
+            "meta": {"total_count": 1, "pageable_count": 1, "is_end": True}
+        })
+
+    async def kakao_keyword(request):
+        await delay("kakao_local")
+        query = request.query.get("query", "")
+        size = int(request.query.get("size", 5))
+        return web.json_response({
+            "documents": [
+                {
+                    "place_name": f"{query} {i + 1}",
+                    "address_name": f"{query} 인근 {i + 1}",
+                    "road_address_name": f"{query}로 {i + 10}",
+                    "x": f"{129.0 + i * 0.01:.4f}",
+                    "y": f"{35.1 + i * 0.01:.4f}",
+                    "place_url": f"http://place.map.kakao.com/{_digest(query) + i}"
+                }
+                for i in range(size)
+            ],
+            "meta": {"total_count": size, "pageable_count": size, "is_end": True}
+        })
+
+    async def kma(request):
+        await delay("kma")
+        reg_id = request.query.get("reg", "11B10101")
+        start = request.query.get("tmef1", datetime.now().strftime("%Y%m%d"))
+        end = request.query.get("tmef2", start)
+        if end[:8] < start[:8]:
+            end = start
+        return web.Response(text=kma_forecast(reg_id, start, end))
+
+    async def google_cse(request):
+        await delay("google_cse")
+        query = request.query.get("q", "")
+        num = int(request.query.get("num", 5))
+        return web.json_response({
+            "items": [
+                {
+                    "title": f"{query} 솔직 후기 {i + 1}",
+                    "link": f"https://blog.example.com/{_digest(query)}/{i + 1}",
+                    "snippet": f"{query}에 다녀왔어요. 접근성이 좋고 분위기가 좋아서 다시 가고 싶은 곳이에요. ({i + 1})"
+                }
+                for i in range(num)
+            ]
+        })
+
+    async def imagebind(request):
+        await delay("imagebind")
+        payload = await request.json()
+        documents = list(store.documents(destination_index).items())
+        start = _digest(payload.get("file_name", "")) % max(len(documents) - 10, 1)
+        return web.json_response([
+            {"_index": destination_index, "_id": doc_id, "_score": 1. - i * 0.01, "_source": InMemoryStore.project(source, None)}
+            for i, (doc_id, source) in enumerate(documents[start:start + 10])
+        ])
+
+    app = web.Application()
+    app.router.add_get("/kakao/local/address.json", kakao_address)
+    app.router.add_get("/kakao/local/keyword.json", kakao_keyword)
+    app.router.add_get("/kma/{endpoint}", kma)
+    app.router.add_get("/google/customsearch/v1", google_cse)
+    app.router.add_post("/imagebind/search_image", imagebind)
+    return app
+
+
+class StubServer:
+    """Serve the stub application from a background thread with its own event loop."""
+
+    def __init__(self, app: web.Application, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.app = app
+        self.host = host
+        self.port = port
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    @property
+    def urls(self) -> Dict[str, str]:
+        base = f"http://{self.host}:{self.port}"
+        return {
+            "kakao_local": f"{base}/kakao/local/",
+            "kma": f"{base}/kma/",
+            "google_cse": f"{base}/google/customsearch/v1",
+            "imagebind": f"{base}/imagebind/search_image"
+        }
+
+    def start(self) -> "StubServer":
+        started = threading.Event()
+
+        async def serve():
+            self._runner = web.AppRunner(self.app, access_log=None)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, self.host, self.port)
+            await site.start()
+            self.port = self._runner.addresses[0][1]
+            started.set()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(serve())
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="loadtest-stubs", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
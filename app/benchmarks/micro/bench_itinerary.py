@@ -0,0 +1,19 @@
+from services.utils import ItineraryStreamParser, ResponsePreprocessor
+
+
+def parse_stream(tokens, hits, preprocessor):
+    parser = ItineraryStreamParser(preprocessor, hits, {})
+    for token in tokens:
+        parser.feed(token)
+    return parser.finalize()
+
+
+def bench_preprocess_itinerary(benchmark, generator_tokens, formatted_hits):
+    message = "".join(generator_tokens)
+    itinerary = benchmark(ResponsePreprocessor().preprocess_itinerary, message, formatted_hits, {})
+    assert len(itinerary["schedule"]) == 6
+
+
+def bench_itinerary_stream_parser(benchmark, generator_tokens, formatted_hits):
+    itinerary = benchmark(parse_stream, generator_tokens, formatted_hits, ResponsePreprocessor())
+    assert len(itinerary["schedule"]) == 6
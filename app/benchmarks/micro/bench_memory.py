@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services.memory_manager import MemoryManager
+
+
+class RecordedDB:
+    """Serves a recorded conversation instead of Elasticsearch."""
+
+    def __init__(self, memory):
+        self.memory = memory
+
+    def fetch_memory(self, index_n, session_id, source_fields=[]):
+        return self.memory
+
+
+@pytest.mark.parametrize("link_index", ["stored", "rebuilt"])
+def bench_load_memory(benchmark, convo_memory, link_index):
+    if link_index == "rebuilt":  # conversations saved before the link index
+        convo_memory = [{k: v for k, v in turn.items() if k != "link_index"} for turn in convo_memory]
+
+    manager = MemoryManager(
+        db=RecordedDB(convo_memory),
+        index_n="gildong_convo",
+        token_limiter=SimpleNamespace(max_tokens=1000),
+        session_id="bench-session",
+        user_id=None
+    )
+    benchmark(manager._load_data_from_db)
+    assert manager.data["history"] and manager.data["link_index"]
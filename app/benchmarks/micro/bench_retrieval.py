@@ -0,0 +1,29 @@
+import copy
+
+from services.utils import enrich_source, format_hits
+
+
+def bench_format_hits(benchmark, destination_hits, hit_fields):
+    key_field, value_fields = hit_fields
+    output = benchmark(format_hits, destination_hits, key_field, value_fields)
+    assert len(output["input_data"]) == len(destination_hits)
+
+
+def bench_format_hits_token_limited(benchmark, destination_hits, hit_fields, token_limiter):
+    key_field, value_fields = hit_fields
+    benchmark(format_hits, destination_hits, key_field, value_fields, token_limiter)
+
+
+def bench_format_hits_precomputed(benchmark, destination_hits, hit_fields, token_limiter):
+    key_field, value_fields = hit_fields
+    # Documents carrying the snippets and token counts of `enrich_prompt_snippets`
+    enriched = copy.deepcopy(destination_hits)
+    for hit in enriched:
+        hit["_source"].update(enrich_source(hit["_source"], key_field, value_fields, token_limiter.token_counter))
+
+    # format_hits pops the prompt fields, so every round gets a fresh copy
+    benchmark.pedantic(
+        format_hits,
+        setup=lambda: ((copy.deepcopy(enriched), key_field, value_fields, token_limiter), {}),
+        rounds=200
+    )
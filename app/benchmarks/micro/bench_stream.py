@@ -0,0 +1,46 @@
+from services.utils import HyperlinkLinker, ItineraryStreamParser, ResponsePreprocessor, StreamFramer
+
+
+def link_tokens(tokens, hyperlinks):
+    linker = HyperlinkLinker(hyperlinks, resolver=lambda key: None)
+    output = [linker.feed(token) for token in tokens]
+    output.append(linker.flush())
+    return "".join(output)
+
+
+def token_loop(tokens, hits, preprocessor):
+    """The per-token loop of the agents: itinerary rows, hyperlinks and SSE framing."""
+    framer = StreamFramer("bench-session")
+    linker = HyperlinkLinker(hits["hyperlink"], resolver=lambda key: None)
+    parser = ItineraryStreamParser(preprocessor, hits, {})
+    frames = []
+    for token in tokens:
+        for event, payload in parser.feed(token):
+            frames.append(framer.event(event, payload))
+        chunk = linker.feed(token)
+        if chunk:
+            frames.append(framer.push(chunk))
+    frames.append(framer.push(linker.flush()))
+    parser.finalize()
+    frames.append(framer.close())
+    return frames
+
+
+def bench_hyperlink_linker(benchmark, generator_tokens, formatted_hits):
+    output = benchmark(link_tokens, generator_tokens, formatted_hits["hyperlink"])
+    assert "](https://gildong.site/travel/detail/" in output
+
+
+def bench_stream_framer(benchmark, generator_tokens):
+    def frame(tokens):
+        framer = StreamFramer("bench-session")
+        frames = [framer.push(token) for token in tokens]
+        frames.append(framer.close())
+        return frames
+
+    benchmark(frame, generator_tokens)
+
+
+def bench_agent_token_loop(benchmark, generator_tokens, formatted_hits):
+    frames = benchmark(token_loop, generator_tokens, formatted_hits, ResponsePreprocessor())
+    assert any("event: itinerary_row" in frame for frame in frames)
@@ -0,0 +1,14 @@
+from services.utils import PromptBudgetAllocator
+
+
+def bench_token_limiter_cutoff(benchmark, formatted_hits, token_limiter):
+    # The candidate list the retrieval tools used to cut before precomputed token counts
+    candidates = [str(item) for item in formatted_hits["input_data"]]
+    benchmark(token_limiter.cutoff, candidates)
+
+
+def bench_prompt_budget_allocate(benchmark, formatted_hits, convo_memory, token_limiter):
+    allocator = PromptBudgetAllocator(token_limiter.token_counter, max_tokens=3000)
+    history = [turn["summary"] for turn in convo_memory]
+    budget = benchmark(allocator.allocate, formatted_hits, history, [{"travel_region": "부산"}, "부산 1박 2일 일정 짜줘"])
+    assert budget["top_k"] > 0
@@ -0,0 +1,10 @@
+import pytest
+
+from services.tools import WeatherForecast
+
+
+@pytest.mark.parametrize("forecast", ["short", "mid"])
+def bench_extract_json(benchmark, kma_responses, forecast):
+    weather = WeatherForecast.__new__(WeatherForecast)  # no region retriever needed
+    records = benchmark(weather._extract_json, kma_responses[forecast])
+    assert records and "TM_EF" in records[0]
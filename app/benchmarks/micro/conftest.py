@@ -0,0 +1,82 @@
+"""
+Micro-benchmarks of the CPU-bound code run on every chat turn.
+
+Inputs are recorded in `fixtures/` (see `record_fixtures.py`). Install the
+development requirements (`pip install -r requirements-dev.txt` at the
+repository root, which adds pytest-benchmark) and run from the `app` directory:
+
+    pytest benchmarks/micro
+
+Compare against the committed baseline, failing on a 25% median regression:
+
+    pytest benchmarks/micro --benchmark-compare=0001 --benchmark-compare-fail=median:25%
+
+and record a new one after an intended change with `--benchmark-save=baseline`.
+Toolva must be installed, since `core` imports it; the benchmarks that need
+its tiktoken tokenizer are skipped when the tokenizer cannot be loaded.
+"""
+import os
+import copy
+import json
+
+import pytest
+
+import core  # noqa: F401  (initialized before services, as in main.py)
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+KEY_FIELD = "title"
+VALUE_FIELDS = ["contenttypeid", "overview_summ", "physical_en", "visual_en", "hearing_en"]
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return json.load(f) if name.endswith(".json") else f.read()
+
+
+@pytest.fixture(scope="session")
+def destination_hits():
+    return load_fixture("destination_hits.json")
+
+
+@pytest.fixture(scope="session")
+def generator_tokens():
+    return load_fixture("generator_tokens.json")
+
+
+@pytest.fixture(scope="session")
+def convo_memory():
+    return load_fixture("convo_memory.json")
+
+
+@pytest.fixture(scope="session")
+def kma_responses():
+    return {"short": load_fixture("kma_short.txt"), "mid": load_fixture("kma_mid.txt")}
+
+
+@pytest.fixture(scope="session")
+def hit_fields():
+    """Title and prompt fields of the destination retriever."""
+    return KEY_FIELD, VALUE_FIELDS
+
+
+@pytest.fixture(scope="session")
+def formatted_hits(destination_hits):
+    """Retriever output for the recorded hits, as the agents receive it."""
+    from services.utils import format_hits
+
+    return format_hits(copy.deepcopy(destination_hits), KEY_FIELD, VALUE_FIELDS)
+
+
+@pytest.fixture(scope="session")
+def token_limiter():
+    """The generator-side TokenLimiter of the agents, on the tiktoken tokenizer."""
+    try:
+        from toolva import Toolva
+        from toolva.utils import TokenLimiter
+
+        tokenizer = Toolva(tool="tokenization", src="tiktoken", model="cl100k_base")
+        return TokenLimiter(tokenizer=tokenizer, max_tokens=3500)
+    except Exception as e:
+        pytest.skip(f"Toolva tokenizer unavailable: {e}")
@@ -0,0 +1,117 @@
+"""
+Regenerate the recorded inputs of the micro-benchmarks in `fixtures/`.
+
+The corpus, answers and API responses come from the deterministic load test
+stand-ins, so re-recording only changes the fixtures when those change.
+
+Run from the `app` directory:
+
+    python -m benchmarks.micro.record_fixtures
+"""
+import os
+import json
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.loadtest.fakes import FakeTextGenerator
+from benchmarks.loadtest.fixtures import build_destinations
+from benchmarks.loadtest.stubs import kma_forecast
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REGION = "부산"
+
+
+def split_tokens(text, rng):
+    """Split an answer into 1-3 character tokens with quotes as tokens of their own, as GPT streams them."""
+    tokens = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 3)
+        quote = text.find("'", position, position + size)
+        if quote == position:
+            size = 1
+        elif quote > 0:
+            size = quote - position
+        tokens.append(text[position:position + size])
+        position += size
+    return tokens
+
+
+def record_hits(destinations):
+    hits = [hit for hit in destinations if hit["_source"]["region"] == REGION][:24]
+    hits += [hit for hit in destinations if hit["_source"]["region"] != REGION][:6]
+    return [{"_index": "gildong_1", "_id": hit["_id"], "_score": round(30. - i * 0.5, 2), "_source": hit["_source"]} for i, hit in enumerate(hits)]
+
+
+def record_answer(hits, rng):
+    start = datetime(2024, 5, 8)
+    input_data = "\n".join(f"- {hit['_source']['title'].lower()}: {hit['_source']['overview_summ']}" for hit in hits)
+    answer = FakeTextGenerator.answer(
+        question=f"{REGION} 1박 2일 일정 짜줘",
+        input_data=input_data,
+        travel_info={"travel_dates": {"start_date": start.strftime("%Y-%m-%d")}}
+    )
+    return split_tokens(answer, rng)
+
+
+def record_memory(hits, rng, turns=20):
+    memory = []
+    schedule = []
+    for turn_id in range(1, turns + 1):
+        picks = rng.sample(hits, 6)
+        titles = [hit["_source"]["title"].lower() for hit in picks]
+        links = {title: f"[{title}](https://gildong.site/travel/detail/{hit['_id']})" for title, hit in zip(titles, picks)}
+        ai_message = f"{', '.join(repr(title) for title in titles[:3])} 등을 추천드려요. " * 3
+        formatted = ai_message
+        for title, link in links.items():
+            formatted = formatted.replace(f"'{title}'", link)
+
+        itinerary = {}
+        if turn_id % 4 == 0:
+            schedule = [
+                {"title": title, "url": f"https://gildong.site/travel/detail/{hit['_id']}", "date": "1일차", "date_type": "day_label",
+                 "start_time": f"{10 + i}:00:00", "end_time": f"{11 + i}:00:00", "location": hit["_source"]["location"],
+                 "description": "여유롭게 둘러보세요.", "image_url": hit["_source"]["url"], "physical": True, "visual": False, "hearing": False}
+                for i, (title, hit) in enumerate(zip(titles, picks))
+            ]
+            itinerary = {"uuid": f"itinerary-{turn_id}", "title": f"{REGION} 맞춤 여행", "schedule": schedule, "itinerary_section": ""}
+
+        summary = f"사용자가 {REGION} 여행지 {turn_id}번째 추천을 요청했고 길동이가 {titles[0]} 등을 추천함"
+        memory.append({
+            "user_id": "bench-user",
+            "session_id": "bench-session",
+            "turn_id": turn_id,
+            "timestamp": (datetime(2024, 5, 1) + timedelta(minutes=turn_id)).strftime("%Y-%m-%dT%H:%M:%S"),
+            "travel_info": {"travel_region": REGION},
+            "user_message": f"{REGION} 여행지 더 추천해줘 ({turn_id})",
+            "ai_message": ai_message,
+            "formatted_ai_message": formatted,
+            "input_data": [hit["_id"] for hit in picks],
+            "itinerary": itinerary,
+            "summary": summary,
+            "summary_tokens": len(summary) // 2,
+            "link_index": [{"key": key, "link": link} for key, link in links.items()]
+        })
+    return memory
+
+
+def dump(name, data):
+    path = os.path.join(FIXTURE_DIR, name)
+    with open(path, "w", encoding="utf-8") as f:
+        if isinstance(data, str):
+            f.write(data)
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+    print(f"Recorded {path}")
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    hits = record_hits(build_destinations(seed=0))
+
+    dump("destination_hits.json", hits)
+    dump("generator_tokens.json", record_answer(hits, rng))
+    dump("convo_memory.json", record_memory(hits, rng))
+    dump("kma_short.txt", kma_forecast("11H20201", "20240501", "20240503"))
+    dump("kma_mid.txt", kma_forecast("11H20201", "202405010600", "20240510"))
@@ -1,7 +1,20 @@
-from core.logging_config import setup_logging, LoggingMiddleware
+from core.logging_config import setup_logging, setup_worker_logging, stop_logging, LoggingMiddleware
 from core.common_config import common_parameters
+from core.tracing import (
+    setup_tracing, 
+    restart_tracing, 
+    shutdown_tracing, 
+    start_span, 
+    new_span, 
+    inject, 
+    trace_elasticsearch, 
+    aiohttp_trace_config, 
+    TracingMiddleware
+)
+from core.startup import register_component, run_startup, start_background_startup, readiness
 from core.auth_utils import get_user_id, get_payload
 from core.instance_manager import InstanceManager
 from core.singleton_summarizer import SingletonSummarizer
-from core.singleton_retriever import SingletonRetriever
-from core.singleton_afetcher import SingletonAsyncFetcher
\ No newline at end of file
+from core.singleton_model_registry import SingletonModelRegistry
+from core.singleton_afetcher import SingletonAsyncFetcher
+from core.singleton_kakao_local import SingletonKakaoLocal
\ No newline at end of file
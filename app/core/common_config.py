@@ -18,6 +18,20 @@ common_parameters = {
     "memory_tokinizer_model": "cl100k_base", 
     "summary_max_tokens": 256, 
     "history_max_tokens": 1000,
+    "link_index_size": 512,
+    "memory_shared_across_workers": False,
+    "stt_enabled": True,
+    "startup_workers": 8,
+    "startup_retry_delay": 1.,
+    "startup_max_retry_delay": 60.,
+    "warmup_index_name": "weather_regioncode",
+    "warmup_vector_field": "vector",
+    "trace_export_path": "logs/traces.jsonl",
+    "trace_sample_ratio": 1.0,
+    "log_queue_size": 10000,
+    "log_debug_sample_rate": 0.01,
+    "log_max_field_chars": 1000,
+    "log_max_event_chars": 8000,
     "kakao_app_key" : os.getenv('KAKAO_APP_KEY'),
     "kakao_admin_key" : os.getenv('KAKAO_ADMIN_KEY'),
     "KAKAO_USER_INFO_URL" : "https://kapi.kakao.com/v2/user/me",
@@ -28,4 +42,7 @@ common_parameters = {
     "Weather_APP_KEY": os.getenv('Weather_APP_KEY'),
     "Kakao_APP_KEY": os.getenv('Kakao_APP_KEY'),
     "Kakao_local_APP_KEY": os.getenv('Kakao_local_APP_KEY'),
+    "kakao_local_url": "https://dapi.kakao.com/v2/local/search/",
+    "kakao_local_cache_size": 2048,
+    "kakao_local_cache_ttl": 21600,
 }
\ No newline at end of file
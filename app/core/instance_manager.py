@@ -16,5 +16,8 @@ class InstanceManager:
             memory_manager = self.memory.load(session_id, user_id)
             self.instances[session_id] = memory_manager
             self.user_statuses[session_id] = user_id
+        elif common_parameters.get("memory_shared_across_workers", False):
+            # Turns of one session may be served by different worker processes
+            self.instances[session_id].refresh()
         
         return self.instances[session_id]
\ No newline at end of file
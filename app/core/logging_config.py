@@ -1,19 +1,28 @@
 import os
 import sys
 import re
+import time
 import uuid
 import pytz
+import queue
+import atexit
+import random
+import reprlib
 import logging
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 
 import structlog
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from contextvars import ContextVar
+from prometheus_client import Counter
 
 
-request_id_var = ContextVar("request_id")  # declare a ContextVar object
+request_id_var = ContextVar("request_id", default=None)  # declare a ContextVar object
+
+logger = structlog.get_logger()
+
+LOG_MESSAGES_DROPPED = Counter("log_messages_dropped_total", "Log records dropped because the log queue was full.")
+LOG_DEBUG_SAMPLED_OUT = Counter("log_debug_sampled_out_total", "Debug payload logs skipped by sampling.")
 
 
 class KSTFormatter(logging.Formatter):
@@ -28,15 +37,164 @@ class KSTFormatter(logging.Formatter):
             return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())  # generate request_id
+class KSTProcessorFormatter(KSTFormatter, structlog.stdlib.ProcessorFormatter):
+    """Renders structlog events as JSON inside the KST log line format."""
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hand records to the log listener thread without ever blocking.
+
+    Records are enqueued as they are; rendering happens on the listener
+    thread. When the queue is full the record is dropped and counted.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+            LOG_MESSAGES_DROPPED.inc()
+
+
+class PayloadLimiter:
+    """
+    structlog processor capping the size of logged fields.
+
+    Strings are truncated, containers are copied down to `max_items` entries
+    per level and `max_depth` levels within a total of `max_chars`
+    characters, and other objects are replaced by a bounded repr. The event
+    that reaches the listener thread therefore holds only small immutable
+    values, whatever the caller passed in.
+    """
+
+    def __init__(self, max_string: int = 1000, max_items: int = 50, max_depth: int = 4, max_chars: int = 8000) -> None:
+        self.max_string = max_string
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.max_chars = max_chars
+
+        self.repr = reprlib.Repr()
+        self.repr.maxstring = self.repr.maxother = max_string
+        self.repr.maxlevel = 2
+        self.repr.maxdict = self.repr.maxlist = self.repr.maxtuple = self.repr.maxset = 10
+
+    def _truncate(self, text: str, budget: list) -> str:
+        limit = max(min(self.max_string, budget[0]), 0)
+        if len(text) > limit:
+            text = f"{text[:limit]}...(+{len(text) - limit} chars)"
+        budget[0] -= len(text)
+        return text
+
+    def _cap(self, value, depth: int, budget: list):
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, str):
+            return self._truncate(value, budget)
+        if budget[0] <= 0:
+            return "..."
+        if depth >= self.max_depth:
+            return self._truncate(self.repr.repr(value), budget)
+
+        if isinstance(value, dict):
+            capped = {}
+            for index, (key, item) in enumerate(value.items()):
+                if index >= self.max_items or budget[0] <= 0:
+                    capped["..."] = f"+{len(value) - index} keys"
+                    break
+                capped[str(key)] = self._cap(item, depth + 1, budget)
+            return capped
+        if isinstance(value, (list, tuple, set, frozenset)):
+            capped = []
+            for index, item in enumerate(value):
+                if index >= self.max_items or budget[0] <= 0:
+                    capped.append(f"...(+{len(value) - index} items)")
+                    break
+                capped.append(self._cap(item, depth + 1, budget))
+            return capped
+        return self._truncate(self.repr.repr(value), budget)
+
+    def __call__(self, _, __, event_dict):
+        budget = [self.max_chars]
+        # Scalars (event, level, request_id, ...) first so payloads cannot starve them
+        containers = []
+        for key, value in event_dict.items():
+            if value is None or isinstance(value, (bool, int, float, str)):
+                event_dict[key] = self._cap(value, 0, budget)
+            else:
+                containers.append(key)
+        for key in containers:
+            event_dict[key] = self._cap(event_dict[key], 0, budget)
+        return event_dict
+
+
+class DebugSampler:
+    """structlog processor keeping only a fraction of debug-level events."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+
+    def __call__(self, _, method_name, event_dict):
+        if method_name == "debug" and random.random() >= self.rate:
+            LOG_DEBUG_SAMPLED_OUT.inc()
+            raise structlog.DropEvent
+        return event_dict
+
+
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware that sets the request id and logs request timing.
+
+    The app runs in the caller's task and its messages are forwarded as they
+    are, so streaming responses are neither buffered nor copied. One log
+    line per request records the status, the time to the first body chunk
+    and the total duration (for streams, until the last chunk was sent).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Storing request_id in contextvars
-        request_id_var.set(request_id)
+        request_id_var.set(str(uuid.uuid4()))
+
+        start = time.perf_counter()
+        status = 500
+        first_byte = None
+        sent = 0
+
+        async def send_wrapper(message):
+            nonlocal status, first_byte, sent
+            if message["type"] == "http.response.body":
+                if first_byte is None:
+                    first_byte = time.perf_counter()
+                sent += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
 
-        response = await call_next(request)
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end = time.perf_counter()
+            logger.info(
+                "Request completed.",
+                method=scope["method"],
+                path=scope["path"],
+                status=status,
+                ttfb_ms=round((first_byte - start) * 1000, 1) if first_byte is not None else None,
+                duration_ms=round((end - start) * 1000, 1),
+                bytes=sent
+            )
 
 
 def add_request_id(_, __, event_dict):
@@ -45,18 +203,12 @@ def add_request_id(_, __, event_dict):
     return event_dict
 
 
-def setup_logging(log_dir):
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+_writer = {}  # log writer of this process, restarted in forked workers
 
-    calling_file = os.path.basename(sys.argv[0])
-    file_name = os.path.splitext(calling_file)[0]
-
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    formatter = KSTFormatter(log_format)
 
+def _file_handler(path, formatter):
     file_handler = TimedRotatingFileHandler(
-        os.path.join(log_dir, f'log-{file_name}.log'),
+        path,
         when="midnight",
         interval=1,
         backupCount=7
@@ -64,25 +216,121 @@ def setup_logging(log_dir):
     file_handler.suffix = "_%Y-%m-%d.log"
     file_handler.extMatch = re.compile(r"_\d{4}-\d{2}-\d{2}\.log$")
     file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
+    file_handler.setLevel(logging.DEBUG)
+    return file_handler
+
+
+def setup_worker_logging(worker_id: int):
+    """
+    Restart the log writer in a worker forked after `setup_logging`.
+
+    The listener thread of the parent does not survive the fork, and workers
+    rotating one shared file would delete each other's backups at midnight,
+    so every worker writes its own `log-<name>-<worker_id>.log` through a new
+    queue and listener.
+
+    Args:
+    - worker_id (int): Index of the worker, stable across its restarts.
+
+    """
+    if not _writer:
+        return
+    
+    file_handler = _file_handler(
+        os.path.join(_writer["log_dir"], f'log-{_writer["file_name"]}-{worker_id}.log'), 
+        _writer["formatter"]
+    )
+    queue_handler = _writer["queue_handler"]
+    queue_handler.queue = queue.Queue(maxsize=_writer["queue_size"])
+    listener = QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    listener.start()
+    _writer["listener"] = listener
+
+
+def stop_logging():
+    """
+    Write the queued records and stop the log writer thread.
+
+    Registered with atexit; workers exiting through `os._exit` call it themselves.
+    """
+    listener = _writer.pop("listener", None)
+    if listener is not None:
+        listener.stop()
+
+
+def setup_logging(
+    log_dir, 
+    queue_size: int = 10000, 
+    debug_sample_rate: float = 0.01, 
+    max_field_chars: int = 1000, 
+    max_event_chars: int = 8000
+):
+    """
+    Route all logs through a queue to a rotating file written by a background thread.
+
+    Args:
+    - log_dir (str): Directory of the log files.
+    - queue_size (int): Records buffered for the writer thread before new ones are dropped.
+    - debug_sample_rate (float): Fraction of debug-level payload logs of the app that are kept.
+    - max_field_chars (int): Maximum length of one string field.
+    - max_event_chars (int): Maximum total length of the fields of one event.
+
+    """
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    calling_file = os.path.basename(sys.argv[0])
+    file_name = os.path.splitext(calling_file)[0]
+
+    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    formatter = KSTProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(ensure_ascii=False),
+        foreign_pre_chain=[structlog.stdlib.add_log_level],
+        fmt=log_format
+    )
+
+    file_handler = _file_handler(os.path.join(log_dir, f'log-{file_name}.log'), formatter)
+    
+    # Rendering and file I/O run on the listener thread
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    listener = QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging)
+    
+    _writer.update(
+        log_dir=log_dir, 
+        file_name=file_name, 
+        formatter=formatter, 
+        queue_handler=queue_handler, 
+        queue_size=queue_size, 
+        listener=listener
+    )
     
     uvicorn_logger = logging.getLogger("uvicorn")
-    uvicorn_logger.addHandler(file_handler)
+    uvicorn_logger.addHandler(queue_handler)
     uvicorn_logger.setLevel(logging.INFO)
     
     uvicorn_access_logger = logging.getLogger("uvicorn.access")
-    uvicorn_access_logger.addHandler(file_handler)
+    uvicorn_access_logger.addHandler(queue_handler)
     uvicorn_access_logger.setLevel(logging.INFO)
 
     root_logger = logging.getLogger()
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(queue_handler)
     root_logger.setLevel(logging.INFO)
+    
+    # Debug payload logs of the app itself are sampled, third-party debug logs stay off
+    if debug_sample_rate > 0:
+        for name in ("core", "routers", "services"):
+            logging.getLogger(name).setLevel(logging.DEBUG)
 
     structlog.configure(
         processors=[
+            structlog.stdlib.filter_by_level,
+            DebugSampler(debug_sample_rate),
             add_request_id,  # custom processor to add request_id
             structlog.stdlib.add_log_level,
-            structlog.processors.JSONRenderer(ensure_ascii=False)
+            PayloadLimiter(max_string=max_field_chars, max_chars=max_event_chars),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
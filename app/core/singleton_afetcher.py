@@ -1,6 +1,7 @@
 from elasticsearch import AsyncElasticsearch
 
 from core.common_config import common_parameters
+from core.tracing import trace_elasticsearch
 
 
 class SingletonAsyncFetcher:
@@ -13,12 +14,12 @@ class SingletonAsyncFetcher:
         return cls._instance
 
     def initialize_fetcher(self):
-        self.fetcher = AsyncElasticsearch(
+        self.fetcher = trace_elasticsearch(AsyncElasticsearch(
             common_parameters.get("elasticsearch_host"), 
             timeout=5, 
             max_retries=2, 
             retry_on_timeout=True
-        )
+        ))
         
     def get_fetcher(self):
         return self.fetcher
\ No newline at end of file
@@ -0,0 +1,31 @@
+from core.common_config import common_parameters
+
+
+class SingletonKakaoLocal:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SingletonKakaoLocal, cls).__new__(cls)
+            cls._instance.initialize_clients()
+        return cls._instance
+
+    def initialize_clients(self):
+        self.clients = {}
+
+    def get_client(self, key_name: str = "Kakao_local_APP_KEY"):
+        # One pooled client per REST key; imported lazily to avoid a core <-> services cycle
+        if key_name not in self.clients:
+            from services.tools.kakao_local import KakaoLocalClient
+
+            self.clients[key_name] = KakaoLocalClient(
+                common_parameters.get(key_name),
+                base_url=common_parameters.get("kakao_local_url"),
+                cache_size=common_parameters.get("kakao_local_cache_size", 2048),
+                cache_ttl=common_parameters.get("kakao_local_cache_ttl", 6 * 3600)
+            )
+        return self.clients[key_name]
+
+    async def close(self):
+        for client in self.clients.values():
+            await client.close()
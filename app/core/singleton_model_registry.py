@@ -0,0 +1,127 @@
+import os
+import asyncio
+import threading
+from typing import Dict, Tuple
+
+from toolva import Toolva
+from toolva.utils import TokenLimiter
+
+from core.common_config import common_parameters
+
+
+class AsyncRetriever:
+    """Awaitable facade of the shared semantic search."""
+
+    def __init__(self, registry: "SingletonModelRegistry") -> None:
+        self.registry = registry
+
+    async def __call__(self, *args, **kwargs):
+        return await asyncio.wrap_future(self.registry.submit(*args, **kwargs))
+
+
+class SyncRetriever:
+    """Blocking facade of the shared semantic search, for synchronous tools."""
+
+    def __init__(self, registry: "SingletonModelRegistry") -> None:
+        self.registry = registry
+
+    def __call__(self, *args, **kwargs):
+        return self.registry.submit(*args, **kwargs).result()
+
+
+class SingletonModelRegistry:
+    """
+    Models shared by every agent and tool of the process.
+
+    The SBERT encoder is loaded once, inside a single `semantic_search`
+    instance. That instance runs on an event loop of its own thread, so its
+    Elasticsearch connections stay bound to one loop while both async callers
+    (the retrievers) and sync callers (the weather forecaster) use it through
+    the facades; encoding also stays off the API event loop.
+    Tokenizers are shared per (src, model) and token limiters per
+    (src, model, max_tokens).
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(SingletonModelRegistry, cls).__new__(cls)
+                cls._instance.initialize_registry()
+        return cls._instance
+
+    def initialize_registry(self):
+        self.tokenizers: Dict[Tuple[str, str], object] = {}
+        self.token_limiters: Dict[Tuple[str, str, int], TokenLimiter] = {}
+        self._models_lock = threading.Lock()
+
+        self._start_loop()
+
+        self.retriever = Toolva(
+            tool="semantic_search",
+            src="es",
+            model={
+                "host_n": common_parameters.get("elasticsearch_host"),
+                "http_auth": None,
+                "encoder_key": {
+                    "src": common_parameters.get("embedding_src"),
+                    "model": common_parameters.get("embedding_model")
+                }
+            },
+            async_mode=True
+        )
+        self.async_retriever = AsyncRetriever(self)
+        self.sync_retriever = SyncRetriever(self)
+
+    def _start_loop(self):
+        self._pid = os.getpid()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="model-registry", daemon=True)
+        self._thread.start()
+
+    def after_fork(self):
+        """Give a forked worker its own loop thread; the model weights stay shared copy-on-write."""
+        if self._pid == os.getpid():
+            return
+        self._models_lock = threading.Lock()
+        self._start_loop()
+
+    def submit(self, *args, **kwargs):
+        """
+        Run one semantic search on the registry loop.
+
+        Returns:
+        - concurrent.futures.Future: Future of the hits.
+
+        """
+        async def search():
+            return await self.retriever(*args, **kwargs)
+
+        return asyncio.run_coroutine_threadsafe(search(), self._loop)
+
+    def get_retriever(self, async_mode: bool = True):
+        return self.async_retriever if async_mode else self.sync_retriever
+
+    def get_tokenizer(self, src: str, model: str):
+        key = (src, model)
+        with self._models_lock:
+            if key not in self.tokenizers:
+                self.tokenizers[key] = Toolva(tool="tokenization", src=src, model=model)
+            return self.tokenizers[key]
+
+    def get_token_limiter(self, src: str, model: str, max_tokens: int) -> TokenLimiter:
+        key = (src, model, max_tokens)
+        tokenizer = self.get_tokenizer(src, model)
+        with self._models_lock:
+            if key not in self.token_limiters:
+                self.token_limiters[key] = TokenLimiter(tokenizer=tokenizer, max_tokens=max_tokens)
+            return self.token_limiters[key]
+
+    def warmup_retriever(self, index_n: str, vector_field: str):
+        # One search initializes the encoder session and the Elasticsearch connections
+        self.sync_retriever("warm-up", vector_field, index_n=index_n, knn=False, top_k=1)
+
+    def warmup_tokenizers(self):
+        for token_limiter in list(self.token_limiters.values()):
+            token_limiter.token_counter("warm-up")
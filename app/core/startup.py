@@ -0,0 +1,162 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class Component:
+
+    def __init__(self, name: str, func: Callable, after: Iterable[str] = (), preload: bool = False) -> None:
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.preload = preload
+        self.state = "pending"
+        self.seconds = None
+        self.error = None
+
+    def status(self) -> dict:
+        status = {"state": self.state, "seconds": self.seconds}
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+_components: Dict[str, Component] = {}
+_task: Optional[asyncio.Task] = None
+
+
+def register_component(name: str, func: Callable, after: Iterable[str] = (), preload: bool = False) -> None:
+    """
+    Register an initialization or warm-up step of the startup phase.
+
+    Args:
+    - name (str): Unique component name, reported by `/ready`.
+    - func (callable): Function run in a worker thread, or coroutine function run on the event loop.
+    - after (list): Components that must have succeeded before this one starts.
+    - preload (bool): Safe to run in the master process before workers are forked
+      (loads models or templates and opens no connections).
+
+    """
+    _components[name] = Component(name, func, after, preload)
+
+
+async def _run_component(component: Component, executor: ThreadPoolExecutor) -> None:
+    component.state = "running"
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(component.func):
+            await component.func()
+        else:
+            await asyncio.get_running_loop().run_in_executor(executor, component.func)
+        component.state = "ready"
+    except Exception as e:
+        component.state = "failed"
+        component.error = str(e)
+        logger.exception("Startup component failed", component=component.name)
+    component.seconds = round(time.perf_counter() - start, 3)
+    logger.info("Startup component finished", component=component.name, state=component.state, seconds=component.seconds)
+
+
+async def run_startup(max_workers: int = 8, preload_only: bool = False) -> bool:
+    """
+    Run the registered components concurrently, each once its dependencies are ready.
+
+    Components that are already ready (preloaded before a fork) are skipped;
+    failed ones and their dependents are run again.
+
+    Args:
+    - max_workers (int): Threads running the synchronous components.
+    - preload_only (bool): Run only the components registered with `preload`.
+
+    Returns:
+    - bool: Whether every component that was run succeeded.
+
+    """
+    start = time.perf_counter()
+    pending = {
+        name: component for name, component in _components.items()
+        if component.state != "ready" and (component.preload or not preload_only)
+    }
+    for component in pending.values():
+        component.state = "pending"
+        component.error = None
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup") as executor:
+        while pending or running:
+            for name, component in list(pending.items()):
+                states = [_components[dep].state if dep in _components else "failed" for dep in component.after]
+                if any(state == "failed" for state in states):
+                    component.state = "failed"
+                    component.error = "dependency failed: " + ", ".join(component.after)
+                    del pending[name]
+                elif all(state == "ready" for state in states):
+                    running[asyncio.ensure_future(_run_component(component, executor))] = name
+                    del pending[name]
+
+            if not running:
+                for component in pending.values():  # unknown or cyclic dependencies
+                    component.state = "failed"
+                    component.error = "unresolved dependencies: " + ", ".join(component.after)
+                break
+
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del running[task]
+
+    ready = all(component.state == "ready" for component in _components.values() if component.preload or not preload_only)
+    logger.info("Startup finished", ready=ready, preload_only=preload_only, seconds=round(time.perf_counter() - start, 3))
+    return ready
+
+
+async def _run_startup_with_retries(max_workers: int, retry_delay: float, max_retry_delay: float) -> None:
+    # A dependency that is down at boot (e.g. Elasticsearch) must not keep the worker unready for good
+    delay = retry_delay
+    while not await run_startup(max_workers):
+        failed = [name for name, component in _components.items() if component.state == "failed"]
+        logger.warning("Retrying failed startup components", components=failed, delay=delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_retry_delay)
+
+
+def start_background_startup(max_workers: int = 8, retry_delay: float = 1., max_retry_delay: float = 60.) -> asyncio.Task:
+    """
+    Start `run_startup` without blocking, so the server accepts liveness checks meanwhile.
+
+    Failed components are retried with exponential backoff until every component is ready.
+
+    Args:
+    - max_workers (int): Threads running the synchronous components.
+    - retry_delay (float): Seconds before the first retry.
+    - max_retry_delay (float): Longest wait between two retries.
+
+    Returns:
+    - asyncio.Task: The startup task.
+
+    """
+    global _task
+    if _task is None:
+        _task = asyncio.ensure_future(_run_startup_with_retries(max_workers, retry_delay, max_retry_delay))
+    return _task
+
+
+def readiness() -> tuple:
+    """
+    Readiness of the process.
+
+    Returns:
+    - tuple: Whether every component is ready, and the status of each component.
+
+    """
+    statuses = {name: component.status() for name, component in _components.items()}
+    return all(component.state == "ready" for component in _components.values()), statuses
+
+
+def is_ready(name: str) -> bool:
+    component = _components.get(name)
+    return component is not None and component.state == "ready"
@@ -0,0 +1,45 @@
+from argparse import ArgumentParser, RawTextHelpFormatter
+
+from toolva import Toolva
+from toolva.utils import TokenLimiter
+
+from services.data_manager import ElasticsearchDataManager
+from services.utils.prompt_snippet import enrich_source, fields_signature
+
+
+KEY_FIELD = "title"
+VALUE_FIELDS = [
+    "contenttypeid",
+    "overview_summ",
+    "physical_en",
+    "visual_en",
+    "hearing_en"
+]
+
+
+# Command line arguments parser
+def get_args():
+    parser = ArgumentParser(description='Precompute prompt snippets and token counts of travel destinations', formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-eh', '--es_host', metavar='es_host', default="http://211.169.248.182:12900/", help="Elasticsearch Host")
+    parser.add_argument('-i', '--index', metavar='index', default="gildong_1", help="Destination index")
+    parser.add_argument('-m', '--model', metavar='model', default="gpt-4", help="Generator model whose tokenizer counts the tokens")
+    parser.add_argument('-b', '--batch_size', metavar='batch_size', type=int, default=500, help="Documents per bulk request")
+    parser.add_argument('-a', '--all', action='store_true', help="Also rewrite documents that are already up to date")
+    return parser.parse_args()
+
+# Main Execution
+if __name__ == "__main__":
+    args = get_args()
+
+    tokenizer = Toolva(tool="tokenization", src="openai", model=args.model)
+    token_limiter = TokenLimiter(tokenizer=tokenizer, max_tokens=0)
+
+    db = ElasticsearchDataManager(args.es_host)
+    updated = db.enrich_prompt_snippets(
+        index_n=args.index,
+        enrich=lambda source: enrich_source(source, KEY_FIELD, VALUE_FIELDS, token_limiter.token_counter),
+        source_fields=[KEY_FIELD] + VALUE_FIELDS,
+        signature=None if args.all else fields_signature(VALUE_FIELDS),
+        batch_size=args.batch_size
+    )
+    print(f"Updated {updated} documents in {args.index}.")
\ No newline at end of file
@@ -1,10 +1,26 @@
+import os
 from argparse import ArgumentParser, RawTextHelpFormatter
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
 from starlette.middleware.cors import CORSMiddleware
 import uvicorn
 
-from core import setup_logging, LoggingMiddleware
+from core import (
+    setup_logging, 
+    setup_tracing, 
+    shutdown_tracing, 
+    common_parameters, 
+    LoggingMiddleware, 
+    TracingMiddleware, 
+    SingletonKakaoLocal, 
+    SingletonModelRegistry, 
+    SingletonAsyncFetcher, 
+    register_component, 
+    start_background_startup, 
+    readiness
+)
 from routers import (
     data_detail, 
     user_convo, 
@@ -14,13 +30,40 @@ from routers import (
     region_autocomplete, 
     main_chatbot, 
     member_chatbot, 
-    STT, 
     image_upload
 )
 
 
 # Setup Logging
-setup_logging("logs")
+setup_logging(
+    "logs", 
+    queue_size=common_parameters.get("log_queue_size", 10000), 
+    debug_sample_rate=common_parameters.get("log_debug_sample_rate", 0.01), 
+    max_field_chars=common_parameters.get("log_max_field_chars", 1000), 
+    max_event_chars=common_parameters.get("log_max_event_chars", 8000)
+)
+setup_tracing(
+    "gildong-api", 
+    common_parameters.get("trace_export_path", "logs/traces.jsonl"), 
+    common_parameters.get("trace_sample_ratio", 1.0)
+)
+
+# Startup components (the chatbot routers register their own)
+async def ping_elasticsearch():
+    if not await SingletonAsyncFetcher().get_fetcher().ping():
+        raise ConnectionError("Elasticsearch is not reachable")
+
+register_component("models", SingletonModelRegistry, preload=True)
+register_component("elasticsearch", ping_elasticsearch)
+register_component(
+    "retriever_warmup", 
+    lambda: SingletonModelRegistry().warmup_retriever(
+        common_parameters.get("warmup_index_name"), 
+        common_parameters.get("warmup_vector_field")
+    ), 
+    after=("models",)
+)
+register_component("tokenizer_warmup", lambda: SingletonModelRegistry().warmup_tokenizers(), after=("main_chatbot", "member_chatbot"))
 
 # Define FastAPI app
 app = FastAPI()
@@ -36,6 +79,7 @@ app.add_middleware(
 )
 
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(TracingMiddleware)
 
 # Include Routers
 app.include_router(data_detail.router)
@@ -47,12 +91,46 @@ app.include_router(user_login.router)
 app.include_router(region_autocomplete.router)
 app.include_router(refresh_token.router)
 app.include_router(image_upload.router)
-app.include_router(STT.router)
+
+# Optional routers are imported only when enabled
+if common_parameters.get("stt_enabled", True):
+    from routers.STT import STT
+    app.include_router(STT.router)
+
+@app.on_event("startup")
+async def start_components():
+    # Runs in the background: "/" answers right away, "/ready" once every component is warm
+    # Failed components are retried with backoff, so "/ready" recovers once e.g. Elasticsearch is up
+    start_background_startup(
+        common_parameters.get("startup_workers", 8),
+        retry_delay=common_parameters.get("startup_retry_delay", 1.),
+        max_retry_delay=common_parameters.get("startup_max_retry_delay", 60.)
+    )
+
+@app.on_event("shutdown")
+async def close_clients():
+    await SingletonKakaoLocal().close()
+    await user_itinerary.calendar_exporter.close()
+    shutdown_tracing()
 
 @app.get("/")
 def read_root():
     return {"message": "API is ready!"}
 
+@app.get("/ready")
+def ready():
+    is_ready, components = readiness()
+    return JSONResponse({"ready": is_ready, "components": components}, status_code=200 if is_ready else 503)
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus 형식의 단계별 지연 시간 및 토큰 지표
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:  # serve.py 워커들의 지표 합산
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
 # Command line arguments parser
 def get_args():
     parser = ArgumentParser(description='Analysis API for "Gildong ChatBot" project', formatter_class=RawTextHelpFormatter)
@@ -2,8 +2,6 @@ import os
 from fastapi import APIRouter, File, UploadFile
 from typing import List
 from pydantic import BaseModel
-from google.cloud import speech
-import librosa
 import tempfile
 
 router = APIRouter()
@@ -12,6 +10,9 @@ class FileUploadResponse(BaseModel):
     transcripts: List[str]
 
 def run_stt(audio_file_path):
+    # Imported on first use; the Speech client pulls in grpc and protobuf
+    from google.cloud import speech
+
     client = speech.SpeechClient()
 
     with open(audio_file_path, "rb") as audio_file:
@@ -53,7 +54,7 @@ async def upload_audios(in_files: List[UploadFile]):
             temp_audio_file.write(await file.read())
 
         # Perform STT on the uploaded audio
-        # sample_rate_hertz = librosa.get_samplerate(temp_audio_path)
+        # sample_rate_hertz = librosa.get_samplerate(temp_audio_path)  (import librosa here if re-enabled)
         result = run_stt(temp_audio_path)
 
         # 결과를 리스트에 추가
@@ -6,5 +6,4 @@ from routers.user_itinerary import user_itinerary
 from routers.user_login import user_login
 from routers.refresh_token import refresh_token
 from routers.region_autocomplete import region_autocomplete
-from routers.STT import STT
 from routers.image_upload import image_upload
\ No newline at end of file
@@ -2,11 +2,11 @@ import uuid
 from typing import Union, Optional, List
 
 import structlog
-from fastapi import APIRouter, Request, UploadFile
+from fastapi import APIRouter, HTTPException, Request, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
  
-from core import InstanceManager, get_user_id
+from core import InstanceManager, get_user_id, register_component
 from routers.main_chatbot.router_config import parameters
 from services import TIGAgentFactory
  
@@ -25,8 +25,19 @@ class Response(BaseModel):
     response: Union[str, dict]
 
 
-bot = TIGAgentFactory(parameters).load()
-instance = InstanceManager()
+bot = None
+instance = None
+
+
+def setup():
+    global bot, instance
+    bot = TIGAgentFactory(parameters).load()
+    instance = InstanceManager()
+
+
+# Built concurrently with the other components at startup, before the fork in serve.py
+register_component("main_chatbot", setup, after=("models",), preload=True)
+
 
 @router.post("/chatbot/main", response_class=StreamingResponse)
 async def main_chatbot(request: Request, message: Message):
@@ -36,8 +47,15 @@ async def main_chatbot(request: Request, message: Message):
     
     logger.info("Request received for main_chatbot", user_id=user_id, session_id=session_id, message=message)
     
+    if bot is None:
+        raise HTTPException(status_code=503, detail="The chatbot is warming up.")
+    
     memory = instance.get_instance(session_id, user_id)
     
     result = bot.run(memory, message.question, message.image_name)
     
-    return StreamingResponse(result, media_type='text/event-stream')
\ No newline at end of file
+    return StreamingResponse(
+        result, 
+        media_type='text/event-stream', 
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
\ No newline at end of file
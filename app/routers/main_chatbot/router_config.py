@@ -22,6 +22,15 @@ parameters = {
     "generator_top_p": 1.0,
     "generator_frequency_penalty": 0., 
     "generator_presence_penalty": 0., 
+    "generator_async_mode": False,
+    "generator_stream_workers": 16,
+    "generator_stream_queue_size": 64,
+    "generator_prompt_max_tokens": 3000,
+    "generator_prompt_min_candidates": 3,
+    "generator_prompt_candidate_tokens": 120,
+    "stream_format": "sse",
+    "stream_frame_max_bytes": 256,
+    "stream_frame_max_delay_ms": 50,
     "error_message": (
         "현재 시스템에 문제가 발생하여 정상적인 서비스 제공이 어렵습니다. "
         "잠시 후 다시 시도해 주시거나 다른 질문을 해주시기 바랍니다. "
@@ -2,11 +2,11 @@ import uuid
 from typing import Union, Optional
 
 import structlog
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
  
-from core import InstanceManager, get_user_id
+from core import InstanceManager, get_user_id, register_component
 from routers.member_chatbot.router_config import parameters
 from services import TIEAgentFactory
  
@@ -25,8 +25,19 @@ class Response(BaseModel):
     response: Union[str, dict]
 
 
-bot = TIEAgentFactory(parameters).load()
-instance = InstanceManager()
+bot = None
+instance = None
+
+
+def setup():
+    global bot, instance
+    bot = TIEAgentFactory(parameters).load()
+    instance = InstanceManager()
+
+
+# Built concurrently with the other components at startup, before the fork in serve.py
+register_component("member_chatbot", setup, after=("models",), preload=True)
+
 
 @router.post("/chatbot/member", response_class=StreamingResponse)
 async def member_chatbot(request: Request, message: Message):
@@ -36,8 +47,15 @@ async def member_chatbot(request: Request, message: Message):
     
     logger.info("Request received for member_chatbot", user_id=user_id, session_id=session_id, message=message)
     
+    if bot is None:
+        raise HTTPException(status_code=503, detail="The chatbot is warming up.")
+    
     memory = instance.get_instance(session_id, user_id)
     
     result = bot.run(memory, message.question, message.image_name)
     
-    return StreamingResponse(result, media_type='text/event-stream')
\ No newline at end of file
+    return StreamingResponse(
+        result, 
+        media_type='text/event-stream', 
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
\ No newline at end of file
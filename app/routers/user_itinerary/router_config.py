@@ -10,5 +10,17 @@ parameters = {
         "session_id",
         "itinerary",
         "timestamp"
-    ]
+    ],
+    "calendar_source_fields": [
+        "user_id",
+        "session_id",
+        "itinerary",
+        "calendar_events"
+    ],
+    "calendar_rate_per_sec": 5,
+    "calendar_burst": 5,
+    "calendar_max_concurrency": 4,
+    "calendar_max_retries": 3,
+    "calendar_save_retries": 3,
+    "calendar_save_retry_delay": 1.
 }
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, List
 
 import structlog
@@ -8,8 +9,7 @@ from jwt import ExpiredSignatureError, InvalidTokenError
 
 from core import get_user_id
 from routers.user_itinerary.router_config import parameters
-from services import ElasticsearchDataManager, KakaoManager
-from datetime import datetime, timedelta
+from services import ElasticsearchDataManager, KakaoCalendarExporter
 
 
 logger = structlog.get_logger()
@@ -24,6 +24,14 @@ class dictResponse(BaseModel):
 
 
 db = ElasticsearchDataManager(parameters['elasticsearch_host'])
+calendar_exporter = KakaoCalendarExporter(
+    parameters['KAKAO_CALENDAR_URL'],
+    rate=parameters['calendar_rate_per_sec'],
+    burst=parameters['calendar_burst'],
+    max_concurrency=parameters['calendar_max_concurrency'],
+    max_retries=parameters['calendar_max_retries']
+)
+pending_saves = set()  # background retries of calendar event records
 
 @router.get("/itinerary")
 async def load_itineraries(request: Request):
@@ -141,6 +149,28 @@ async def delete_itinerary(
         logger.error("An error occurred while deleting", error=str(e))
         return JSONResponse(content={"message": "An error occurred."}, status_code=500)
 
+def save_calendar_events(doc_id: str, calendar_events: List[Dict]) -> bool:
+    try:
+        db.update_confirmed_itinerary(
+            index_n=parameters['itinerary_index'], 
+            doc_id=doc_id, 
+            data={"calendar_events": calendar_events}
+        )
+        return True
+    except ValueError as e:
+        logger.error("Failed to record created calendar events", doc_id=doc_id, calendar_events=calendar_events, error=str(e))
+        return False
+
+async def retry_save_calendar_events(doc_id: str, calendar_events: List[Dict]):
+    # The events already exist in Kakao: keep trying to record them instead of failing the export
+    delay = parameters['calendar_save_retry_delay']
+    for _ in range(parameters['calendar_save_retries']):
+        await asyncio.sleep(delay)
+        if save_calendar_events(doc_id, calendar_events):
+            return
+        delay *= 2
+    logger.error("Gave up recording created calendar events", doc_id=doc_id, calendar_events=calendar_events)
+
 @router.get("/itinerary/calendar")
 async def send_kakao_calendar(
     token: str,
@@ -162,34 +192,32 @@ async def send_kakao_calendar(
             index_n=parameters['itinerary_index'], 
             doc_id=uuid, 
             query_field="itinerary.uuid.keyword", 
-            source_fields=parameters['source_fields']
+            source_fields=parameters['calendar_source_fields']
         )
 
         if itinerary_data["itinerary"]["schedule"][0]["date_type"] == "date":
-            for data in itinerary_data["itinerary"]["schedule"]:
-                start_datetime = datetime.fromisoformat(data["date"] + "T" + data["start_time"]) - timedelta(hours=9)
-                end_datetime = datetime.fromisoformat(data["date"] + "T" + data["end_time"]) - timedelta(hours=9)
-
-                if data["start_time"] >= data["end_time"]:
-                    end_datetime = datetime.fromisoformat(data["date"] + "T" + "23:50:00") - timedelta(hours=9)
-
-                data_json = {
-                    "title": itinerary_data["itinerary"]["title"],
-                    "time": {
-                        "start_at": start_datetime.isoformat(),
-                        "end_at": end_datetime.isoformat(),
-                    },
-                    "description": data["description"],
-                    "location": {
-                        "name": data["title"],
-                        "latitude": data["location"]["lat"],
-                        "longitude": data["location"]["lon"]
-                    },
-                    "reminders": [1440, 10080],  # 1 day before, 1 week before
-                    "color": "MINT"
-                }
-                KakaoManager(token).create_caledar(data_json)
-            return JSONResponse(content={"message": "successful"}, status_code=200)
+            events = calendar_exporter.build_events(itinerary_data["itinerary"])
+            created = {item["key"]: item["event_id"] for item in itinerary_data.get("calendar_events") or []}
+            
+            results = await calendar_exporter.export(token, uuid, events, created)
+            
+            # Remember created events so a retried export does not duplicate them
+            created_now = [{"key": result["key"], "event_id": result["event_id"]} for result in results if result["status"] == "created"]
+            if created_now:
+                calendar_events = (itinerary_data.get("calendar_events") or []) + created_now
+                if not save_calendar_events(itinerary_data["session_id"], calendar_events):
+                    task = asyncio.ensure_future(retry_save_calendar_events(itinerary_data["session_id"], calendar_events))
+                    pending_saves.add(task)
+                    task.add_done_callback(pending_saves.discard)
+            
+            failed = [result for result in results if result["status"] == "failed"]
+            if failed and len(failed) == len(results):
+                raise ValueError(failed[0]["error"])
+            
+            return JSONResponse(
+                content={"message": "partially failed" if failed else "successful", "results": results}, 
+                status_code=207 if failed else 200
+            )
         
         else:
             raise HTTPException(status_code=400, detail="Requires specific travel dates")
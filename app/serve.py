@@ -0,0 +1,191 @@
+"""
+Production entry point: preforked uvicorn workers sharing the loaded models.
+
+The master process binds the listening socket, imports the API and runs the
+startup components registered with `preload` (model registry, agent
+factories and their prompt templates), then forks the workers. Workers share
+those pages copy-on-write (`gc.freeze()` keeps the collector from touching
+them) and each restarts what does not survive a fork: the log writer, the
+span exporter and the model registry loop thread. Connection pools are only
+opened after the fork, by the remaining startup components and requests of
+each worker. The master restarts workers that exit and forwards SIGINT and
+SIGTERM to them for a graceful shutdown.
+
+Run from the `app` directory:
+
+    python serve.py --host 0.0.0.0 --port 5040 --workers 4
+"""
+import os
+import gc
+import sys
+import time
+import shutil
+import signal
+import socket
+import asyncio
+import tempfile
+import traceback
+from argparse import ArgumentParser, RawTextHelpFormatter
+
+
+def get_args():
+    parser = ArgumentParser(description='Preforked API server for "Gildong ChatBot" project', formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-fh', '--host', metavar='host', default="0.0.0.0", help="API Host")
+    parser.add_argument('-fp', '--port', metavar='port', type=int, default=5040, help="API Port")
+    parser.add_argument('-w', '--workers', metavar='n', type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)), help="Worker processes")
+    parser.add_argument('--backlog', type=int, default=2048, help="Listen backlog of the shared socket")
+    parser.add_argument('--metrics-dir', default=os.getenv("PROMETHEUS_MULTIPROC_DIR"), help="Directory of the per-worker Prometheus metric files")
+    return parser.parse_args()
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def prepare_metrics_dir(path) -> str:
+    # Must be set before prometheus_client is imported; stale files of a previous run are removed
+    path = path or tempfile.mkdtemp(prefix="gildong-metrics-")
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+def run_worker(app, sock: socket.socket, worker_id: int) -> None:
+    import uvicorn
+
+    from core import setup_worker_logging, restart_tracing, SingletonModelRegistry
+
+    setup_worker_logging(worker_id)
+    restart_tracing()
+    SingletonModelRegistry().after_fork()
+
+    # log_config=None: uvicorn must not replace the handlers set up by main
+    server = uvicorn.Server(uvicorn.Config(app, log_config=None))
+    server.run(sockets=[sock])
+
+
+def flush_worker() -> None:
+    try:
+        from core import stop_logging, shutdown_tracing
+
+        shutdown_tracing()
+        stop_logging()
+    except BaseException:
+        traceback.print_exc()
+
+
+class Arbiter:
+    """Fork, watch and restart the workers."""
+
+    def __init__(self, app, sock: socket.socket, workers: int) -> None:
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children = {}  # pid -> worker id
+        self.stopping = False
+
+        import structlog
+        self.logger = structlog.get_logger()
+
+    def spawn(self, worker_id: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                run_worker(self.app, self.sock, worker_id)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                # os._exit skips atexit: write the queued log records and spans first
+                flush_worker()
+                os._exit(code)
+
+        self.children[pid] = worker_id
+        self.logger.info("Worker started", worker_id=worker_id, pid=pid)
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        from prometheus_client import multiprocess
+
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        for worker_id in range(self.workers):
+            self.spawn(worker_id)
+
+        started = {worker_id: time.monotonic() for worker_id in range(self.workers)}
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            worker_id = self.children.pop(pid, None)
+            if worker_id is None:
+                continue
+
+            multiprocess.mark_process_dead(pid)
+
+            if self.stopping:
+                continue
+
+            self.logger.error("Worker exited", worker_id=worker_id, pid=pid, status=status)
+            if time.monotonic() - started[worker_id] < 1.:
+                time.sleep(1.)  # crashing at boot: do not spin
+            started[worker_id] = time.monotonic()
+            self.spawn(worker_id)
+
+        self.logger.info("All workers stopped")
+        return 0
+
+
+def main():
+    args = get_args()
+    workers = max(1, args.workers)
+
+    # One intra-op thread pool per worker instead of one per core in every worker
+    os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+    metrics_dir = prepare_metrics_dir(args.metrics_dir)
+    sock = bind_socket(args.host, args.port, args.backlog)
+
+    from core import common_parameters, run_startup
+
+    # A session's turns may be served by different workers
+    common_parameters["memory_shared_across_workers"] = workers > 1
+
+    from main import app
+
+    if not asyncio.run(run_startup(common_parameters.get("startup_workers", 8), preload_only=True)):
+        sys.exit("Preloading failed, see the logs")
+
+    # Keep the preloaded objects out of the collector so their pages stay shared after the fork
+    gc.collect()
+    gc.freeze()
+
+    try:
+        code = Arbiter(app, sock, workers).run()
+    finally:
+        sock.close()
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
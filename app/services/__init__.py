@@ -1,4 +1,5 @@
 from services.kakao_manager import KakaoManager
+from services.kakao_calendar_exporter import KakaoCalendarExporter
 from services.token_manager import TokenManager
 from services.data_manager import ElasticsearchDataManager
 from services.memory_manager import MemoryManagerFactory
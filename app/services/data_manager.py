@@ -1,10 +1,12 @@
-from typing import List
+from typing import Callable, List
 
 import structlog
 import pytz
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
 from elasticsearch.exceptions import NotFoundError, RequestError
 
+from core import trace_elasticsearch
+
 
 logger = structlog.get_logger()
 
@@ -12,7 +14,7 @@ logger = structlog.get_logger()
 class ElasticsearchDataManager:
 
     def __init__(self, host):
-        self.client = Elasticsearch(host, timeout=5, max_retries=2, retry_on_timeout=True)
+        self.client = trace_elasticsearch(Elasticsearch(host, timeout=5, max_retries=2, retry_on_timeout=True))
         self.korea_time = pytz.timezone('Asia/Seoul')
 
     def update_user_info(self, index_n: str, body: dict):
@@ -334,7 +336,7 @@ class ElasticsearchDataManager:
 
                 hits = response['hits']['hits']
 
-            logger.info("Confirmed itineraries fetched successfully in fetch_confirmed_itineraries.", index=index_n, user_id=user_id, page=page if page else "all", hits=hits)
+            logger.info("Confirmed itineraries fetched successfully in fetch_confirmed_itineraries.", index=index_n, user_id=user_id, page=page if page else "all", total=len(hits))
 
             result = []
             for hit in hits:
@@ -357,7 +359,7 @@ class ElasticsearchDataManager:
                     }
                 )
 
-            logger.info("Result of fetch_confirmed_itineraries.", index=index_n, user_id=user_id, page=page if page else "all", result=result)
+            logger.debug("Result of fetch_confirmed_itineraries.", index=index_n, user_id=user_id, page=page if page else "all", result=result)
             return result
 
         except Exception as e:
@@ -375,4 +377,54 @@ class ElasticsearchDataManager:
             return response
 
         except Exception as e:
-            raise ValueError(f"Error occurred while retrieving region from Elasticsearch: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Error occurred while retrieving region from Elasticsearch: {str(e)}")
+    
+    def enrich_prompt_snippets(
+        self, 
+        index_n: str, 
+        enrich: Callable[[dict], dict], 
+        source_fields: List[str], 
+        signature: str = None, 
+        batch_size: int = 500
+    ):
+        """
+        Store precomputed prompt fields on every document of an index.
+
+        Args:
+        - index_n (str): Destination index, e.g. gildong_1.
+        - enrich (callable): Builds the partial document from a document source.
+        - source_fields (list): Fields read to build the partial document.
+        - signature (str): Skip documents whose `prompt_fields` already equals this value.
+        - batch_size (int): Documents per scroll page and bulk request.
+
+        Returns:
+        - int: Number of updated documents.
+        
+        """
+        query = {"match_all": {}}
+        if signature is not None:
+            query = {"bool": {"must_not": [{"term": {"prompt_fields.keyword": signature}}]}}
+        
+        def actions():
+            for hit in helpers.scan(
+                self.client, 
+                index=index_n, 
+                query={"_source": source_fields, "query": query}, 
+                size=batch_size
+            ):
+                yield {
+                    "_op_type": "update",
+                    "_index": index_n,
+                    "_id": hit["_id"],
+                    "doc": enrich(hit["_source"])
+                }
+        
+        try:
+            updated, _ = helpers.bulk(self.client, actions(), chunk_size=batch_size, refresh=True)
+            
+            logger.info("Prompt snippets updated successfully in enrich_prompt_snippets.", index=index_n, updated=updated)
+            return updated
+        
+        except Exception as e:
+            logger.error("Error occurred in enrich_prompt_snippets.", index=index_n, error=str(e))
+            raise ValueError(f"Error occurred while enriching documents of {index_n} in Elasticsearch: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,226 @@
+import json
+import random
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import aiohttp
+import structlog
+
+from core.tracing import aiohttp_trace_config
+from services.utils.rate_limiter import TokenBucket
+
+
+logger = structlog.get_logger()
+
+
+class KakaoCalendarExporter:
+    """
+    Export itinerary schedules to Kakao Talk calendar concurrently.
+
+    Events are created over one shared aiohttp session, throttled by a token
+    bucket, retried on transient failures and keyed by a content hash so that
+    re-running an export skips the events that were already created.
+    """
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        calendar_url: str,
+        rate: float = 5.,
+        burst: int = 5,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10.
+    ) -> None:
+        """
+        Initialize the calendar exporter.
+
+        Args:
+        - calendar_url (str): Kakao calendar event creation endpoint.
+        - rate (float): Maximum event creations per second.
+        - burst (int): Maximum burst of event creations.
+        - max_concurrency (int): Maximum number of in-flight requests.
+        - max_retries (int): Retries for transient failures (timeouts, 429, 5xx).
+        - backoff (float): Base delay in seconds for exponential backoff.
+        - timeout (float): Total timeout in seconds for a single request.
+
+        """
+        self.calendar_url = calendar_url
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._session = None
+        self._inflight = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[aiohttp_trace_config()]
+            )
+        return self._session
+
+    @staticmethod
+    def build_events(itinerary: dict) -> List[dict]:
+        """
+        Convert a confirmed itinerary into Kakao calendar event payloads.
+
+        Args:
+        - itinerary (dict): Itinerary with a title and a dated schedule.
+
+        Returns:
+        - list: Event payloads in schedule order.
+
+        """
+        events = []
+        for data in itinerary["schedule"]:
+            start_datetime = datetime.fromisoformat(data["date"] + "T" + data["start_time"]) - timedelta(hours=9)
+            end_datetime = datetime.fromisoformat(data["date"] + "T" + data["end_time"]) - timedelta(hours=9)
+
+            if data["start_time"] >= data["end_time"]:
+                end_datetime = datetime.fromisoformat(data["date"] + "T" + "23:50:00") - timedelta(hours=9)
+
+            events.append({
+                "title": itinerary["title"],
+                "time": {
+                    "start_at": start_datetime.isoformat(),
+                    "end_at": end_datetime.isoformat(),
+                },
+                "description": data["description"],
+                "location": {
+                    "name": data["title"],
+                    "latitude": data["location"]["lat"],
+                    "longitude": data["location"]["lon"]
+                },
+                "reminders": [1440, 10080],  # 1 day before, 1 week before
+                "color": "MINT"
+            })
+        return events
+
+    @staticmethod
+    def event_key(itinerary_id: str, event: dict) -> str:
+        """Stable idempotency key for one event of an itinerary."""
+        payload = json.dumps(event, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(f"{itinerary_id}:{payload}".encode("utf-8")).hexdigest()
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (1 + random.random() * 0.2)
+
+    async def _create_event(self, token: str, event: dict) -> str:
+        session = self._get_session()
+        headers = {"Authorization": f"Bearer {token}"}
+        data = {"event": json.dumps(event)}
+
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                async with session.post(self.calendar_url, headers=headers, data=data) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        return result['event_id']
+
+                    body = await response.text()
+                    if response.status not in self.RETRYABLE_STATUS or attempt >= self.max_retries:
+                        raise ValueError(body)
+
+                    delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise ConnectionError(f"Kakao calendar request failed: {e!r}")
+                delay = self._retry_delay(attempt)
+
+            logger.info("Retrying Kakao calendar event creation.", attempt=attempt + 1, delay=delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _export_one(self, semaphore, token, index, key, event, created):
+        result = {"index": index, "key": key, "title": event["location"]["name"]}
+
+        if key in created:
+            result.update(status="skipped", event_id=created[key])
+            return result
+
+        # Concurrent exports of the same itinerary share one creation per event
+        future = self._inflight.get(key)
+        owner = future is None
+        if owner:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+
+        try:
+            if owner:
+                try:
+                    async with semaphore:
+                        event_id = await self._create_event(token, event)
+                    future.set_result(event_id)
+                except Exception as e:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved when nobody else is waiting
+                    raise
+                finally:
+                    if not future.done():
+                        future.cancel()
+                    self._inflight.pop(key, None)
+                result.update(status="created", event_id=event_id)
+            else:
+                result.update(status="skipped", event_id=await asyncio.shield(future))
+        except Exception as e:
+            logger.error("Failed to create Kakao calendar event.", index=index, error=str(e))
+            result.update(status="failed", error=str(e))
+
+        return result
+
+    async def export(
+        self,
+        token: str,
+        itinerary_id: str,
+        events: List[dict],
+        created: Optional[Dict[str, str]] = None
+    ) -> List[dict]:
+        """
+        Create the given events, skipping ones that were created before.
+
+        Args:
+        - token (str): Kakao user access token.
+        - itinerary_id (str): UUID of the itinerary, part of the idempotency key.
+        - events (list): Event payloads from `build_events`.
+        - created (dict): Previously created events as {event_key: event_id}.
+
+        Returns:
+        - list: Per-event results with index, key, title, status, event_id and error.
+
+        """
+        created = created or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        tasks = [
+            self._export_one(semaphore, token, index, self.event_key(itinerary_id, event), event, created)
+            for index, event in enumerate(events)
+        ]
+        results = await asyncio.gather(*tasks)
+
+        logger.info(
+            "Kakao calendar export finished.",
+            itinerary_id=itinerary_id,
+            created=sum(result["status"] == "created" for result in results),
+            skipped=sum(result["status"] == "skipped" for result in results),
+            failed=sum(result["status"] == "failed" for result in results)
+        )
+        return results
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
\ No newline at end of file
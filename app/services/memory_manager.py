@@ -3,10 +3,9 @@ from datetime import datetime
 from collections import defaultdict
 
 import structlog
-from toolva import Toolva
-from toolva.utils import TokenLimiter
 
 from services import ElasticsearchDataManager
+from services.utils.response_preprocessing import ResponsePreprocessor
 
 
 logger = structlog.get_logger()
@@ -20,12 +19,14 @@ class MemoryManagerFactory:
         self._setup()
 
     def _setup(self):
-        tokenizer = Toolva(
-            tool="tokenization", 
+        from core import SingletonModelRegistry
+        
+        # Shared by the InstanceManager of every chatbot router
+        self.token_limiter = SingletonModelRegistry().get_token_limiter(
             src=self.config.get("memory_tokinizer_src", "tiktoken"), 
-            model=self.config.get("memory_tokinizer_model", "cl100k_base")
+            model=self.config.get("memory_tokinizer_model", "cl100k_base"), 
+            max_tokens=self.config.get("history_max_tokens", 1000)
         )
-        self.token_limiter = TokenLimiter(tokenizer=tokenizer, max_tokens=self.config.get("history_max_tokens", 1000))
         
         self.db = ElasticsearchDataManager(self.config.get("elasticsearch_host"))
         
@@ -37,6 +38,8 @@ class MemoryManagerFactory:
             db=self.db,
             index_n=self.config.get("memory_index_name"),
             token_limiter=self.token_limiter,
+            link_index_size=self.config.get("link_index_size", 512),
+            persist_summaries=self.config.get("memory_shared_across_workers", False),
             session_id=session_id,
             user_id=user_id,
             user_info=self.db.fetch_userinfo(self.config.get("user_index_name"), user_id) if user_id else None
@@ -52,7 +55,9 @@ class MemoryManager:
         token_limiter, 
         session_id, 
         user_id, 
-        user_info=None
+        user_info=None,
+        link_index_size=512,
+        persist_summaries=False
     ):
         logger.info("Initializing MemoryManager", user_id=user_id, session_id=session_id)
         
@@ -62,6 +67,8 @@ class MemoryManager:
         self.session_id = session_id
         self.user_id = user_id
         self.user_info = user_info
+        self.link_index_size = link_index_size
+        self.persist_summaries = persist_summaries
         
         self.korea_time = pytz.timezone('Asia/Seoul')
         
@@ -97,6 +104,17 @@ class MemoryManager:
                     self.data['itinerary_schedule'] = data.get("itinerary").get("schedule", [])
                     break
             
+            # link_index 불러오기 (이전 버전의 대화는 마지막 답변과 일정으로 생성)
+            link_index = latest_turn.get("link_index")
+            if link_index is not None:
+                self.data['link_index'] = {item["key"]: item["link"] for item in link_index}
+            else:
+                self.data['link_index'] = ResponsePreprocessor.index_links(
+                    self.data['formatted_ai_message'], 
+                    self.data.get('itinerary_schedule'),
+                    max_size=self.link_index_size
+                )
+            
             # history 불러오기
             total_tokens = 0
             for data in reversed(memory[:-1]):  # 가장 최근 데이터를 제외한 memory를 역순으로 반복하여 최근 데이터부터 확인
@@ -112,9 +130,21 @@ class MemoryManager:
                     continue
         
         self.data["history"] = history
+        self.data.setdefault("link_index", {})
+    
+    def refresh(self):
+        """Reload the memory if another worker has indexed a newer turn of this session."""
+        last_turn = self.db.fetch_last_memory(
+            index_n=self.index_n, 
+            session_id=self.session_id, 
+            source_fields=["turn_id"]
+        )
+        if last_turn and last_turn.get("turn_id", 0) != self.turn:
+            logger.info("Reloading stale conversation memory", session_id=self.session_id, turn=self.turn, last_turn=last_turn.get("turn_id"))
+            self._load_data_from_db()
     
     def index_data(self, data, summary: str = None):
-        logger.info("Indexing data", user_id=self.user_id, turn=self.turn, data=data)
+        logger.debug("Indexing data", user_id=self.user_id, turn=self.turn, data=data)
         
         self.turn += 1
         
@@ -122,6 +152,15 @@ class MemoryManager:
         data["session_id"] = self.session_id
         data["turn_id"] = self.turn
         data["timestamp"] = datetime.now(self.korea_time).strftime('%Y-%m-%dT%H:%M:%S')
+        
+        # 제목 → 링크 색인을 누적하여 세션 상태와 함께 저장
+        link_index = ResponsePreprocessor.index_links(
+            data.get("formatted_ai_message"), 
+            data.get("itinerary", {}).get("schedule"),
+            self.data.get("link_index"),
+            self.link_index_size
+        )
+        data["link_index"] = [{"key": key, "link": link} for key, link in link_index.items()]
 
         # Index new data
         doc_id = f"{self.session_id}-{self.turn}"  # doc_id 생성
@@ -134,13 +173,14 @@ class MemoryManager:
         self.data["input_data"] = data.get("input_data")
         self.data["itinerary_section"] = data.get("itinerary", {}).get("itinerary_section", self.data.get("itinerary_section"))
         self.data["itinerary_schedule"] = data.get("itinerary", {}).get("schedule", self.data.get("itinerary_schedule"))
+        self.data["link_index"] = link_index
         
         # if summary
         if summary:
             self.data["history"].append(summary)
             logger.info("Appending summary to the history", summary=self.data["history"])
             
-            if self.user_info:
+            if self.user_info or self.persist_summaries:  # 여러 워커가 세션을 나눠 처리하면 비회원 요약도 저장
                 doc_id = f"{self.session_id}-{self.turn - 1}"  # doc_id 생성
                 self.db.update_summary(
                     index_n=self.index_n, 
@@ -5,4 +5,5 @@ from services.tools.travel_itinerary_generator import travelItineraryGenerator
 from services.tools.weather_forecaster import WeatherForecast
 from services.tools.google_blog_retriever import BlogSearcher
 from services.tools.kakao_map_searcher import locSearch
-from services.tools.kakao_address import find_full_address
\ No newline at end of file
+from services.tools.kakao_address import find_full_address, afind_full_address
+from services.tools.kakao_local import KakaoLocalClient
\ No newline at end of file
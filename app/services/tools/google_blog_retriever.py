@@ -1,5 +1,3 @@
-from langchain.utilities import GoogleSearchAPIWrapper
-
 import structlog
 
 from core import common_parameters
@@ -10,10 +8,19 @@ logger = structlog.get_logger()
 
 class BlogSearcher:
     def __init__(self):
-        self.search_api = GoogleSearchAPIWrapper(
-            google_api_key=common_parameters["GOOGLE_API_KEY"], 
-            google_cse_id=common_parameters["GOOGLE_CSE_ID"]
-        )
+        self._search_api = None
+
+    @property
+    def search_api(self):
+        # langchain is imported on the first search, not when the agent is built
+        if self._search_api is None:
+            from langchain.utilities import GoogleSearchAPIWrapper
+
+            self._search_api = GoogleSearchAPIWrapper(
+                google_api_key=common_parameters["GOOGLE_API_KEY"], 
+                google_cse_id=common_parameters["GOOGLE_CSE_ID"]
+            )
+        return self._search_api
 
     def _get_top5_results(self, query: str):
         """Retrieve top 5 results for a given query."""
@@ -4,7 +4,8 @@ import structlog
 import aiohttp
 from aiohttp.client_exceptions import ContentTypeError
 
-from services.utils import ResponsePreprocessor
+from core.tracing import aiohttp_trace_config
+from services.utils import format_hits
 
 
 logger = structlog.get_logger()
@@ -46,11 +47,11 @@ class imageRetrieval:
         logger.info("Starting the retrieval process.", input=kwargs)
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[aiohttp_trace_config()]) as session:
                 async with session.post(self.retriever, json={'file_name': image_name}) as response:
                     hits = await response.json()
                     
-            logger.info("Retrieved data", hits=hits)
+            logger.debug("Retrieved data", hits=hits)
         except ContentTypeError as ce:
             response_text = await response.text()
             logger.error(f"ContentTypeError in retrieving: {ce}. Response content: {response_text}")
@@ -59,59 +60,8 @@ class imageRetrieval:
             logger.error(f"Error in retrieving: {e}")
             raise e
         
-        # Formatting the hits for the output
-        output = {}
-        formatted_data_list = []
-        hyperlink = {}
-        for item in hits:
-            key = ResponsePreprocessor.normalize_text(item["_source"].get(key_field))
-            other_values = []
-            for field in value_fields:
-                value = item["_source"].get(field, "")
-                if isinstance(value, list):
-                    other_values.extend(value) 
-                else:
-                    other_values.append(str(value))
-
-            detail_url = f"https://gildong.site/travel/detail/{item['_id']}"
-            hyperlink[key] = f"[{key}]({detail_url})"
-            item['_source']["detail_url"] = detail_url
-            output[key] = {
-                "_id": item['_id'],
-                "_source": item['_source'],
-            }
-
-            other_fields = ", ".join(other_values)
-            formatted_data_list.append({key: other_fields})
-                
-        # Limiting tokens if necessary
-        if self.token_limiter:
-            try:
-                limited_formatted_data_list = self.token_limiter.cutoff(
-                    formatted_data_list, 
-                    "back"
-                )
-                logger.info(f"Number of items has been limited. Original: {len(formatted_data_list)}, Now: {len(limited_formatted_data_list)}")
-                
-                # Filter output based on limited_formatted_data_list
-                limited_keys = [list(item.keys())[0] for item in limited_formatted_data_list]  # extracting keys from limited_formatted_data_list
-                
-                # keeping only those keys in output which are present in limited_keys
-                filtered_output = {}
-                filtered_hyperlink = {}
-                for key in limited_keys:
-                    filtered_output[key] = output[key]
-                    filtered_hyperlink[key] = hyperlink[key]
-                
-                filtered_output["input_data"] = limited_formatted_data_list
-                filtered_output["hyperlink"] = filtered_hyperlink
-                output = filtered_output
-            
-            except ValueError as e:
-                logger.error(f"Error in TokenLimiter: {e}")
-                raise e
-        else:
-            output["input_data"] = formatted_data_list
-            output["hyperlink"] = hyperlink
+        # Formatting the hits for the output, limiting tokens if necessary
+        output = format_hits(hits, key_field, value_fields, self.token_limiter)
+        logger.info("Number of items has been limited.", original_len=len(hits), limited_len=len(output["input_data"]))
         
         return output
\ No newline at end of file
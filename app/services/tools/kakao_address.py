@@ -1,13 +1,51 @@
-from PyKakao import Local
+from typing import Optional
+
 from core import common_parameters
+from core.singleton_kakao_local import SingletonKakaoLocal
+
+
+_LOCAL = None
+
+
+def _get_local():
+    global _LOCAL
+    if _LOCAL is None:
+        from PyKakao import Local  # pulls in pandas; only needed on a cache miss
+
+        _LOCAL = Local(service_key=common_parameters["Kakao_local_APP_KEY"])
+    return _LOCAL
+
+
+def _address_name(documents) -> Optional[str]:
+    try:
+        return documents[0]['address']['address_name']
+    except (IndexError, KeyError, TypeError):
+        return None
+
 
 def find_full_address(name : str):
-    LOCAL = Local(service_key = common_parameters["Kakao_local_APP_KEY"])
+    # Shares the lookup cache with the async client so either path can warm it
+    cache = SingletonKakaoLocal().get_client("Kakao_local_APP_KEY").cache
+    cache_key = ("address.json", name, 1)
+    documents = cache.get(cache_key)
+    if documents is None:
+        try:
+            documents = _get_local().search_address(name, dataframe=False)['documents']
+        except Exception:
+            return None
+        cache.set(cache_key, documents)
+
+    return _address_name(documents)
+
+
+async def afind_full_address(name: str):
+    client = SingletonKakaoLocal().get_client("Kakao_local_APP_KEY")
     try:
-        address = LOCAL.search_address(name, dataframe=False)['documents'][0]['address']['address_name']
-        return address
-    except:
+        documents = await client.search_address(name)
+    except Exception:
         return None
 
+    return _address_name(documents)
+
 if __name__ == "__main__":
-    find_full_address("양주")
\ No newline at end of file
+    find_full_address("양주")
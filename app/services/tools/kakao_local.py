@@ -0,0 +1,96 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import aiohttp
+import structlog
+
+from core.tracing import aiohttp_trace_config
+from services.utils import TTLCache
+
+
+logger = structlog.get_logger()
+
+
+class KakaoLocalClient:
+    """
+    Async client for the Kakao Local search API.
+
+    One aiohttp session (and therefore one connection pool) is shared by every
+    caller, and results are plain dicts cached by (endpoint, query, size) since
+    the same place names are looked up over and over.
+    """
+
+    BASE_URL = "https://dapi.kakao.com/v2/local/search/"
+
+    def __init__(
+        self,
+        app_key: str,
+        base_url: Optional[str] = None,
+        timeout: float = 5.,
+        pool_size: int = 20,
+        cache_size: int = 2048,
+        cache_ttl: float = 6 * 3600.
+    ) -> None:
+        """
+        Initialize the Kakao Local client.
+
+        Args:
+        - app_key (str): Kakao REST API key.
+        - base_url (str): Override for the search API root (used by local stand-ins).
+        - timeout (float): Total timeout in seconds for a single request.
+        - pool_size (int): Maximum number of pooled connections.
+        - cache_size (int): Maximum number of cached lookups.
+        - cache_ttl (float): Seconds a cached lookup stays valid.
+
+        """
+        self.app_key = app_key
+        self.base_url = base_url or self.BASE_URL
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions are bound to the loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300),
+                headers={"Authorization": f"KakaoAK {self.app_key}"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[aiohttp_trace_config()]
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _search(self, endpoint: str, query: str, size: int) -> List[Dict]:
+        cache_key = (endpoint, query, size)
+        documents = self.cache.get(cache_key)
+        if documents is not None:
+            return documents
+
+        session = self._get_session()
+        async with session.get(self.base_url + endpoint, params={"query": query, "size": size}) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise ConnectionError(f"Kakao Local API Error {response.status}: {text}")
+            result = await response.json()
+
+        documents = result.get("documents", [])
+        self.cache.set(cache_key, documents)
+        return documents
+
+    async def search_address(self, query: str, size: int = 1) -> List[Dict]:
+        """Search addresses matching the query."""
+        return await self._search("address.json", query, size)
+
+    async def search_keyword(self, query: str, size: int = 5) -> List[Dict]:
+        """Search places matching the keyword."""
+        return await self._search("keyword.json", query, size)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
\ No newline at end of file
@@ -1,9 +1,19 @@
-from PyKakao import Local
 from core import common_parameters
+from core.singleton_kakao_local import SingletonKakaoLocal
 
 class locSearch:
     def __init__(self):
-        self.searcher = Local(service_key=common_parameters["Kakao_APP_KEY"])
+        self._searcher = None
+        self.client = SingletonKakaoLocal().get_client("Kakao_APP_KEY")
+
+    @property
+    def searcher(self):
+        # PyKakao (and pandas) is imported on the first uncached lookup
+        if self._searcher is None:
+            from PyKakao import Local
+
+            self._searcher = Local(service_key=common_parameters["Kakao_APP_KEY"])
+        return self._searcher
 
     def _construct_keyword(self):
         """Construct the keyword for searching."""
@@ -23,48 +33,54 @@ class locSearch:
 
         return keyword
 
+    def _check_search_type(self):
+        if self.search_type not in ["restaurant_info", "hotel_info", "tourism_info"]:
+            raise ValueError("Invalid search type")
+
     def get_results(self):
         """Fetch search results based on the type and category."""
         try:
             keyword = self._construct_keyword()
 
             # Determine search type
-            if self.search_type not in ["restaurant_info", "hotel_info", "tourism_info"]:
-                raise ValueError("Invalid search type")
+            self._check_search_type()
 
-            results = self.searcher.search_keyword(keyword, dataframe=True)
+            cache_key = ("keyword.json", keyword, 5)
+            results = self.client.cache.get(cache_key)
+            if results is None:
+                results = self.searcher.search_keyword(keyword, dataframe=False).get('documents', [])[:5]
+                self.client.cache.set(cache_key, results)
 
-            if results.empty:
+            if not results:
                 raise ValueError("No matching results found")
 
             return results
         except ValueError as e:
             raise Exception(f"Search error: {str(e)}")
 
-    def get_message(self, location, search_type, category=None):
-        """Extract and format the top results."""
+    def _set_query(self, location, search_type, category):
         # Update class attributes based on the provided arguments
         self.location = location
         self.search_type = search_type
         self.category = category
+
+    @staticmethod
+    def _format_results(results):
+        # Extract top 5 results
+        return [
+            {
+                "place_name": result["place_name"],
+                "category_name": result["category_name"].replace(" > ", ", "),
+                "url": result["place_url"]
+            }
+            for result in results[:5]
+        ]
+
+    def get_message(self, location, search_type, category=None):
+        """Extract and format the top results."""
+        self._set_query(location, search_type, category)
         
         try:
-            results = self.get_results()
-            message_list = []
-
-            # Extract top 5 results
-            for index, result in results.head(5).iterrows():
-                message = {
-                    "place_name": result["place_name"],
-                    "category_name": result["category_name"].replace(" > ", ", "),
-                    "url": result["place_url"]
-                }
-                message_list.append(message)
-
-            return message_list
+            return self._format_results(self.get_results())
         except Exception as e:
             return {'error': str(e)}
-        
-
-
-
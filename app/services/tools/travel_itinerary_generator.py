@@ -1,7 +1,7 @@
 import asyncio
 import structlog
 
-from services.utils import ResponsePreprocessor
+from services.utils import PROMPT_FIELDS, format_hits
 
 
 logger = structlog.get_logger()
@@ -29,7 +29,7 @@ class travelItineraryGenerator:
                 self.fetcher.search(
                     index=index_n, 
                     body={
-                        "_source": source_fields,
+                        "_source": source_fields + PROMPT_FIELDS if source_fields else source_fields,
                         "query": {
                             "term": {
                                 "_id": data_id
@@ -42,36 +42,9 @@ class travelItineraryGenerator:
             
             responses = await asyncio.gather(*tasks)
             
-            logger.info(f"Fetched responses: {responses}")
+            logger.debug("Fetched responses.", responses=responses)
             
             # Formatting the responses for the output
-            output = {}
-            formatted_data_list = []
-            hyperlink = {}
-            for response in responses:
-                item = response['hits']['hits'][0]
-                
-                key = ResponsePreprocessor.normalize_text(item["_source"].get(key_field))
-                other_values = []
-                for field in value_fields:
-                    value = item["_source"].get(field, "")
-                    if isinstance(value, list):
-                        other_values.extend(value) 
-                    else:
-                        other_values.append(str(value))
-
-                detail_url = f"https://gildong.site/travel/detail/{item['_id']}"
-                hyperlink[key] = f"[{key}]({detail_url})"
-                item['_source']["detail_url"] = detail_url
-                output[key] = {
-                    "_id": item['_id'],
-                    "_source": item['_source'],
-                }
-
-                other_fields = ", ".join(other_values)
-                formatted_data_list.append({key: other_fields})
-            
-            output['input_data'] = formatted_data_list
-            output["hyperlink"] = hyperlink
+            hits = [response['hits']['hits'][0] for response in responses]
             
-            return output
\ No newline at end of file
+            return format_hits(hits, key_field, value_fields)
\ No newline at end of file
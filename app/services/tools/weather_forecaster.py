@@ -1,11 +1,11 @@
 import requests
 import re
+import asyncio
 from datetime import datetime
 
-from toolva import Toolva
-
 from core import common_parameters
-from services.tools.kakao_address import find_full_address
+from core.singleton_model_registry import SingletonModelRegistry
+from services.tools.kakao_address import find_full_address, afind_full_address
 
 
 class APIHandler:
@@ -29,6 +29,7 @@ class WeatherForecast(APIHandler):
         "mid_temperature": "fct_afs_wc.php",
         "short": "fct_afs_dl.php"
     }
+    REGION_INDEX = "weather_regioncode"
 
     def __init__(self):
         self.authKey = common_parameters["Weather_APP_KEY"]
@@ -42,24 +43,14 @@ class WeatherForecast(APIHandler):
         }
 
     def _initialize_retriever(self):
-        return Toolva(
-            tool="semantic_search",
-            src="es",
-            model={
-                "host_n": self.host,
-                "http_auth": ("", ""),
-                "index_n": "weather_regioncode",
-                "encoder_key": {
-                    "src": "drive",
-                    "model": "sts.klue/roberta-large.klue-nli_klue-sts.bi-nli-sts"
-                }
-            },
-            async_mode=False
-        )
+        # Shares the SBERT encoder of the destination retriever
+        return SingletonModelRegistry().get_retriever(async_mode=False)
     
     def _convert_location_code(self, locCode):
-        kakao_loc_code = find_full_address(locCode)
-        hits = self.retriever(kakao_loc_code, "vector", knn=False, top_k=3, source_fields=["text", "REG_ID"])
+        return self._region_code(find_full_address(locCode))
+
+    def _region_code(self, kakao_loc_code):
+        hits = self.retriever(kakao_loc_code, "vector", index_n=self.REGION_INDEX, knn=False, top_k=3, source_fields=["text", "REG_ID"])
         print(hits[0]['_source']["REG_ID"])
         return hits[0]['_source']["REG_ID"]    
 
@@ -118,17 +109,33 @@ class WeatherForecast(APIHandler):
         
         return output
 
+    def _check_forecast_args(self, weather_dates, location):
+        start_date = (weather_dates or {}).get("start_date", None)
+        if not start_date or not location:
+            raise ValueError("Both startDate and locCode are required parameters.")
+
     def get_forecast(self, weather_dates=None, location=None):
+        self._check_forecast_args(weather_dates, location)
+        # Convert location code to match API requirements
+        loc_code_converted = self._convert_location_code(location)
+        return self._forecast(weather_dates, loc_code_converted)
+
+    async def aget_forecast(self, weather_dates=None, location=None):
+        """Forecast with the address lookup on the pooled Kakao client and the blocking calls off the event loop."""
+        self._check_forecast_args(weather_dates, location)
+        full_address = await afind_full_address(location)
+        loop = asyncio.get_running_loop()
+        # The region retriever and the KMA API are blocking
+        return await loop.run_in_executor(
+            None, lambda: self._forecast(weather_dates, self._region_code(full_address))
+        )
+
+    def _forecast(self, weather_dates, loc_code_converted):
         start_date = weather_dates.get("start_date", None)
         end_date = weather_dates.get("end_date", None)
         
-        if not start_date or not location:
-            raise ValueError("Both startDate and locCode are required parameters.")
-        
         current_date = datetime.now().strftime('%Y%m%d')
         date_difference = (datetime.strptime(start_date, '%Y%m%d') - datetime.strptime(current_date, '%Y%m%d')).days
-        # Convert location code to match API requirements
-        loc_code_converted = self._convert_location_code(location)   
 
         params = {
             'reg': loc_code_converted,
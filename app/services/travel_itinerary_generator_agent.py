@@ -1,4 +1,6 @@
 import json
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from typing import AsyncGenerator
 
 import structlog
@@ -8,11 +10,18 @@ from datetime import datetime
 from toolva import Toolva
 from toolva.utils import (
     PromptTemplate,
-    LogCapture,
-    TokenLimiter
+    LogCapture
 )
 
-from services.utils import ResponsePreprocessor
+from services.utils import (
+    ResponsePreprocessor,
+    HyperlinkLinker,
+    ItineraryStreamParser,
+    PromptBudgetAllocator,
+    StreamFramer,
+    TurnMetrics,
+    astream
+)
 from services.tools import (
     travel_info_collector,
     imageRetrieval,
@@ -56,30 +65,43 @@ class TIGAgentFactory:
             top_p=self.config.get("generator_top_p", 1.0),
             frequency_penalty=self.config.get("generator_frequency_penalty", 0.), 
             presence_penalty=self.config.get("generator_presence_penalty", 0.), 
-            stream=True
+            stream=True,
+            async_mode=self.config.get("generator_async_mode", False)
+        )
+        
+        # Threads reading the generator stream when the client has no async streaming
+        self.stream_executor = ThreadPoolExecutor(
+            max_workers=self.config.get("generator_stream_workers", 16),
+            thread_name_prefix="generator-stream"
         )
         
-        from core import SingletonSummarizer, SingletonRetriever, SingletonAsyncFetcher
+        from core import SingletonSummarizer, SingletonModelRegistry, SingletonAsyncFetcher
         
         # Itinerary Summarizer
         self.summarizer = SingletonSummarizer().get_summarizer()
         
-        tokenizer = Toolva(
-            tool="tokenization", 
+        # Encoder and tokenizers shared with the other agents and tools
+        models = SingletonModelRegistry()
+        token_limiter = models.get_token_limiter(
             src="openai", 
-            model=self.config["travel_destination_retriever"].get("generator_ai_model", "gpt-4")
-        )
-        token_limiter = TokenLimiter(
-            tokenizer=tokenizer, 
+            model=self.config["travel_destination_retriever"].get("generator_ai_model", "gpt-4"), 
             max_tokens=self.config["travel_destination_retriever"].get("max_tokens", 3000)
         )
         
+        # One token budget shared by the variable sections of the generator prompt
+        self.prompt_budget = PromptBudgetAllocator(
+            token_counter=token_limiter.token_counter,
+            max_tokens=self.config.get("generator_prompt_max_tokens", 3000),
+            min_candidates=self.config.get("generator_prompt_min_candidates", 3),
+            candidate_tokens=self.config.get("generator_prompt_candidate_tokens", 120)
+        )
+        
         # Itinerary image_retriever Tool
         image_retriever = self.config["image_retriever"].get("url")
         image_retrieval = imageRetrieval(image_retriever, token_limiter)
         
         # Itinerary travel_destination_retriever Tool
-        text_retriever = SingletonRetriever().get_retriever()
+        text_retriever = models.get_retriever()
         destination_retrieval = travelDestinationRetrieval(text_retriever, token_limiter)
         
         # Itinerary travel_itinerary_generator Tool
@@ -98,7 +120,16 @@ class TIGAgentFactory:
                 query=kwargs.get("query"),
                 vector_field=self.config["travel_destination_retriever"].get("vector_field"),
                 index_n=self.config["travel_destination_retriever"].get("index_name"),
-                top_k=kwargs.get("top_k"),
+                top_k=self.prompt_budget.cap_top_k(
+                    kwargs.get("top_k"),
+                    history=memory.get("history", []),
+                    fixed=[
+                        memory.get("user_info", {}),
+                        memory.get("travel_info", {}),
+                        memory.get("user_message", ""),
+                        memory.get("ai_message", "")
+                    ]
+                ),
                 exclude=kwargs.get("exclude"),
                 source_fields=self.config["travel_destination_retriever"].get("source_fields"),
                 key_field=self.config["travel_destination_retriever"].get("key_field"),
@@ -121,7 +152,15 @@ class TIGAgentFactory:
             self.summarizer,
             self.tools,
             self.config.get("first_message"),
-            self.config.get("error_message")
+            self.config.get("error_message"),
+            self.stream_executor,
+            self.config.get("generator_stream_queue_size", 64),
+            {
+                "stream_format": self.config.get("stream_format", "sse"),
+                "max_bytes": self.config.get("stream_frame_max_bytes", 256),
+                "max_delay_ms": self.config.get("stream_frame_max_delay_ms", 50)
+            },
+            self.prompt_budget
         )
 
 class TravelItineraryGeneratorAgent:
@@ -133,7 +172,11 @@ class TravelItineraryGeneratorAgent:
         summarizer,
         tools,
         first_message,
-        error_message
+        error_message,
+        stream_executor=None,
+        stream_queue_size=64,
+        stream_framing=None,
+        prompt_budget=None
     ) -> None:
         self.planner = planner
         self.generator = generator
@@ -141,6 +184,10 @@ class TravelItineraryGeneratorAgent:
         self.tools = tools
         self.first_message = first_message
         self.error_message = error_message
+        self.stream_executor = stream_executor
+        self.stream_queue_size = stream_queue_size
+        self.stream_framing = stream_framing or {}
+        self.prompt_budget = prompt_budget
         
         self.preprocessor = ResponsePreprocessor()
         self.korea_time = pytz.timezone('Asia/Seoul')
@@ -149,7 +196,9 @@ class TravelItineraryGeneratorAgent:
     async def run(self, memory_manager: bool, question: str, image=None) -> AsyncGenerator[str, None]:
         session_id = memory_manager.session_id
         memory = memory_manager.get_data()
-        logger.info(f"Conversation Memory: {memory}")
+        framer = StreamFramer(session_id, **self.stream_framing)
+        metrics = TurnMetrics("generator")
+        logger.debug("Conversation memory.", memory=memory)
         
         today_date = datetime.now(self.korea_time).strftime('%Y-%m-%dT%H:%M:%S')
         
@@ -158,25 +207,25 @@ class TravelItineraryGeneratorAgent:
         input_data = ""
         if image:
             tasks = [
-                self.tools['image_retriever'](image)
+                metrics.timed("image_retriever", self.tools['image_retriever'](image))
             ]
             
             if memory.get("user_message"):
                 tasks.append(
-                    self.summarizer.asummarize(
+                    metrics.timed("summarizer", self.summarizer.asummarize(
                         input=memory.get("user_message"), 
                         output=memory.get("ai_message")
-                    )
+                    ))
                 )
             
             outputs = await asyncio.gather(*tasks)
             
             hits = outputs[0]
             
-            input_data = "#### Image Analysis Results: User-uploaded image insights and related content.\n" + str(hits.get("input_data"))
+            input_data = "#### Image Analysis Results: User-uploaded image insights and related content.\n"
         else:
             tasks = [
-                self.planner(
+                metrics.timed("planner", self.planner(
                     today_date=today_date,
                     user_info=memory.get("user_info", {}),
                     travel_info=memory.get("travel_info", {}),
@@ -184,15 +233,15 @@ class TravelItineraryGeneratorAgent:
                     user=memory.get("user_message", ""),
                     assistant=memory.get("ai_message", self.first_message),
                     question=question
-                )
+                ))
             ]
             
             if memory.get("user_message"):
                 tasks.append(
-                    self.summarizer.asummarize(
+                    metrics.timed("summarizer", self.summarizer.asummarize(
                         input=memory.get("user_message"), 
                         output=memory.get("ai_message")
-                    )
+                    ))
                 )
             
             outputs = await asyncio.gather(*tasks)
@@ -204,34 +253,32 @@ class TravelItineraryGeneratorAgent:
                 logger.info(f"Generated Plan: {plan}")
             except json.JSONDecodeError as e:
                 logger.error(f"JSON decode error: {e}")
-                yield json.dumps({
-                    "message": self.error_message, 
-                    "session_id": session_id
-                }) + "\n"
+                frame = framer.push(self.error_message)
+                if frame:
+                    yield frame
             
             steps = plan.keys()
             for step in steps:
                 if step == "message":
                     message = plan[step]
                     formatted_message = message
-                    yield json.dumps({
-                        "message": message,
-                        "session_id": session_id
-                    }) + "\n"
+                    frame = framer.push(message)
+                    if frame:
+                        yield frame
                 
                 if step == "travel_info_collector":
-                    travel_info, message = self.tools[step](plan[step])
+                    with metrics.stage(step):
+                        travel_info, message = self.tools[step](plan[step])
                     formatted_message = message
                     memory["travel_info"] = travel_info
                     if message:
-                        yield json.dumps({
-                            "message": message,
-                            "session_id": session_id
-                        }) + "\n"
+                        frame = framer.push(message)
+                        if frame:
+                            yield frame
                 
                 if step == "travel_destination_retriever":
                     if type(plan[step]) == list:
-                        hits = await asyncio.gather(*(self.tools[step](memory, param) for param in plan[step]))
+                        hits = await asyncio.gather(*(metrics.timed(step, self.tools[step](memory, param)) for param in plan[step]))
                         
                         merged_hits = {k: v for hit in hits for k, v in hit.items() if k != 'input_data'}
 
@@ -245,101 +292,100 @@ class TravelItineraryGeneratorAgent:
 
                         hits = merged_hits
                     else:
-                        hits = await self.tools[step](memory, plan[step])
+                        hits = await metrics.timed(step, self.tools[step](memory, plan[step]))
                         
-                    input_data = "#### Spotlight Destinations: Personalized tourist spot recommendations.\n" + str(hits.get("input_data"))
+                    input_data = "#### Spotlight Destinations: Personalized tourist spot recommendations.\n"
                 
                 if step == "travel_itinerary_generator":
-                    previous_hits = await self.tools[step](memory, plan[step])
+                    previous_hits = await metrics.timed(step, self.tools[step](memory, plan[step]))
                     if previous_hits:
                         hits = previous_hits
-                        input_data = "#### Spotlight Destinations: Personalized tourist spot recommendations.\n" + str(hits.get("input_data"))
+                        input_data = "#### Spotlight Destinations: Personalized tourist spot recommendations.\n"
                 
         itinerary = {}
         if input_data or message is None:
-            logger.info(f"Relevant Candidates: {hits}")
+            logger.debug("Relevant candidates.", hits=hits)
             
-            messages = self.generator(
+            frame = framer.flush()  # 생성 대기 중 버퍼에 남은 메시지 전송
+            if frame:
+                yield frame
+            
+            # 후보지와 대화 기록을 하나의 토큰 예산 안에서 우선순위대로 배분
+            budget = self.prompt_budget.allocate(
+                hits,
+                history=memory.get("history", []),
+                fixed=[
+                    memory.get("user_info", {}),
+                    memory.get("travel_info", {}),
+                    memory.get("user_message", ""),
+                    memory.get("ai_message", self.first_message),
+                    question
+                ]
+            )
+            hits = budget["hits"]
+            if input_data:
+                input_data += budget["input_data"]
+            logger.info("Allocated generator prompt budget.", top_k=budget["top_k"], tokens=budget["tokens"])
+            
+            metrics.generation_started()
+            messages = astream(partial(
+                self.generator,
                 today_date=today_date,
                 user_info=memory.get("user_info", {}),
                 travel_info=memory.get("travel_info", {}),
-                history=', '.join(memory.get("history", [])),
+                history=budget["history"],
                 user=memory.get("user_message", ""),
                 assistant=memory.get("ai_message", self.first_message),
                 input_data=input_data,
                 question=question
+            ), maxsize=self.stream_queue_size, executor=self.stream_executor)
+            
+            linker = HyperlinkLinker(
+                hits.get('hyperlink', {}), 
+                resolver=lambda key: self.preprocessor.find_key_in_memory(key, memory)
             )
             
+            parser = ItineraryStreamParser(self.preprocessor, hits, memory)
+            
             message_list = []
             formatted_message_list = []
-            temp_key = []
-            collecting_key = False
-            for item in messages:
-                message_list.append(item)
+            async for item, frame in framer.paced(messages):
+                if frame:  # 생성이 멈춘 동안 기한이 지난 버퍼 전송
+                    yield frame
+                    continue
                 
-                if "'" in item:
-                    item_parts = item.split("'")  # 작은따옴표를 기준으로 item 분할
-                    
-                    for part in item_parts[:-1]:  # 마지막 부분을 제외하고 모든 부분 처리
-                        temp_key.append(part)
-                    
-                    item = item_parts[-1]  # item을 마지막 부분으로 설정
-                    
-                    if collecting_key:  # 만약 데이터 수집 중이라면
-                        collecting_key = False  # 데이터 수집 종료
-                        
-                        full_key = self.preprocessor.normalize_text(''.join(temp_key))  # 수집한 데이터를 하나의 문자열로 합치고 정규화
-                        
-                        try:
-                            full_data = hits['hyperlink'][full_key]  # 변환
-                        except KeyError:
-                            link_from_previous = self.preprocessor.find_key_in_memory(full_key, memory)
-                            if link_from_previous:
-                                full_data = link_from_previous
-                            else:
-                                full_data = full_key
-                        
-                        formatted_message_list.append(full_data)
-                        yield json.dumps({
-                            "message": full_data,
-                            "session_id": session_id
-                        }) + "\n"  # 후처리된 데이터 출력
-                        
-                        formatted_message_list.append(item)
-                        yield json.dumps({
-                            "message": item,
-                            "session_id": session_id
-                        }) + "\n"  # 끝나는 작은 따옴표가 포함된 chunk 출력
-                        
-                        temp_key = []  # 임시 데이터 초기화
-                    else:
-                        collecting_key = True  # 데이터 수집 시작
-                        formatted_message_list.append(item)
-                        yield json.dumps({
-                            "message": item,
-                            "session_id": session_id
-                        }) + "\n"  # 시작되는 작은 따옴표가 포함된 chunk 출력
+                metrics.token()
+                message_list.append(item)
                 
-                elif collecting_key:
-                    temp_key.append(item)  # 데이터 수집 중일 때 임시 리스트에 항목 추가
+                events = parser.feed(item)
+                if framer.sse:  # 완성된 일정 행을 바로 전송 (ndjson 클라이언트는 최종 일정만 받음)
+                    for event, payload in events:
+                        yield framer.event(event, payload)
                 
-                else:
-                    formatted_message_list.append(item)
-                    yield json.dumps({
-                        "message": item,
-                        "session_id": session_id
-                    }) + "\n"
+                chunk = linker.feed(item)  # 작은따옴표로 감싼 제목을 링크로 변환
+                if chunk:
+                    formatted_message_list.append(chunk)
+                    frame = framer.push(chunk)
+                    if frame:
+                        yield frame
+            
+            chunk = linker.flush()  # 닫히지 않은 따옴표 구간 출력
+            if chunk:
+                formatted_message_list.append(chunk)
+                frame = framer.push(chunk)
+                if frame:
+                    yield frame
             
             message = ''.join(message_list)
             formatted_message = ''.join(formatted_message_list)
+            metrics.generation_finished(prompt_tokens=budget["tokens"])
             
-            itinerary = self.preprocessor.preprocess_itinerary(message, hits, memory)
+            itinerary = parser.finalize()
             if itinerary:
-                yield json.dumps({
+                yield framer.event("itinerary", {
                     "message": "",
-                    "itinerary_id": itinerary['uuid'],
-                    "session_id": session_id
-                }) + "\n"
+                    "itinerary_id": itinerary['uuid']
+                })
         
         if hits:
             input_data = [hit['_id'] for hit in {k: v for k, v in hits.items() if k not in ['input_data', 'hyperlink']}.values()]
@@ -347,13 +393,16 @@ class TravelItineraryGeneratorAgent:
             if message is None:
                 message = self.error_message
                 formatted_message = message
-                yield json.dumps({
-                    "message": message, 
-                    "session_id": session_id
-                }) + "\n"
+                frame = framer.push(message)
+                if frame:
+                    yield frame
             
             input_data = []
         
+        frame = framer.flush()
+        if frame:
+            yield frame
+        
         new_turn_data = {
             "travel_info": memory.get("travel_info", {}),
             "user_message": question,
@@ -361,13 +410,16 @@ class TravelItineraryGeneratorAgent:
             "formatted_ai_message": formatted_message,
             "input_data": input_data,
             "itinerary": itinerary,
-            "image_name": image
+            "image_name": image,
+            "stats": metrics.summary()
         }
         
-        if len(outputs) > 1:
-            memory_manager.index_data(new_turn_data, outputs[1])
-        else:
-            memory_manager.index_data(new_turn_data)
-            
+        with metrics.stage("memory_persistence"):
+            if len(outputs) > 1:
+                memory_manager.index_data(new_turn_data, outputs[1])
+            else:
+                memory_manager.index_data(new_turn_data)
+        
+        logger.info("Turn stats.", stats=new_turn_data["stats"], memory_persistence_ms=round(metrics.stages["memory_persistence"] * 1000))
         logger.info(f"Completed processing for question")
-        yield json.dumps({"message": "completed", "session_id": session_id})
\ No newline at end of file
+        yield framer.close()
\ No newline at end of file
@@ -1 +1,9 @@
-from services.utils.response_preprocessing import ResponsePreprocessor
\ No newline at end of file
+from services.utils.response_preprocessing import ResponsePreprocessor
+from services.utils.ttl_cache import TTLCache
+from services.utils.stream_bridge import astream
+from services.utils.hyperlink_linker import HyperlinkLinker
+from services.utils.stream_framer import StreamFramer
+from services.utils.itinerary_stream_parser import ItineraryStreamParser
+from services.utils.prompt_snippet import PROMPT_FIELDS, enrich_source, format_hits, merge_hits
+from services.utils.prompt_budget import PromptBudgetAllocator
+from services.utils.turn_metrics import TurnMetrics
\ No newline at end of file
@@ -0,0 +1,179 @@
+from typing import Callable, Dict, Optional
+
+
+_END = None  # trie key holding the link of a complete title
+
+
+class HyperlinkLinker:
+    """
+    Streaming rewriter of quoted titles into markdown links.
+
+    The generator is told to wrap every candidate title in single quotes.
+    The linker is built once per turn from the candidate titles (a character
+    trie over the normalized titles) and consumes the token stream
+    incrementally: text outside quotes is passed through untouched, a quoted
+    span is walked through the trie while it streams in and, once the closing
+    quote arrives, is replaced by its link. A span that does not close within
+    `max_lookahead` characters is treated as a stray apostrophe and released
+    as-is, so unbalanced quotes never swallow the rest of the answer.
+    """
+
+    QUOTE = "'"
+
+    def __init__(
+        self,
+        hyperlinks: Dict[str, str],
+        resolver: Optional[Callable[[str], Optional[str]]] = None,
+        max_lookahead: Optional[int] = None
+    ) -> None:
+        """
+        Initialize the linker.
+
+        Args:
+        - hyperlinks (dict): Title to markdown link pairs for this turn.
+        - resolver (callable): Fallback lookup for normalized titles missing from `hyperlinks`.
+        - max_lookahead (int): Maximum characters buffered inside an open quote.
+          Defaults to the longest title plus some slack.
+
+        """
+        self.resolver = resolver
+        self.root = {}
+        longest = 0
+        for title, link in hyperlinks.items():
+            key = self.normalize(title)
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+            node[_END] = link
+            longest = max(longest, len(title))
+        self.max_lookahead = max_lookahead or max(32, longest + 16)
+
+        self.links = {}  # titles linked during this turn
+        self._collecting = False
+        self._buffer = []
+        self._buffered = 0
+        self._node = None
+        self._started = False
+        self._pending_space = ""
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.lower().strip()
+
+    def _open(self) -> None:
+        self._collecting = True
+        self._buffer = []
+        self._buffered = 0
+        self._node = self.root
+        self._started = False
+        self._pending_space = ""
+
+    def _walk(self, chunk: str) -> None:
+        # Mirrors normalize(): leading/trailing whitespace is ignored, case is folded
+        node = self._node
+        started = self._started
+        pending = self._pending_space
+        for char in chunk.lower():
+            if char.isspace():
+                if started:
+                    pending += char
+                continue
+            if pending:
+                for space in pending:
+                    node = node.get(space)
+                    if node is None:
+                        break
+                pending = ""
+                if node is None:
+                    break
+            started = True
+            node = node.get(char)
+            if node is None:
+                break
+        self._node = node
+        self._started = started
+        self._pending_space = pending
+
+    def _close(self) -> str:
+        self._collecting = False
+        raw = "".join(self._buffer)
+        key = self.normalize(raw)
+
+        link = self._node.get(_END) if self._node is not None else None
+        if link is None and self.resolver is not None:
+            link = self.resolver(key)
+
+        if link is None:
+            return key
+
+        self.links[key] = link
+        return link
+
+    def _release(self) -> str:
+        # Not a title after all: give back the quote and the buffered text
+        self._collecting = False
+        return self.QUOTE + "".join(self._buffer)
+
+    def feed(self, token: str) -> str:
+        """
+        Consume one streamed token.
+
+        Args:
+        - token (str): Next chunk of generated text.
+
+        Returns:
+        - str: Output text that is now final (empty while a quoted span is still open).
+
+        """
+        if not self._collecting and "'" not in token:
+            return token
+
+        output = []
+        position = 0
+        length = len(token)
+
+        while position < length:
+            if not self._collecting:
+                quote = token.find(self.QUOTE, position)
+                if quote < 0:
+                    output.append(token[position:])
+                    break
+                if quote > position:
+                    output.append(token[position:quote])
+                self._open()
+                position = quote + 1
+                continue
+
+            quote = token.find(self.QUOTE, position)
+            end = length if quote < 0 else quote
+            room = self.max_lookahead - self._buffered
+
+            if end - position > room:
+                # Lookahead exhausted before the span closed
+                chunk = token[position:position + room]
+                self._buffer.append(chunk)
+                self._buffered += len(chunk)
+                output.append(self._release())
+                position += room
+                continue
+
+            chunk = token[position:end]
+            if chunk:
+                self._buffer.append(chunk)
+                self._buffered += len(chunk)
+                if self._node is not None:
+                    self._walk(chunk)
+
+            if quote < 0:
+                break
+
+            output.append(self._close())
+            position = quote + 1
+
+        return "".join(output)
+
+    def flush(self) -> str:
+        """Release whatever is still buffered once the stream has ended."""
+        if self._collecting:
+            return self._release()
+        return ""
\ No newline at end of file
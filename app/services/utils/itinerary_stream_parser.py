@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime
+from typing import List, Tuple
+
+from services.utils.response_preprocessing import TABLE_RE, TITLE_RE
+
+
+class ItineraryStreamParser:
+    """
+    Incremental parser of the generated itinerary table.
+
+    Raw generator tokens are fed as they stream in and split into lines; every
+    completed line is matched once against the title and table patterns of
+    `ResponsePreprocessor`. As soon as the table shows up an `itinerary_start`
+    event is emitted, followed by one `itinerary_row` event per schedule row
+    (the header and separator rows are skipped, as in `_extract_schedule`).
+    `finalize()` then returns the same itinerary dict `preprocess_itinerary`
+    builds from the joined message, without scanning it again.
+    """
+
+    def __init__(self, preprocessor, metadata: dict, memory: dict) -> None:
+        """
+        Initialize the parser for one generation.
+
+        Args:
+        - preprocessor (ResponsePreprocessor): Builds schedule entries from table rows.
+        - metadata (dict): Candidate hits keyed by normalized title.
+        - memory (dict): Conversation memory holding the previous itinerary.
+
+        """
+        self.preprocessor = preprocessor
+        self.metadata = metadata
+        self.previous_schedule = memory.get("itinerary_schedule", []) or []
+        self.current_year = datetime.now().year
+
+        self.uuid = str(uuid.uuid4())
+        self.title = None
+        self.schedule = []
+
+        self._partial = []
+        self._lines = []
+        self._title_at = None  # (line index, column) of the first "**"
+        self._table_end = None  # index of the last table line
+        self._matches = 0
+
+    def _parse_line(self, line: str) -> List[Tuple[str, dict]]:
+        index = len(self._lines)
+        self._lines.append(line)
+
+        if self.title is None:
+            title_match = TITLE_RE.search(line)
+            if title_match:
+                self.title = title_match.group(1)
+                self._title_at = (index, title_match.start())
+
+        events = []
+        for match in TABLE_RE.findall(line):
+            self._table_end = index
+            self._matches += 1
+            if self._matches == 1:
+                events.append(("itinerary_start", {
+                    "message": "",
+                    "itinerary_id": self.uuid,
+                    "title": self.title or ""
+                }))
+            if self._matches <= 2:
+                continue  # 헤더 및 구분선
+
+            item = self.preprocessor._build_schedule_item(
+                match, self.metadata, self.previous_schedule, self.current_year
+            )
+            if item is None:
+                continue
+
+            self.schedule.append(item)
+            events.append(("itinerary_row", {
+                "message": "",
+                "itinerary_id": self.uuid,
+                "index": len(self.schedule) - 1,
+                "row": item
+            }))
+        return events
+
+    def feed(self, token: str) -> List[Tuple[str, dict]]:
+        """
+        Consume one raw generator token.
+
+        Args:
+        - token (str): Next chunk of generated text, before hyperlink rewriting.
+
+        Returns:
+        - list: (event, payload) pairs for the lines completed by this token.
+
+        """
+        if "\n" not in token:
+            self._partial.append(token)
+            return []
+
+        head, *lines = token.split("\n")
+        self._partial.append(head)
+        lines.insert(0, "".join(self._partial))
+        self._partial = [lines.pop()]
+
+        events = []
+        for line in lines:
+            events.extend(self._parse_line(line))
+        return events
+
+    def finalize(self) -> dict:
+        """
+        Parse the trailing line and build the itinerary.
+
+        Returns:
+        - dict: uuid, title, schedule and itinerary_section, or {} when no table was generated.
+
+        """
+        partial = "".join(self._partial)
+        self._partial = []
+        if partial:
+            self._parse_line(partial)
+
+        if not self._matches:
+            return {}
+
+        section = ""
+        if self._title_at is not None and self._title_at[0] <= self._table_end:
+            start, column = self._title_at
+            lines = self._lines[start:self._table_end + 1]
+            lines[0] = lines[0][column:]
+            section = "\n".join(lines) + "\n"
+
+        return {
+            "uuid": self.uuid,
+            "title": self.title or "",
+            "schedule": self.preprocessor._fill_end_times(self.schedule),
+            "itinerary_section": section
+        }
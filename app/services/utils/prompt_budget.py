@@ -0,0 +1,129 @@
+from typing import Callable, Iterable, List, Optional
+
+
+class PromptBudgetAllocator:
+    """
+    Share one token budget across the variable sections of the generator prompt.
+
+    Sections are served by priority: the best `min_candidates` candidates and
+    the fixed sections (user info, travel info, the last exchange, a previous
+    itinerary, other tool results) are always kept, then the history summaries
+    from the most recent one, then the remaining candidates in retrieval order.
+    The guaranteed candidates are reserved first, so large fixed sections
+    trim the history and the extra candidates, never the guaranteed ones.
+    Candidates are serialized one per line instead of as the repr of a list
+    of dicts.
+
+    The allocator is shared by every session of an agent, so it keeps no
+    state between calls: `cap_top_k` sizes a retrieval from the sections of
+    the same turn.
+    """
+
+    def __init__(
+        self,
+        token_counter: Callable[[str], int],
+        max_tokens: int = 3000,
+        min_candidates: int = 3,
+        candidate_tokens: int = 120
+    ) -> None:
+        """
+        Initialize the allocator.
+
+        Args:
+        - token_counter (callable): Token counter of the generator model tokenizer.
+        - max_tokens (int): Budget for all variable sections of one prompt.
+        - min_candidates (int): Candidates always kept, before the history is served.
+        - candidate_tokens (int): Expected tokens of one candidate, used to size retrievals.
+
+        """
+        self.token_counter = token_counter
+        self.max_tokens = max_tokens
+        self.min_candidates = min_candidates
+        self.candidate_tokens = max(1, candidate_tokens)
+
+    @staticmethod
+    def serialize(candidates: List[dict]) -> str:
+        """Serialize `{title: snippet}` candidates one per line."""
+        return "\n".join(f"- {key}: {value}" for item in candidates for key, value in item.items())
+
+    def _count(self, text) -> int:
+        return self.token_counter(text if isinstance(text, str) else str(text)) if text else 0
+
+    def cap_top_k(self, top_k: Optional[int], history: Iterable[str] = (), fixed: Iterable = ()) -> Optional[int]:
+        """
+        Limit a retriever `top_k` to the candidates the budget of this turn can hold.
+
+        Args:
+        - top_k (int): Requested number of hits, None for the retriever default.
+        - history (list): Conversation summaries of the turn.
+        - fixed (list): Sections of the turn that are always sent.
+
+        Returns:
+        - int: Effective number of hits to retrieve, never below `min_candidates`.
+
+        """
+        available = (
+            self.max_tokens
+            - self.min_candidates * self.candidate_tokens
+            - sum(self._count(section) for section in fixed)
+            - sum(self._count(summary) for summary in history)
+        )
+        capacity = self.min_candidates + max(0, available) // self.candidate_tokens
+        return capacity if top_k is None else min(top_k, capacity)
+
+    def allocate(self, hits: dict, history: Iterable[str] = (), fixed: Iterable = ()) -> dict:
+        """
+        Fit the candidates and the history into the budget.
+
+        The first `min_candidates` candidates are kept even when the fixed
+        sections alone exceed `max_tokens`.
+
+        Args:
+        - hits (dict): Retriever output with `input_data` and `hyperlink`.
+        - history (list): Conversation summaries, oldest first.
+        - fixed (list): Sections that are always sent, as strings or dicts.
+
+        Returns:
+        - dict: `hits` restricted to the kept candidates, the serialized
+          `input_data`, the joined `history`, the effective `top_k` and the
+          `tokens` used by candidates and history.
+
+        """
+        candidates = (hits or {}).get("input_data") or []
+        sizes = []
+        for item in candidates:
+            key = next(iter(item))
+            tokens = (hits.get(key) or {}).get("tokens")
+            sizes.append(tokens if tokens is not None else self._count(self.serialize([item])))
+
+        kept = min(self.min_candidates, len(candidates))
+        used = sum(sizes[:kept])
+        budget = self.max_tokens - sum(self._count(section) for section in fixed)
+
+        summaries = []
+        for summary in reversed(list(history)):
+            tokens = self._count(summary)
+            if used + tokens > budget:
+                break
+            summaries.insert(0, summary)
+            used += tokens
+
+        while kept < len(candidates) and used + sizes[kept] <= budget:
+            used += sizes[kept]
+            kept += 1
+
+        kept_candidates = candidates[:kept]
+        kept_hits = {}
+        if hits:
+            keys = [next(iter(item)) for item in kept_candidates]
+            kept_hits = {key: hits[key] for key in keys if key in hits}
+            kept_hits["input_data"] = kept_candidates
+            kept_hits["hyperlink"] = {key: hits.get("hyperlink", {})[key] for key in keys if key in hits.get("hyperlink", {})}
+
+        return {
+            "hits": kept_hits,
+            "input_data": self.serialize(kept_candidates),
+            "history": ", ".join(summaries),
+            "top_k": kept,
+            "tokens": used
+        }
@@ -0,0 +1,155 @@
+from itertools import zip_longest
+from typing import Callable, List
+
+from services.utils.response_preprocessing import ResponsePreprocessor
+
+
+# Fields written on each destination document by the enrichment step
+SNIPPET_FIELD = "prompt_snippet"
+TOKENS_FIELD = "prompt_tokens"
+SIGNATURE_FIELD = "prompt_fields"
+PROMPT_FIELDS = [SNIPPET_FIELD, TOKENS_FIELD, SIGNATURE_FIELD]
+
+
+def fields_signature(value_fields: List[str]) -> str:
+    return ",".join(value_fields)
+
+
+def build_snippet(source: dict, value_fields: List[str]) -> str:
+    """
+    Join the prompt fields of a destination into one line.
+
+    Args:
+    - source (dict): Document source.
+    - value_fields (list): Fields included in the prompt, in order.
+
+    Returns:
+    - str: Comma separated field values.
+
+    """
+    values = []
+    for field in value_fields:
+        value = source.get(field, "")
+        if isinstance(value, list):
+            values.extend(value)
+        else:
+            values.append(str(value))
+    return ", ".join(values)
+
+
+def enrich_source(source: dict, key_field: str, value_fields: List[str], token_counter: Callable[[str], int]) -> dict:
+    """
+    Precompute the prompt snippet of a destination and its token count.
+
+    Args:
+    - source (dict): Document source.
+    - key_field (str): Field used as the candidate title.
+    - value_fields (list): Fields included in the prompt, in order.
+    - token_counter (callable): Token counter of the generator model tokenizer.
+
+    Returns:
+    - dict: Partial document with the snippet, its token count and the field signature.
+
+    """
+    key = ResponsePreprocessor.normalize_text(source.get(key_field) or "")
+    snippet = build_snippet(source, value_fields)
+    return {
+        SNIPPET_FIELD: snippet,
+        TOKENS_FIELD: token_counter(str({key: snippet})),
+        SIGNATURE_FIELD: fields_signature(value_fields)
+    }
+
+
+def format_hits(hits: List[dict], key_field: str, value_fields: List[str], token_limiter=None) -> dict:
+    """
+    Format destination hits for the generator prompt.
+
+    Documents enriched by `enrich_source` with the same value fields reuse
+    their stored snippet and token count, so the token budget is a running
+    sum over integers; other documents are formatted and counted here.
+
+    Args:
+    - hits (list): Elasticsearch hits with `_id` and `_source`.
+    - key_field (str): Field used as the candidate title.
+    - value_fields (list): Fields included in the prompt, in order.
+    - token_limiter (TokenLimiter): Keeps the leading hits within `max_tokens` if given.
+
+    Returns:
+    - dict: Hits keyed by normalized title plus `input_data` and `hyperlink`.
+
+    """
+    signature = fields_signature(value_fields)
+    max_tokens = token_limiter.max_tokens if token_limiter else None
+
+    output = {}
+    formatted_data_list = []
+    hyperlink = {}
+    total_tokens = 0
+    for item in hits:
+        source = item["_source"]
+        key = ResponsePreprocessor.normalize_text(source.get(key_field))
+
+        snippet = source.pop(SNIPPET_FIELD, None)
+        tokens = source.pop(TOKENS_FIELD, None)
+        if source.pop(SIGNATURE_FIELD, None) != signature or snippet is None:
+            snippet, tokens = build_snippet(source, value_fields), None
+
+        data = {key: snippet}
+        if max_tokens is not None:
+            if tokens is None:
+                tokens = token_limiter.token_counter(str(data))
+            if total_tokens + tokens > max_tokens:
+                break
+            total_tokens += tokens
+
+        detail_url = f"https://gildong.site/travel/detail/{item['_id']}"
+        hyperlink[key] = f"[{key}]({detail_url})"
+        source["detail_url"] = detail_url
+        output[key] = {
+            "_id": item['_id'],
+            "_source": source,
+            "tokens": tokens,
+        }
+        formatted_data_list.append(data)
+
+    output["input_data"] = formatted_data_list
+    output["hyperlink"] = hyperlink
+    return output
+
+
+def merge_hits(*outputs: dict) -> dict:
+    """
+    Merge `format_hits` outputs into one candidate list.
+
+    Candidates are interleaved (first of each output, then second, ...) so a
+    token budget that keeps the leading candidates serves every list; a title
+    found in several outputs is kept once, from the first output holding it.
+
+    Args:
+    - outputs (dict): `format_hits` outputs, empty ones are skipped.
+
+    Returns:
+    - dict: Hits keyed by normalized title plus `input_data` and `hyperlink`.
+
+    """
+    merged = {}
+    input_data = []
+    hyperlink = {}
+    for item in (
+        item for items in zip_longest(*((output or {}).get("input_data") or [] for output in outputs))
+        for item in items if item is not None
+    ):
+        key = next(iter(item))
+        if key in merged:
+            continue
+        for output in outputs:
+            if output and key in output:
+                merged[key] = output[key]
+                if key in output.get("hyperlink", {}):
+                    hyperlink[key] = output["hyperlink"][key]
+                break
+        input_data.append(item)
+
+    merged["input_data"] = input_data
+    merged["hyperlink"] = hyperlink
+    return merged
@@ -0,0 +1,43 @@
+import time
+import asyncio
+
+
+class TokenBucket:
+    """
+    Async token bucket limiting how many calls per second reach an external API.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    `acquire()` consumes one token and sleeps until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        """
+        Initialize the token bucket.
+
+        Args:
+        - rate (float): Tokens added per second.
+        - capacity (int): Maximum burst size.
+
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # Waiters are served in order, so a burst cannot starve earlier callers
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
\ No newline at end of file
@@ -6,6 +6,11 @@ from datetime import datetime
 
 logger = structlog.get_logger()
 
+TABLE_RE = re.compile(r'\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*(.+?)\s*\|')
+TITLE_RE = re.compile(r'\*\*(.+?)\*\*')
+LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+SECTION_RE = re.compile(r'(\*\*.*\*\*.*\|.*\|\n(\|-*\|-*\|-*\|-*\|\n)+(\|.*\|\n)+)', re.DOTALL)
+
 
 class ResponsePreprocessor:
 
@@ -34,8 +39,44 @@ class ResponsePreprocessor:
         detail_url = f"https://gildong.site/travel/detail/{metadata[key]['_id']}"
         return f"[{key}]({detail_url})"
     
+    @staticmethod
+    def index_links(formatted_message, schedule=None, link_index=None, max_size=512):
+        """
+        Update a session link index with the links of one turn.
+
+        Args:
+        - formatted_message (str): Answer with titles already rewritten to markdown links.
+        - schedule (list): Itinerary schedule generated in the same turn.
+        - link_index (dict): Index of the previous turns, normalized title to markdown link.
+        - max_size (int): Maximum number of titles kept; the least recently linked are dropped.
+
+        Returns:
+        - dict: New link index.
+        
+        """
+        link_index = dict(link_index or {})
+        
+        entries = [
+            (item.get("title"), item.get("url")) for item in schedule or [] if item.get("title")
+        ]
+        entries.extend(LINK_RE.findall(formatted_message or ""))
+        
+        for title, url in entries:
+            key = ResponsePreprocessor.normalize_text(title)
+            link_index.pop(key, None)  # 최근 링크를 뒤로 이동
+            link_index[key] = f"[{key}]({url})"
+        
+        for key in list(link_index)[:max(len(link_index) - max_size, 0)]:
+            del link_index[key]
+        
+        return link_index
+    
     @staticmethod
     def find_key_in_memory(key, memory):
+        link_index = memory.get("link_index")
+        if link_index is not None:
+            return link_index.get(key)
+        
         formatted_ai_message = memory.get("formatted_ai_message", "")
         
         pattern = r'\[{}\]\(([^)]+)\)'.format(re.escape(key))
@@ -53,14 +94,84 @@ class ResponsePreprocessor:
         return None
     
     def _check_table_format(self, response):
-        table_re = re.compile(r'\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*(.+?)\s*\|')
-        return bool(table_re.search(response))
+        return bool(TABLE_RE.search(response))
 
     def _extract_title(self, response):
-        title_re = re.compile(r'\*\*(.+?)\*\*')
-        title_match = title_re.search(response)
+        title_match = TITLE_RE.search(response)
         return title_match.group(1) if title_match else ""
 
+    def _build_schedule_item(self, match, metadata, previous_schedule, current_year):
+        """
+        Convert one parsed table row into a schedule entry.
+
+        Args:
+        - match (tuple): (date, time, place, description) cells of the row.
+        - metadata (dict): Candidate hits keyed by normalized title.
+        - previous_schedule (list): Schedule of the previous itinerary in memory.
+        - current_year (int): Year applied to "%m/%d" dates.
+
+        Returns:
+        - dict: Schedule entry, or None if the row could not be parsed.
+        """
+        date, time, place, description = match
+
+        # 작은따옴표 제거
+        place = place.replace("'", "")
+
+        date_type = "date"
+        try:
+            date = datetime.strptime(date, "%m/%d")
+            date = date.replace(year=current_year)
+            date = date.strftime("%Y-%m-%d")
+        except ValueError:
+            date_type = "day_label"
+
+        try:
+            start_time, end_time = time.split('-')
+
+            metadata_place = next((item for item in previous_schedule if item.get("title") == place), {})
+
+            if metadata_place:
+                metadata_place["date"] = date
+                metadata_place["date_type"] = date_type
+                return metadata_place
+            
+            metadata_place = metadata.get(place, {"_source": {}})["_source"]
+
+            title = metadata_place.get("title", place)
+            url = metadata_place.get("detail_url", "")
+            location = metadata_place.get('location', {})
+            image_url = metadata_place.get('url', "")
+            physical = True if metadata_place.get('physical_en') else False
+            visual = True if metadata_place.get('visual_en') else False
+            hearing = True if metadata_place.get('hearing_en') else False
+
+            return {
+                "title": title,
+                "url": url,
+                "date": date,
+                "date_type": date_type,
+                "start_time": f"{start_time.strip()}:00",
+                "end_time": f"{end_time.strip()}:00" if end_time else None,  # set end_time as None if not present
+                "location": location,
+                "description": description.strip(),
+                "image_url": image_url,
+                "physical": physical,
+                "visual": visual,
+                "hearing": hearing
+            }
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+            return None
+
+    @staticmethod
+    def _fill_end_times(schedule):
+        # Second pass to update end_time
+        for i, event in enumerate(schedule[:-1]):  # skip the last event
+            if event["end_time"] is None:
+                event["end_time"] = schedule[i+1]["start_time"]
+        return schedule
+
     def _extract_schedule(self, response, metadata, memory):
         schedule = []
         previous_schedule = memory.get("itinerary_schedule", []) or []
@@ -68,67 +179,15 @@ class ResponsePreprocessor:
         # 현재 년도 가져오기
         current_year = datetime.now().year
         
-        table_re = re.compile(r'\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*(.+?)\s*\|')
-        matches = table_re.findall(response)
+        matches = TABLE_RE.findall(response)
         
         # First pass to extract schedule without updating end_time
         for match in matches[2:]:
-            date, time, place, description = match
-
-            # 작은따옴표 제거
-            place = place.replace("'", "")
-
-            date_type = "date"
-            try:
-                date = datetime.strptime(date, "%m/%d")
-                date = date.replace(year=current_year)
-                date = date.strftime("%Y-%m-%d")
-            except ValueError:
-                date_type = "day_label"
-
-            try:
-                start_time, end_time = time.split('-')
-
-                metadata_place = next((item for item in previous_schedule if item.get("title") == place), {})
-
-                if metadata_place:
-                    metadata_place["date"] = date
-                    metadata_place["date_type"] = date_type
-                    schedule.append(metadata_place)
-                else:
-                    metadata_place = metadata.get(place, {"_source": {}})["_source"]
-
-                    title = metadata_place.get("title", place)
-                    url = metadata_place.get("detail_url", "")
-                    location = metadata_place.get('location', {})
-                    image_url = metadata_place.get('url', "")
-                    physical = True if metadata_place.get('physical_en') else False
-                    visual = True if metadata_place.get('visual_en') else False
-                    hearing = True if metadata_place.get('hearing_en') else False
-
-                    schedule.append({
-                        "title": title,
-                        "url": url,
-                        "date": date,
-                        "date_type": date_type,
-                        "start_time": f"{start_time.strip()}:00",
-                        "end_time": f"{end_time.strip()}:00" if end_time else None,  # set end_time as None if not present
-                        "location": location,
-                        "description": description.strip(),
-                        "image_url": image_url,
-                        "physical": physical,
-                        "visual": visual,
-                        "hearing": hearing
-                    })
-            except Exception as e:
-                logger.error(f"An error occurred: {e}")
-
-        # Second pass to update end_time
-        for i, event in enumerate(schedule[:-1]):  # skip the last event
-            if event["end_time"] is None:
-                event["end_time"] = schedule[i+1]["start_time"]
+            item = self._build_schedule_item(match, metadata, previous_schedule, current_year)
+            if item is not None:
+                schedule.append(item)
 
-        return schedule
+        return self._fill_end_times(schedule)
     
     def _extract_itinerary_section(self, response):
         """
@@ -140,8 +199,7 @@ class ResponsePreprocessor:
         Returns:
         - str: Extracted section containing the title and table.
         """
-        pattern = r'(\*\*.*\*\*.*\|.*\|\n(\|-*\|-*\|-*\|-*\|\n)+(\|.*\|\n)+)'
-        match = re.search(pattern, response, re.DOTALL)
+        match = SECTION_RE.search(response)
         return match.group(1) if match else ""
     
     def preprocess_itinerary(self, message, metadata, memory):
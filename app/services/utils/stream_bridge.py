@@ -0,0 +1,90 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+
+_ITEM = object()
+_DONE = object()
+_ERROR = object()
+
+
+async def astream(factory: Callable[[], Iterable], maxsize: int = 64, executor: Optional[Executor] = None) -> AsyncIterator:
+    """
+    Iterate a blocking stream without blocking the event loop.
+
+    If `factory()` returns an async iterator (or a coroutine resolving to one,
+    as async LLM clients do) it is consumed directly on the loop.
+    Otherwise the call and every read of the stream run on a worker thread,
+    which hands items to the loop through a bounded queue, so a slow LLM
+    generation only occupies that thread and backpressure applies when the
+    consumer falls behind.
+
+    Args:
+    - factory (callable): Zero-argument callable that opens the stream, e.g. a
+      `functools.partial` of the text generator with its prompt variables.
+    - maxsize (int): Maximum number of items buffered between the thread and the loop.
+    - executor (Executor): Thread pool running the stream; the loop's default pool if None.
+
+    Yields:
+    - Items of the underlying stream, in order.
+
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(kind, value=None):
+        # Blocks the worker thread (not the loop) while the queue is full
+        future = asyncio.run_coroutine_threadsafe(queue.put((kind, value)), loop)
+        while not stopped.is_set():
+            try:
+                future.result(timeout=0.1)
+                return True
+            except FutureTimeoutError:
+                continue
+            except Exception:
+                return False
+        future.cancel()
+        return False
+
+    def produce():
+        stream = None
+        try:
+            stream = factory()
+            if hasattr(stream, "__aiter__") or inspect.iscoroutine(stream):
+                put(_DONE, stream)
+                return
+            for item in stream:
+                if not put(_ITEM, item):
+                    break
+            else:
+                put(_DONE)
+        except Exception as e:
+            put(_ERROR, e)
+        finally:
+            close = getattr(stream, "close", None)
+            if stopped.is_set() and callable(close):
+                close()
+
+    loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind is _ITEM:
+                yield value
+            elif kind is _DONE:
+                if inspect.iscoroutine(value):
+                    value = await value
+                if value is not None:
+                    async for item in value:
+                        yield item
+                break
+            else:
+                raise value
+    finally:
+        # Consumer finished or went away (e.g. client disconnect): release the producer
+        stopped.set()
+        while not queue.empty():
+            queue.get_nowait()
\ No newline at end of file
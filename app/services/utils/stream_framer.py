@@ -0,0 +1,167 @@
+import json
+import time
+import asyncio
+from typing import AsyncIterator, Optional, Tuple
+
+
+class StreamFramer:
+    """
+    Coalesce streamed chatbot text into `text/event-stream` frames.
+
+    The session metadata is sent once, in a `session` event in front of the
+    first frame. Message text is buffered and flushed as one `data:` frame
+    when the buffer reaches `max_bytes` or `max_delay_ms` has passed since its
+    first chunk; the very first chunk is sent right away so time-to-first-token
+    is not delayed.
+    Other events (`itinerary`, `completed`, ...) flush the buffer first so
+    ordering is preserved. Iterating the generation through `paced` also
+    flushes the buffer when `max_delay_ms` passes while the generation stalls.
+
+    With `stream_format="ndjson"` the legacy wire format (one JSON object per
+    line carrying the session_id) is produced instead, still coalesced; named
+    events carry their name in an `event` key.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        stream_format: str = "sse",
+        max_bytes: int = 256,
+        max_delay_ms: float = 50.
+    ) -> None:
+        """
+        Initialize the framer.
+
+        Args:
+        - session_id (str): Conversation session id.
+        - stream_format (str): "sse" or "ndjson".
+        - max_bytes (int): Buffered UTF-8 bytes that trigger a flush.
+        - max_delay_ms (float): Milliseconds after the first buffered chunk that trigger a flush.
+
+        """
+        if stream_format not in ("sse", "ndjson"):
+            raise ValueError(f"Unsupported stream format: {stream_format}")
+
+        self.session_id = session_id
+        self.sse = stream_format == "sse"
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay_ms / 1000.
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._buffered_at = None
+        self._sent_first = False
+        self._sent_session = False
+        self.frames = 0
+
+    def _dumps(self, payload: dict) -> str:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    def _frame(self, payload: dict, event: Optional[str] = None) -> str:
+        self.frames += 1
+        if not self.sse:
+            if event:
+                payload = {**payload, "event": event}
+            return json.dumps({**payload, "session_id": self.session_id}) + "\n"
+
+        frame = f"data: {self._dumps(payload)}\n\n"
+        if event:
+            frame = f"event: {event}\n{frame}"
+        if not self._sent_session:
+            self._sent_session = True
+            frame = f"event: session\ndata: {self._dumps({'session_id': self.session_id})}\n\n{frame}"
+        return frame
+
+    def push(self, text: str) -> str:
+        """
+        Buffer message text.
+
+        Args:
+        - text (str): Message chunk.
+
+        Returns:
+        - str: A frame when a flush threshold was reached, otherwise "".
+
+        """
+        if not text:
+            return ""
+
+        self._buffer.append(text)
+        self._buffered_bytes += len(text.encode("utf-8"))
+        now = time.monotonic()
+        if self._buffered_at is None:
+            self._buffered_at = now
+
+        if (
+            not self._sent_first
+            or self._buffered_bytes >= self.max_bytes
+            or now - self._buffered_at >= self.max_delay
+        ):
+            return self.flush()
+        return ""
+
+    def flush(self) -> str:
+        """Frame whatever text is buffered."""
+        if not self._buffer:
+            return ""
+
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._buffered_at = None
+        self._sent_first = True
+        return self._frame({"message": text})
+
+    def due_in(self) -> Optional[float]:
+        """Seconds until the buffered text is due, None when nothing is buffered."""
+        if self._buffered_at is None:
+            return None
+        return max(0., self._buffered_at + self.max_delay - time.monotonic())
+
+    async def paced(self, stream: AsyncIterator) -> AsyncIterator[Tuple[Optional[str], str]]:
+        """
+        Iterate a stream, flushing the buffer when it is due between two items.
+
+        Args:
+        - stream (AsyncIterator): Generated text chunks.
+
+        Yields:
+        - tuple: `(item, "")` for every item of the stream, or `(None, frame)`
+          when the buffered text was flushed while waiting for the next item.
+
+        """
+        iterator = stream.__aiter__()
+        pending = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                done, _ = await asyncio.wait({pending}, timeout=self.due_in())
+                if not done:
+                    frame = self.flush()
+                    if frame:
+                        yield None, frame
+                    continue
+
+                try:
+                    item = pending.result()
+                except StopAsyncIteration:
+                    pending = None
+                    return
+                pending = None
+                yield item, ""
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def event(self, event: str, payload: dict) -> str:
+        """Flush buffered text, then frame a named event."""
+        return self.flush() + self._frame(payload, event)
+
+    def close(self) -> str:
+        """Final frames; the `completed` event keeps the legacy payload."""
+        frames = self.flush()
+        if self.sse:
+            return frames + self._frame({"message": "completed"}, "completed")
+        self.frames += 1
+        return frames + json.dumps({"message": "completed", "session_id": self.session_id})
\ No newline at end of file
@@ -0,0 +1,160 @@
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Optional
+
+from prometheus_client import Histogram
+
+from core.tracing import new_span, start_span
+
+
+STAGE_SECONDS = Histogram(
+    "chat_agent_stage_seconds",
+    "Latency of chat agent stages (planner, summarizer, tools, generation, persistence).",
+    ["agent", "stage"],
+    buckets=(.025, .05, .1, .25, .5, 1., 2.5, 5., 10., 20., 40., 80.)
+)
+TTFT_SECONDS = Histogram(
+    "chat_generator_time_to_first_token_seconds",
+    "Time from opening the generator stream to its first token.",
+    ["agent"],
+    buckets=(.1, .25, .5, 1., 1.5, 2., 3., 5., 10., 20.)
+)
+INTER_TOKEN_SECONDS = Histogram(
+    "chat_generator_inter_token_seconds",
+    "Gap between consecutive generator tokens.",
+    ["agent"],
+    buckets=(.005, .01, .02, .03, .05, .075, .1, .2, .5, 1.)
+)
+TOKENS_PER_SECOND = Histogram(
+    "chat_generator_tokens_per_second",
+    "Generator throughput after the first token.",
+    ["agent"],
+    buckets=(5, 10, 15, 20, 30, 40, 60, 80, 120)
+)
+TOKENS = Histogram(
+    "chat_generator_tokens",
+    "Prompt and completion tokens per generation.",
+    ["agent", "kind"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 3072, 4096, 6144, 8192)
+)
+
+
+class TurnMetrics:
+    """
+    Stage timings and generation statistics of one chat turn.
+
+    Every measurement is observed into the Prometheus histograms above, kept
+    for `summary()`, the compact stats stored with the turn document, and
+    traced as a span named "<agent>.<stage>".
+    A stage measured several times in one turn (e.g. parallel retriever calls)
+    keeps its longest duration.
+    """
+
+    def __init__(self, agent: str) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+        - agent (str): Agent label, e.g. "generator" or "editor".
+
+        """
+        self.agent = agent
+        self.stages = {}
+
+        self._gap = INTER_TOKEN_SECONDS.labels(agent)
+        self._started_at = None
+        self._span = None
+        self._first_at = None
+        self._last_at = None
+        self._max_gap = 0.
+        self.chunks = 0
+        self.ttft = None
+        self.tokens_per_second = None
+        self.prompt_tokens = None
+        self.completion_tokens = None
+
+    def record(self, stage: str, seconds: float) -> None:
+        STAGE_SECONDS.labels(self.agent, stage).observe(seconds)
+        self.stages[stage] = max(seconds, self.stages.get(stage, 0.))
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Measure the enclosed block as `stage`."""
+        start = time.perf_counter()
+        try:
+            with start_span(f"{self.agent}.{stage}"):
+                yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    async def timed(self, stage: str, awaitable: Awaitable):
+        """Await `awaitable` and record its latency as `stage`."""
+        with self.stage(stage):
+            return await awaitable
+
+    def generation_started(self) -> None:
+        self._started_at = time.perf_counter()
+        self._span = new_span(f"{self.agent}.generator")
+
+    def token(self) -> None:
+        """Mark the arrival of one streamed generator token."""
+        now = time.perf_counter()
+        if self._first_at is None:
+            self._first_at = now
+            self.ttft = now - self._started_at
+            TTFT_SECONDS.labels(self.agent).observe(self.ttft)
+        else:
+            gap = now - self._last_at
+            self._gap.observe(gap)
+            if gap > self._max_gap:
+                self._max_gap = gap
+        self._last_at = now
+        self.chunks += 1
+
+    def generation_finished(self, prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None) -> None:
+        """
+        Close the generation stage.
+
+        Args:
+        - prompt_tokens (int): Tokens of the budgeted prompt sections.
+        - completion_tokens (int): Generated tokens; the number of streamed chunks if None.
+
+        """
+        if self._started_at is None:
+            return
+
+        self.record("generator", time.perf_counter() - self._started_at)
+
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = self.chunks if completion_tokens is None else completion_tokens
+        if prompt_tokens is not None:
+            TOKENS.labels(self.agent, "prompt").observe(prompt_tokens)
+        TOKENS.labels(self.agent, "completion").observe(self.completion_tokens)
+
+        if self._first_at is not None and self._last_at > self._first_at:
+            self.tokens_per_second = (self.chunks - 1) / (self._last_at - self._first_at)
+            TOKENS_PER_SECOND.labels(self.agent).observe(self.tokens_per_second)
+
+        self._span.attributes.update(self.summary())
+        self._span.attributes.pop("stages", None)
+        self._span.end()
+
+    def summary(self) -> dict:
+        """
+        Compact per-turn stats, durations in milliseconds.
+
+        Returns:
+        - dict: Stage latencies and generation statistics that were measured.
+
+        """
+        stats = {"stages": {stage: round(seconds * 1000) for stage, seconds in self.stages.items()}}
+        if self.ttft is not None:
+            stats["ttft_ms"] = round(self.ttft * 1000)
+            stats["max_gap_ms"] = round(self._max_gap * 1000)
+        if self.tokens_per_second is not None:
+            stats["tokens_per_sec"] = round(self.tokens_per_second, 1)
+        if self.prompt_tokens is not None:
+            stats["prompt_tokens"] = self.prompt_tokens
+        if self.completion_tokens is not None:
+            stats["completion_tokens"] = self.completion_tokens
+        return stats
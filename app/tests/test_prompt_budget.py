@@ -0,0 +1,89 @@
+"""
+Tests of the shared prompt budget of the itinerary agents.
+
+Run from the `app` directory:
+
+    pytest tests
+"""
+import core  # noqa: F401  (initialized before services, as in main.py)
+from services.utils.prompt_budget import PromptBudgetAllocator
+from services.utils.prompt_snippet import format_hits, merge_hits
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def make_hits(n: int, tokens: int = 10) -> dict:
+    hits = {"input_data": [], "hyperlink": {}}
+    for i in range(n):
+        title = f"place{i}"
+        hits[title] = {"tokens": tokens}
+        hits["input_data"].append({title: "snippet"})
+        hits["hyperlink"][title] = f"https://example.com/{i}"
+    return hits
+
+
+def make_documents(prefix: str, n: int) -> list:
+    return [
+        {"_id": f"{prefix}-{i}", "_source": {"title": f"{prefix} {i}", "overview_summ": "a quiet place by the sea"}}
+        for i in range(n)
+    ]
+
+
+def titles(hits: dict) -> list:
+    return [next(iter(item)) for item in hits["input_data"]]
+
+
+def test_min_candidates_kept_when_fixed_exceeds_budget():
+    allocator = PromptBudgetAllocator(count_words, max_tokens=50, min_candidates=3)
+    fixed = ["word " * 80]
+    budget = allocator.allocate(make_hits(5), history=["old summary", "new summary"], fixed=fixed)
+
+    assert budget["top_k"] == 3
+    assert [next(iter(item)) for item in budget["hits"]["input_data"]] == ["place0", "place1", "place2"]
+    assert budget["history"] == ""
+    assert allocator.cap_top_k(10, fixed=fixed) == 3
+
+
+def test_history_trimmed_before_guaranteed_candidates():
+    allocator = PromptBudgetAllocator(count_words, max_tokens=40, min_candidates=2)
+    budget = allocator.allocate(make_hits(4), history=["a b c d e f g h", "i j k l m n o p"], fixed=["x " * 15])
+
+    assert budget["top_k"] == 2
+    assert budget["history"] == ""
+    assert budget["tokens"] == 20
+
+
+def test_cap_top_k_depends_only_on_the_turn():
+    allocator = PromptBudgetAllocator(count_words, max_tokens=100, min_candidates=2, candidate_tokens=10)
+    allocator.allocate(make_hits(2), fixed=["word " * 95])
+
+    assert allocator.cap_top_k(None) == 10
+    assert allocator.cap_top_k(4) == 4
+    assert allocator.cap_top_k(None, history=["word " * 40]) == 6
+
+
+def test_retrieved_and_previous_answer_hits_share_the_budget():
+    # An edit plan running travel_destination_retriever and travel_itinerary_generator("previous_ai_answer")
+    retrieved = format_hits(make_documents("cafe", 6), "title", ["overview_summ"])
+    previous = format_hits(make_documents("planned", 6), "title", ["overview_summ"])
+    previous_titles, retrieved_titles = titles(previous), titles(retrieved)
+
+    allocator = PromptBudgetAllocator(count_words, max_tokens=60, min_candidates=3)
+    budget = allocator.allocate(merge_hits(previous, retrieved), history=["earlier turn"], fixed=["add some cafes"])
+    kept = titles(budget["hits"])
+
+    assert 3 <= budget["top_k"] < 12
+    assert set(kept) & set(previous_titles) and set(kept) & set(retrieved_titles)
+    assert all(budget["hits"][title]["_id"] for title in kept)
+    assert set(budget["hits"]["hyperlink"]) == set(kept)
+
+
+def test_merge_hits_keeps_a_shared_title_once():
+    previous = format_hits(make_documents("planned", 2), "title", ["overview_summ"])
+    retrieved = format_hits(make_documents("planned", 1) + make_documents("cafe", 1), "title", ["overview_summ"])
+    merged = merge_hits(previous, retrieved)
+
+    assert titles(merged) == ["planned 0", "planned 1", "cafe 0"]
+    assert set(merged["hyperlink"]) == {"planned 0", "planned 1", "cafe 0"}
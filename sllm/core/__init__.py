@@ -0,0 +1 @@
+from core.tracing import setup_tracing, shutdown_tracing, start_span, TracingMiddleware
\ No newline at end of file
@@ -0,0 +1,316 @@
+import os
+import json
+import time
+import queue
+import random
+import inspect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+current_span_var = ContextVar("current_span", default=None)
+
+TRACEPARENT = "traceparent"
+
+
+class Span:
+    """One timed operation of a trace, exported as an OTLP-style JSON object."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "sampled", "attributes", "start_ns", "end_ns", "status", "error")
+
+    def __init__(self, name, trace_id, parent_id=None, kind="internal", sampled=True, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.sampled = sampled
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "OK"
+        self.error = None
+
+    def set_attribute(self, key, value) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "ERROR"
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if self.sampled and _exporter is not None:
+                _exporter.export(self)
+
+    def to_dict(self, service_name: str) -> dict:
+        span = {
+            "resource": {"service.name": service_name},
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status}
+        }
+        if self.error:
+            span["status"]["message"] = self.error
+        return span
+
+
+class JsonlSpanExporter:
+    """
+    Append finished spans to a JSON lines file from a background thread.
+
+    Spans are queued on the caller's thread and written in batches, so the
+    event loop never waits on file I/O. When the queue is full new spans are
+    dropped and counted instead of blocking.
+    """
+
+    def __init__(self, path: str, service_name: str, max_queue_size: int = 10000, flush_interval: float = 1.) -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+        - path (str): Output file, one span per line.
+        - service_name (str): `service.name` resource attribute of every span.
+        - max_queue_size (int): Spans buffered before new ones are dropped.
+        - flush_interval (float): Seconds between writes.
+
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        lines = []
+        while True:
+            try:
+                span = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            lines.append(json.dumps(span.to_dict(self.service_name), ensure_ascii=False, default=str))
+        if lines:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self._drain()
+            except Exception as e:
+                logger.error("Failed to export spans.", error=str(e))
+
+    def shutdown(self) -> None:
+        self._drain()
+
+
+_exporter = None
+_sample_ratio = 1.
+
+
+def setup_tracing(service_name: str, path: str, sample_ratio: float = 1.) -> None:
+    """
+    Export spans of this process to a JSON lines file.
+
+    Args:
+    - service_name (str): Name of this service in the exported spans.
+    - path (str): Output file.
+    - sample_ratio (float): Fraction of new traces that are exported.
+
+    """
+    global _exporter, _sample_ratio
+    _exporter = JsonlSpanExporter(path, service_name)
+    _sample_ratio = sample_ratio
+
+
+def shutdown_tracing() -> None:
+    if _exporter is not None:
+        _exporter.shutdown()
+
+
+def extract(headers) -> Optional[tuple]:
+    """
+    Read a W3C `traceparent` header.
+
+    Args:
+    - headers (mapping): Incoming headers with lower-case names.
+
+    Returns:
+    - tuple: (trace_id, parent_span_id, sampled), or None if absent or invalid.
+
+    """
+    value = headers.get(TRACEPARENT)
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2], parts[3] == "01"
+
+
+def inject(headers: Optional[dict] = None) -> dict:
+    """Add the `traceparent` of the current span to outgoing headers."""
+    headers = {} if headers is None else headers
+    span = current_span_var.get()
+    if span is not None:
+        headers[TRACEPARENT] = span.traceparent
+    return headers
+
+
+def new_span(name: str, kind: str = "internal", parent: Optional[tuple] = None, **attributes) -> Span:
+    """
+    Create a span without making it current; the caller ends it.
+
+    Args:
+    - name (str): Operation name.
+    - kind (str): "server", "client" or "internal".
+    - parent (tuple): Remote parent from `extract`; the current span if None.
+
+    Returns:
+    - Span: The started span.
+
+    """
+    if parent is None:
+        current = current_span_var.get()
+        if current is not None:
+            parent = (current.trace_id, current.span_id, current.sampled)
+
+    if parent is None:
+        return Span(name, "%032x" % random.getrandbits(128), kind=kind, sampled=random.random() < _sample_ratio, attributes=attributes)
+    trace_id, parent_id, sampled = parent
+    return Span(name, trace_id, parent_id, kind=kind, sampled=sampled, attributes=attributes)
+
+
+@contextmanager
+def start_span(name: str, kind: str = "internal", parent: Optional[tuple] = None, **attributes):
+    """Run the enclosed block in a new current span."""
+    span = new_span(name, kind, parent, **attributes)
+    token = current_span_var.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        current_span_var.reset(token)
+        span.end()
+
+
+def trace_elasticsearch(client):
+    """
+    Record a client span for every request of an Elasticsearch client.
+
+    Wraps `client.transport.perform_request` of the sync or async client in
+    place and returns the client.
+    """
+    transport = client.transport
+    perform_request = transport.perform_request
+
+    if inspect.iscoroutinefunction(perform_request):
+        async def traced(method, url, *args, **kwargs):
+            with start_span(f"elasticsearch {method}", "client", **{"db.system": "elasticsearch", "http.target": url}):
+                return await perform_request(method, url, *args, **kwargs)
+    else:
+        def traced(method, url, *args, **kwargs):
+            with start_span(f"elasticsearch {method}", "client", **{"db.system": "elasticsearch", "http.target": url}):
+                return perform_request(method, url, *args, **kwargs)
+
+    transport.perform_request = traced
+    return client
+
+
+def aiohttp_trace_config():
+    """
+    aiohttp `TraceConfig` recording a client span per request and
+    propagating the trace context in the `traceparent` header.
+    """
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        span = new_span(f"HTTP {params.method}", "client", **{"http.method": params.method, "http.url": str(params.url)})
+        params.headers[TRACEPARENT] = span.traceparent
+        context.span = span
+
+    async def on_request_end(session, context, params):
+        span = getattr(context, "span", None)
+        if span is not None:
+            span.set_attribute("http.status_code", params.response.status)
+            if params.response.status >= 500:
+                span.status = "ERROR"
+            span.end()
+
+    async def on_request_exception(session, context, params):
+        span = getattr(context, "span", None)
+        if span is not None:
+            span.record_error(params.exception)
+            span.end()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span per HTTP request.
+
+    A `traceparent` header sent by the caller makes the span part of the
+    caller's trace; the response carries the trace context back.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        with start_span(
+            f"{scope['method']} {scope['path']}",
+            "server",
+            parent=extract(headers),
+            **{"http.method": scope["method"], "http.target": scope["path"]}
+        ) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "ERROR"
+                    message["headers"] = list(message.get("headers", [])) + [(TRACEPARENT.encode(), span.traceparent.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
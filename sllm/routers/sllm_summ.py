@@ -3,6 +3,8 @@ import structlog
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from core import start_span
+
 
 router = APIRouter()
 
@@ -50,7 +52,8 @@ model_instance = SllmSumm()
 @router.post("/sllm/summ")
 async def sllm_summ(message: Message):
     try:
-        return model_instance.load(message.user_message, message.ai_message)
+        with start_span("sllm.summarize"):
+            return model_instance.load(message.user_message, message.ai_message)
     except HTTPException as e:
         log.error("API error", status_code=e.status_code, detail=e.detail)
         raise e
@@ -3,17 +3,26 @@ from fastapi import FastAPI
 import uvicorn
 from routers import sllm_summ
 import logging
+from core import setup_tracing, shutdown_tracing, TracingMiddleware
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 
 
+# Setup Tracing (trace context propagated by callers in the traceparent header)
+setup_tracing("gildong-sllm", "logs/traces.jsonl")
+
 # Define FastAPI app
 app = FastAPI()
+app.add_middleware(TracingMiddleware)
 
 # Include Routers
 app.include_router(sllm_summ.router)
 
+@app.on_event("shutdown")
+def flush_spans():
+    shutdown_tracing()
+
 
 # Command line arguments parser
 def get_args():